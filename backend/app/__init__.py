@@ -2,6 +2,9 @@ from flask import Flask
 from .extensions import db, migrate, ma, jwt
 from .routes import register_blueprints
 from .config import config_by_name
+from .utils.engine import engine_options, install_engine_hooks
+from .utils.db_routing import init_read_replicas
+from .utils.json_provider import json_provider_class
 from dotenv import load_dotenv
 from flask_cors import CORS
 import os
@@ -10,10 +13,13 @@ def create_app(config_name="development"):
     load_dotenv()
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
+    app.json = json_provider_class(app.config)(app)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
+    init_read_replicas(app)
 
     CORS(
         app, 
-        origins=['http://localhost:3000'], 
+        origins=app.config["CORS_ORIGINS"], 
         supports_credentials=True,
         allow_headers=["Content-Type", "Authorization"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
@@ -29,6 +35,8 @@ def create_app(config_name="development"):
     from app.models.event_model import Event, EventParticipant, Category, Match
                  
     with app.app_context():
+        for engine in db.engines.values():
+            install_engine_hooks(engine, app.config)
         db.create_all()
     
     # Register routes
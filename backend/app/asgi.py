@@ -0,0 +1,271 @@
+import asyncio
+import contextlib
+import random
+import re
+from http.cookies import CookieError, SimpleCookie
+from urllib.parse import parse_qs, parse_qsl
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import NoSuchModuleError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app import create_app
+from app.models.event_model import BracketView, Event
+from app.schemas.compiled import compile_schema
+from app.schemas.event_schema import EVENT_FIELDS, EVENT_INCLUDES, event_schema_for
+from app.schemas.loaders import event_loaders
+from app.services.live_updates import format_sse, get_broker, parse_event_id
+from app.services.response_cache import cache_key, get_response_cache
+from app.utils.db_routing import STICKY_COOKIE, sticky_to_primary
+from app.utils.engine import install_engine_hooks
+from app.utils.response import iter_success_json
+
+# ASGI serving mode. The hot public reads (event detail, category bracket and
+# the live stream) are served natively on the event loop with SQLAlchemy's
+# async engine, so thousands of spectators or open streams cost no worker
+# threads. Every other request goes to the regular Flask app through
+# asgiref's WSGI adapter. Native reads use the read replicas the same way the
+# Flask side does. Without the async driver of the configured database
+# everything is served through the adapter.
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+asyncmy",
+}
+
+
+def async_database_uri(uri):
+    url = make_url(uri)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]).render_as_string(hide_password=False)
+
+
+def _csv(query, name):
+    values = query.get(name)
+    if values is None:
+        return None
+    return [v.strip() for v in values[-1].split(",") if v.strip()]
+
+
+class AsyncApp:
+    ROUTES = [
+        (re.compile(r"^/api/events/(\d+)$"), "get_event"),
+        (re.compile(r"^/api/events/categories/(\d+)/bracket$"), "get_category_bracket"),
+        (re.compile(r"^/api/events/(\d+)/stream$"), "stream_event"),
+    ]
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        try:
+            self.engine = self._create_engine(flask_app.config["SQLALCHEMY_DATABASE_URI"])
+            self.replica_engines = [self._create_engine(uri) for uri in flask_app.config.get("READ_REPLICA_URIS") or []]
+        except (ImportError, KeyError, NoSuchModuleError) as e:
+            flask_app.logger.warning("No async driver for the database (%s), serving every request through WSGI", e)
+            self.engine, self.replica_engines = None, []
+        self._sessions = async_sessionmaker(expire_on_commit=False)
+        # Queue requests on the loop instead of letting them time out waiting for the pool
+        options = flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+        self._db_slots = asyncio.Semaphore(options.get("pool_size", 5) + options.get("max_overflow", 10))
+        with flask_app.app_context():
+            self.broker = get_broker()
+        self.cache = get_response_cache(flask_app)
+
+    def _create_engine(self, uri):
+        engine = create_async_engine(async_database_uri(uri), **self.flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+        install_engine_hooks(engine.sync_engine, self.flask_app.config)
+        return engine
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] == "http" and scope["method"] == "GET" and self.engine is not None:
+            for pattern, handler in self.ROUTES:
+                match = pattern.match(scope["path"])
+                if match and await getattr(self, handler)(scope, receive, send, int(match.group(1))):
+                    return
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for engine in [self.engine, *self.replica_engines]:
+                    if engine is not None:
+                        await engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _read_engine(self, scope):
+        """A replica, unless the client wrote recently (see app/utils/db_routing.py)."""
+        if not self.replica_engines:
+            return self.engine
+        cookies = SimpleCookie()
+        try:
+            cookies.load(dict(scope["headers"]).get(b"cookie", b"").decode("latin-1"))
+        except CookieError:
+            pass
+        sticky = cookies.get(STICKY_COOKIE)
+        if sticky is not None and sticky_to_primary(sticky.value):
+            return self.engine
+        return random.choice(self.replica_engines)
+
+    @contextlib.asynccontextmanager
+    async def session(self, scope):
+        async with self._db_slots, self._sessions(bind=self._read_engine(scope)) as session:
+            yield session
+
+    # ---- responses ----
+
+    def _cors_headers(self, scope):
+        """What flask_cors adds for the allowed origins."""
+        origin = dict(scope["headers"]).get(b"origin", b"").decode()
+        if origin not in self.flask_app.config["CORS_ORIGINS"]:
+            return []
+        return [("access-control-allow-origin", origin), ("access-control-allow-credentials", "true"), ("vary", "Origin")]
+
+    async def _start(self, scope, send, status, headers):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.encode(), v.encode()) for k, v in [*headers, *self._cors_headers(scope)]],
+        })
+
+    async def _send(self, scope, send, status, body=b"", content_type="application/json", headers=()):
+        await self._start(scope, send, status, [("content-type", content_type), ("content-length", str(len(body))), *headers])
+        await send({"type": "http.response.body", "body": body})
+
+    def _json_body(self, payload):
+        """The exact bytes jsonify would send, so cached bodies are the same from either side."""
+        return self.flask_app.json.response(payload).get_data()
+
+    async def _send_json(self, scope, send, status, payload):
+        await self._send(scope, send, status, self._json_body(payload))
+
+    @staticmethod
+    def _not_modified(scope, etag):
+        if_none_match = dict(scope["headers"]).get(b"if-none-match", b"").decode()
+        return etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+    async def _send_not_modified(self, scope, send, headers):
+        await self._start(scope, send, 304, headers)
+        await send({"type": "http.response.body", "body": b""})
+
+    # ---- handlers: return False to fall back to the Flask app ----
+
+    async def get_event(self, scope, receive, send, event_id):
+        """Same as event_routes.get_event, including its response cache entry and ETag."""
+        query = parse_qs(scope["query_string"].decode())
+        fields, include = _csv(query, "fields"), _csv(query, "include")
+        if set(fields or ()) - set(EVENT_FIELDS) or set(include or ()) - set(EVENT_INCLUDES):
+            return False  # Flask answers with the 400
+        if fields is not None and include is None:
+            include = []
+
+        async with self.session(scope) as session:
+            version = (await session.execute(select(Event.version).where(Event.id == event_id))).scalar()
+            if version is None:
+                await self._send_json(scope, send, 404, {"success": False, "error": {"message": "Event not found"}})
+                return True
+
+            key, etag = cache_key("event_bp.get_event", event_id, version,
+                                  parse_qsl(scope["query_string"].decode(), keep_blank_values=True))
+            headers = [("etag", f'"{etag}"'), ("cache-control", "no-cache")]
+            if self._not_modified(scope, f'"{etag}"'):
+                await self._send_not_modified(scope, send, headers)
+                return True
+
+            body = self.cache.get(key) if self.cache is not None else None
+            if body is None:
+                event = (await session.execute(
+                    select(Event).options(*event_loaders(include=include)).where(Event.id == event_id)
+                )).unique().scalar_one()
+                data = compile_schema(event_schema_for(fields, include))(event)
+                body = "".join(iter_success_json(data, self.flask_app.json)).encode()
+                if self.cache is not None:
+                    self.cache.set(key, body)
+        await self._send(scope, send, 200, body, headers=headers)
+        return True
+
+    async def get_category_bracket(self, scope, receive, send, category_id):
+        """Same as match_routes.get_category_bracket for views that are already built."""
+        async with self.session(scope) as session:
+            row = (await session.execute(
+                select(BracketView.etag, BracketView.body).where(BracketView.category_id == category_id)
+            )).first()
+        if row is None:
+            return False  # Flask builds the view
+        etag = f'"{row.etag}"'
+        headers = [("etag", etag), ("cache-control", "no-cache")]
+        if self._not_modified(scope, etag):
+            await self._send_not_modified(scope, send, headers)
+        else:
+            await self._send(scope, send, 200, ('{"data":' + row.body + ',"success":true}').encode(), headers=headers)
+        return True
+
+    async def stream_event(self, scope, receive, send, event_id):
+        """Same as live_routes.stream_event, waiting on the event loop instead of a thread."""
+        async with self.session(scope) as session:
+            exists = (await session.execute(select(Event.id).where(Event.id == event_id))).first()
+        if not exists:
+            await self._send_json(scope, send, 404, {"success": False, "error": {"message": "Event not found"}})
+            return True
+
+        headers = dict(scope["headers"])
+        query = parse_qs(scope["query_string"].decode())
+        last_id = (headers.get(b"last-event-id", b"").decode() or (query.get("last_event_id") or [""])[-1])
+        subscription = self.broker.subscribe(event_id, parse_event_id(last_id))
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        subscription.on_push = lambda: loop.call_soon_threadsafe(wakeup.set)
+        heartbeat = self.flask_app.config.get("LIVE_HEARTBEAT_SECONDS", 15)
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+
+        async def write(text):
+            await send({"type": "http.response.body", "body": text.encode(), "more_body": True})
+
+        try:
+            await self._start(scope, send, 200, [
+                ("content-type", "text/event-stream; charset=utf-8"),
+                ("cache-control", "no-cache"),
+                ("x-accel-buffering", "no"),
+            ])
+            await write("retry: 3000\n\n")
+            if subscription.gap:
+                await write("event: reset\ndata: {}\n\n")
+            for message_id, message in subscription.backlog:
+                await write(format_sse(message_id, message["type"], message))
+
+            while not subscription.overflowed and not disconnected.done():
+                # Clear before draining so a push that lands in between still wakes us
+                wakeup.clear()
+                item = subscription.get(timeout=0)
+                if item is not None:
+                    await write(format_sse(item[0], item[1]["type"], item[1]))
+                    continue
+                if subscription.overflowed:
+                    break
+                woken = asyncio.ensure_future(wakeup.wait())
+                done, _ = await asyncio.wait([woken, disconnected], timeout=heartbeat,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                woken.cancel()
+                if not done:
+                    await write(": keep-alive\n\n")
+            if subscription.overflowed:
+                await write("event: reset\ndata: {}\n\n")
+            if not disconnected.done():
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            subscription.close()
+            disconnected.cancel()
+        return True
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+
+def create_asgi_app(config_name="development"):
+    return AsyncApp(create_app(config_name))
@@ -4,6 +4,7 @@ import os
 basedir = os.path.abspath(os.path.dirname(__file__))
 
 class Config:
+    CORS_ORIGINS = ['http://localhost:3000']
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev_secret")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "changeme")
@@ -11,6 +12,71 @@ class Config:
     JWT_COOKIE_SECURE = True
     JWT_COOKIE_SAMESITE = "None"
     JWT_COOKIE_CSRF_PROTECT = False
+    # JSON encoder behind jsonify (app/utils/json_provider.py): "auto" uses orjson
+    # when it is installed, "stdlib" forces the json module
+    JSON_PROVIDER = os.environ.get("JSON_PROVIDER", "auto")
+    # List items encoded per chunk by streamed_success_response
+    JSON_STREAM_CHUNK_SIZE = 1000
+    # Endpoints that dump with the generated serializers of app/schemas/compiled.py
+    # instead of marshmallow (same JSON, much less CPU on large payloads)
+    COMPILED_SERIALIZER_ENDPOINTS = {
+        "event_bp.get_event",
+        "event_bp.get_club_events",
+        "event_bp.get_participating_events",
+        "event_bp.list_event_matches",
+        "event_bp.list_event_participants",
+    }
+    # Seconds a worker keeps resolved authorization facts (roles, club ownership,
+    # event membership) before reloading them; 0 disables the process cache
+    AUTH_CACHE_TTL = 30
+    # Let the role decorators take role and owned clubs from the access token
+    # claims instead of the database (checked against users.token_version)
+    JWT_TRUST_CLAIMS = False
+    # Engine profile (app/utils/engine.py), chosen from the database URL unless forced
+    DB_ENGINE_PROFILE = os.environ.get("DB_ENGINE_PROFILE")
+    # Applied to every new SQLite connection. WAL lets readers run next to the
+    # single writer, and busy_timeout makes writers wait instead of failing with
+    # "database is locked".
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 15000)),
+        "cache_size": -16000,  # KiB
+    }
+    # Read replicas for GET/HEAD requests (comma separated URLs); a client that
+    # wrote in the last DB_PRIMARY_STICKY_SECONDS keeps reading from the primary
+    READ_REPLICA_URIS = [u for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u]
+    DB_PRIMARY_STICKY_SECONDS = 5
+    # Live updates (app/services/live_updates.py): broker, messages kept per event
+    # for Last-Event-ID resume, and keep-alive interval of idle streams
+    LIVE_BROKER = "memory"
+    LIVE_HISTORY = 256
+    LIVE_HEARTBEAT_SECONDS = 15
+    # Rows fetched per round trip by the streamed event export
+    EXPORT_BATCH_SIZE = 1000
+    # Largest roster accepted by POST /<event_id>/participants/<club_id>/bulk
+    BULK_IMPORT_MAX_ROWS = 10000
+    # Match length and rest between a participant's matches (minutes) used by the
+    # scheduler for categories whose ruleset has no match_duration_minutes/rest_minutes
+    SCHEDULE_MATCH_MINUTES = 10
+    SCHEDULE_REST_MINUTES = 15
+    # Most courts/mats accepted by POST /<event_id>/schedule
+    SCHEDULE_MAX_COURTS = 200
+    # Serialized bodies of the public event GETs (app/services/response_cache.py),
+    # keyed by endpoint, arguments and events.version: "memory" (per worker LRU),
+    # "redis" (shared, needs the redis package) or "none"
+    RESPONSE_CACHE = os.environ.get("RESPONSE_CACHE", "memory")
+    RESPONSE_CACHE_SIZE = 2048
+    RESPONSE_CACHE_REDIS_URL = os.environ.get("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_TTL = 3600  # redis only, outdated versions are never read again
+    MYSQL_POOL = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 280)),  # below MySQL's wait_timeout
+        "pool_pre_ping": True,
+    }
 
 class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(basedir, "dev.db")
@@ -4,9 +4,10 @@ from flask_migrate import Migrate
 from flask_marshmallow import Marshmallow
 from flask_jwt_extended import JWTManager
 import pymysql
+from app.utils.db_routing import RoutingSession
 
 pymysql.install_as_MySQLdb()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 ma = Marshmallow()
 jwt = JWTManager()
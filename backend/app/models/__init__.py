@@ -1,2 +1,2 @@
 from .user_model import User, Club
-from .event_model import Event, EventParticipant, Category, Match
\ No newline at end of file
+from .event_model import Event, EventParticipant, Category, Match, CategoryStanding, ClubStanding
\ No newline at end of file
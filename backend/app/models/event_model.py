@@ -1,15 +1,21 @@
 from app.extensions import db
 from datetime import datetime
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.associationproxy import association_proxy
 
 event_clubs = db.Table(
     "event_clubs",
     db.Column("event_id", db.Integer, db.ForeignKey("events.id"), primary_key=True),
-    db.Column("club_id", db.Integer, db.ForeignKey("clubs.id"), primary_key=True)
+    db.Column("club_id", db.Integer, db.ForeignKey("clubs.id"), primary_key=True),
+    # The primary key covers lookups by event; this one covers "events of my clubs"
+    db.Index("ix_event_clubs_club_id", "club_id")
 )
 
 class ParticipantCategory(db.Model):
     __tablename__ = "participant_categories"
+    __table_args__ = (
+        db.Index("ix_participant_categories_category_id", "category_id"),
+    )
     participant_id = db.Column(db.Integer, db.ForeignKey("event_participants.id", ondelete='CASCADE'), primary_key=True)
     category_id = db.Column(db.Integer, db.ForeignKey("categories.id", ondelete='CASCADE'), primary_key=True)
     seed = db.Column(db.Integer, nullable=True)  # <--- new seed column
@@ -20,11 +26,16 @@ class ParticipantCategory(db.Model):
 
 class Event(db.Model):
     __tablename__ = "events"
+    __table_args__ = (
+        db.Index("ix_events_organizer_id", "organizer_id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
 
     organizer_id = db.Column(db.Integer, db.ForeignKey("clubs.id"), nullable=False)
     organizer = db.relationship("Club", backref="organized_events")
+    # Bumped by every write to the event, keys its cached GET responses
+    version = db.Column(db.Integer, default=0, server_default="0", nullable=False)
 
     participating_clubs = db.relationship(
         "Club",
@@ -35,9 +46,19 @@ class Event(db.Model):
     categories = db.relationship("Category", back_populates="event")
     participants = db.relationship("EventParticipant", back_populates="event")
 
+    # Write-only variants of the large collections: .select() gives a query to
+    # filter, count or page instead of loading every row
+    participant_rows = db.relationship("EventParticipant", lazy="write_only", viewonly=True)
+    participating_club_rows = db.relationship("Club", secondary=event_clubs, lazy="write_only", viewonly=True)
+
 
 class EventParticipant(db.Model):
     __tablename__ = "event_participants"
+    __table_args__ = (
+        db.Index("ix_event_participants_event_id_club_id", "event_id", "club_id"),
+        db.Index("ix_event_participants_club_id", "club_id"),
+        db.Index("ix_event_participants_event_id_points", "event_id", "points"),
+    )
     id = db.Column(db.Integer, primary_key=True)
 
     event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
@@ -59,6 +80,9 @@ class EventParticipant(db.Model):
 
 class Category(db.Model):
     __tablename__ = "categories"
+    __table_args__ = (
+        db.Index("ix_categories_event_id", "event_id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     order = db.Column(db.Integer, nullable=False)
     name = db.Column(db.String(120), nullable=False)  # e.g., "Under 12 - Blue Belt"
@@ -67,6 +91,8 @@ class Category(db.Model):
     is_bracket = db.Column(db.Boolean, default=True, nullable=False) #if can_sign_up is false, it is a bracket
     # JSON field for rules & scoring system
     ruleset = db.Column(db.JSON, nullable=True, default={})
+    # Bumped with every ruleset change, keys the compiled rulesets (app/services/scoring_service.py)
+    ruleset_version = db.Column(db.Integer, default=0, server_default="0", nullable=False)
 
     event = db.relationship("Event", back_populates="categories")
     matches = db.relationship("Match", back_populates="category")
@@ -78,15 +104,27 @@ class Category(db.Model):
     )
     participants = association_proxy("participant_categories", "participant")
 
+    # Write-only variants, see Event.participant_rows
+    match_rows = db.relationship("Match", lazy="write_only", viewonly=True)
+    participant_category_rows = db.relationship("ParticipantCategory", lazy="write_only", viewonly=True)
+
 
 class Match(db.Model):
     __tablename__ = "matches"
+    __table_args__ = (
+        # Brackets and match lists read a category ordered by round, match_number
+        db.Index("ix_matches_category_id_round_match_number", "category_id", "round", "match_number"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     category_id = db.Column(db.Integer, db.ForeignKey("categories.id"), nullable=False)
 
     round = db.Column(db.Integer, nullable=True)  # useful for brackets
     match_number = db.Column(db.Integer, nullable=True)  # order inside round
     start_time = db.Column(db.DateTime, nullable=True)
+    court = db.Column(db.Integer, nullable=True)  # court/mat number, set with start_time by the scheduler
+    # Planned length and the rest owed to its participants afterwards, in minutes, set with start_time by the scheduler
+    duration_minutes = db.Column(db.Float, nullable=True)
+    rest_minutes = db.Column(db.Float, nullable=True)
     status = db.Column(db.String(20), default="scheduled")  # scheduled, ongoing, finished
 
     category = db.relationship("Category", back_populates="matches")
@@ -95,6 +133,10 @@ class Match(db.Model):
 
 class MatchParticipant(db.Model):
     __tablename__ = "match_participants"
+    __table_args__ = (
+        db.Index("ix_match_participants_match_id", "match_id"),
+        db.Index("ix_match_participants_participant_id", "participant_id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     
     match_id = db.Column(db.Integer, db.ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
@@ -111,6 +153,10 @@ class MatchParticipant(db.Model):
 
 class MatchRelation(db.Model):
     __tablename__ = "match_relations"
+    __table_args__ = (
+        db.Index("ix_match_relations_source_match_id", "source_match_id"),
+        db.Index("ix_match_relations_target_match_id", "target_match_id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     
     source_match_id = db.Column(db.Integer, db.ForeignKey("matches.id", ondelete="CASCADE"))
@@ -123,6 +169,11 @@ class MatchRelation(db.Model):
 
 class EventJoinRequest(db.Model):
     __tablename__ = "event_join_requests"
+    __table_args__ = (
+        # Duplicate-request check and the organizer's paginated listing by status
+        db.Index("ix_event_join_requests_event_id_club_id_status", "event_id", "club_id", "status"),
+        db.Index("ix_event_join_requests_event_id_status_created_at", "event_id", "status", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
@@ -136,6 +187,9 @@ class EventJoinRequest(db.Model):
 
 class EventJoinLink(db.Model):
     __tablename__ = "event_join_links"
+    __table_args__ = (
+        db.Index("ix_event_join_links_event_id", "event_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
@@ -144,3 +198,42 @@ class EventJoinLink(db.Model):
 
     event = db.relationship("Event", backref="join_links")
 
+
+class CategoryStanding(db.Model):
+    __tablename__ = "category_standings"
+    __table_args__ = (
+        db.Index("ix_category_standings_event_id_category_id_points", "event_id", "category_id", "points"),
+    )
+    # Maintained incrementally by standings_service whenever a result is recorded
+    category_id = db.Column(db.Integer, db.ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    participant_id = db.Column(db.Integer, db.ForeignKey("event_participants.id", ondelete="CASCADE"), primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+
+    points = db.Column(db.Integer, default=0, nullable=False)
+    played = db.Column(db.Integer, default=0, nullable=False)
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    draws = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+
+
+class ClubStanding(db.Model):
+    __tablename__ = "club_standings"
+    # Maintained incrementally by standings_service whenever a result is recorded
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+
+    points = db.Column(db.Integer, default=0, nullable=False)
+    played = db.Column(db.Integer, default=0, nullable=False)
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    draws = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+
+
+class BracketView(db.Model):
+    __tablename__ = "bracket_views"
+    # Serialized GET /categories/<id>/bracket payload, kept up to date by bracket_view_service
+    category_id = db.Column(db.Integer, db.ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    etag = db.Column(db.String(64), nullable=False)
+    # MySQL TEXT stops at 64 KB, well below the bracket of a 512+ entrant category
+    body = db.Column(db.Text().with_variant(mysql.LONGTEXT(), "mysql"), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -16,6 +16,9 @@ class User(db.Model):
     role = db.Column(db.String(20), default=UserRole.USER, nullable=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     isOwner = db.Column(db.Boolean, default=False, nullable=False)
+    # Bumped whenever role or club ownership changes, so access tokens issued
+    # before that carry stale claims (see auth_context.get_user_auth)
+    token_version = db.Column(db.Integer, default=0, server_default="0", nullable=False)
 
     clubs = db.relationship("Club", back_populates="owner")
 
@@ -29,6 +32,9 @@ class User(db.Model):
 
 class Club(db.Model):
     __tablename__ = "clubs"
+    __table_args__ = (
+        db.Index("ix_clubs_owner_id", "owner_id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
 
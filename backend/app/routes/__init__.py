@@ -1,8 +1,10 @@
 from .auth_routes import auth_bp
 from .club_routes import club_bp
 from .event import event_bp
+from .metrics_routes import metrics_bp
 
 def register_blueprints(app):
     app.register_blueprint(auth_bp)
     app.register_blueprint(club_bp)
-    app.register_blueprint(event_bp)
\ No newline at end of file
+    app.register_blueprint(event_bp)
+    app.register_blueprint(metrics_bp)
\ No newline at end of file
@@ -1,10 +1,11 @@
 # app/routes/auth.py
-from app.services.auth_service import register_user, login_user, get_all_users_by_manager
+from app.services.auth_service import register_user, login_user, get_all_users_by_manager, token_claims
 from flask import Blueprint, request, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token
 from app.schemas.user_schema import user_schema, users_schema, User
 from app.utils.response import *
+from app.utils.pagination import keyset_paginate
 from app.services.roles_service import manager_required, verify_manager_role
 from flask_jwt_extended import jwt_required, create_refresh_token, get_jwt_identity, set_refresh_cookies, unset_jwt_cookies
 from flask_cors import cross_origin
@@ -58,7 +59,10 @@ def login():
 @jwt_required(refresh=True)
 def refresh():
     user_id = get_jwt_identity()
-    access_token = create_access_token(identity=user_id)
+    user = User.query.get(int(user_id))
+    if not user:
+        return error_response({"message": "User not found"}, 401)
+    access_token = create_access_token(identity=user_id, additional_claims=token_claims(user))
     return success_response({"token": access_token}, 200)
 
 @auth_bp.route("/logout", methods=["POST"])
@@ -82,7 +86,15 @@ def me():
 @auth_bp.route("/", methods=["GET", "OPTIONS"])
 @manager_required
 def get_users():
-    result = get_all_users_by_manager()
-    return success_response(users_schema.dump(result), 200)
+    """
+    Users ordered by id, paginated with ?cursor= and ?limit=.
+    Optional filters: role, email (prefix)
+    """
+    query = get_all_users_by_manager(role=request.args.get("role"), email_prefix=request.args.get("email"))
+    try:
+        users, next_cursor = keyset_paginate(query, [User.id])
+    except ValueError as e:
+        return error_response({"message": str(e)}, 400)
+    return paginated_response(users_schema.dump(users), next_cursor, 200)
 
 
@@ -4,7 +4,9 @@ from app.extensions import db
 from app.models.user_model import Club, User
 from app.schemas.user_schema import club_schema, clubs_schema
 from app.services.roles_service import manager_required
+from app.services.auth_context import bump_token_version, invalidate_user_auth
 from app.utils.response import * 
+from app.utils.pagination import keyset_paginate
 
 club_bp = Blueprint("clubs", __name__, url_prefix="/api/clubs")
 
@@ -28,12 +30,29 @@ def create_club():
 
     club = Club(name=name, owner=owner)
     db.session.add(club)
+    bump_token_version(owner.id)
     db.session.commit()
+    invalidate_user_auth(owner.id)
 
     return success_response(club_schema.dump(club), 201)
 
 # List all clubs (public)
 @club_bp.route("/", methods=["GET"])
 def list_clubs():
-    clubs = Club.query.all()
-    return success_response(clubs_schema.dump(clubs), 200)
+    """
+    Clubs ordered by id, paginated with ?cursor= and ?limit=.
+    Optional filters: name (prefix), owner_id
+    """
+    query = Club.query
+    name = request.args.get("name")
+    if name:
+        query = query.filter(Club.name.startswith(name, autoescape=True))
+    owner_id = request.args.get("owner_id", type=int)
+    if owner_id is not None:
+        query = query.filter(Club.owner_id == owner_id)
+
+    try:
+        clubs, next_cursor = keyset_paginate(query, [Club.id])
+    except ValueError as e:
+        return error_response({"message": str(e)}, 400)
+    return paginated_response(clubs_schema.dump(clubs), next_cursor, 200)
@@ -1,14 +1,23 @@
 from flask import request
+from sqlalchemy import delete, or_, select
 from app.utils.response import success_response, error_response
 from app.services.roles_service import club_owner_required
 from app.extensions import db
-from app.models.event_model import Event, Category, EventParticipant
+from app.models.event_model import Event, Category, EventParticipant, Match, MatchParticipant, MatchRelation, ParticipantCategory
 from app.schemas.event_schema import event_schema
 from app.services.roles_service import manager_required, club_owner_required, club_in_event_required
+from app.services.bracket_graph import invalidate_bracket_graph
+from app.services.bracket_view_service import invalidate_bracket_views
+from app.services.auth_context import invalidate_match_auth
+from app.services.membership_service import participant_in_category
+from app.services.response_cache import bump_event_version, cached_event_response
+from app.services.scoring_service import compile_ruleset, invalidate_compiled_ruleset, points_table
+from app.services.standings_service import rebuild_event_standings
 from . import event_bp
 
 # ---- List categories ----
 @event_bp.route("/<int:event_id>/categories", methods=["GET"])
+@cached_event_response
 def list_categories(event_id):
     event = Event.query.get(event_id)
     if not event:
@@ -30,9 +39,14 @@ def create_category(event_id, club):
     data = request.get_json()
     if not data or "name" not in data:
         return error_response({"message": "Category name is required"}, 400)
+    try:
+        compile_ruleset(data.get("ruleset"))
+    except ValueError as e:
+        return error_response({"message": str(e)}, 400)
 
-    category = Category(name=data["name"], event_id=event.id, order=data['order'])
+    category = Category(name=data["name"], event_id=event.id, order=data['order'], ruleset=data.get("ruleset") or {})
     db.session.add(category)
+    bump_event_version(event.id)
     db.session.commit()
 
     return success_response({"id": category.id, "name": category.name, "event_id": event.id}, 201)
@@ -40,6 +54,7 @@ def create_category(event_id, club):
 
 # ---- Get category by ID ----
 @event_bp.route("/<int:event_id>/categories/<int:category_id>", methods=["GET"])
+@cached_event_response
 def get_category(event_id, category_id):
     category = Category.query.filter_by(id=category_id, event_id=event_id).first()
     if not category:
@@ -57,10 +72,24 @@ def update_category(event_id, category_id, club):
         return error_response({"message": "Category not found"}, 404)
 
     data = request.get_json()
-    if not data or "name" not in data:
-        return error_response({"message": "Category name is required"}, 400)
-
-    category.name = data["name"]
+    if not data or ("name" not in data and "ruleset" not in data):
+        return error_response({"message": "Category name or ruleset is required"}, 400)
+
+    if "ruleset" in data:
+        try:
+            compile_ruleset(data["ruleset"])
+        except ValueError as e:
+            return error_response({"message": str(e)}, 400)
+        # The new version makes every worker recompile the ruleset on its next score push
+        points_changed = points_table(category.ruleset) != points_table(data["ruleset"])
+        category.ruleset = data["ruleset"] or {}
+        category.ruleset_version = Category.ruleset_version + 1
+        if points_changed:
+            # Standings are kept incrementally, recorded results are recounted with the new points
+            rebuild_event_standings(event_id)
+    if "name" in data:
+        category.name = data["name"]
+    bump_event_version(event_id)
     db.session.commit()
 
     return success_response({"id": category.id, "name": category.name, "event_id": category.event_id})
@@ -74,8 +103,23 @@ def delete_category(event_id, category_id, club):
     if not category:
         return error_response({"message": "Category not found"}, 404)
 
+    # Foreign key cascades do not fire on SQLite, so the matches go explicitly
+    # and the standings are recomputed without them
+    match_ids = select(Match.id).where(Match.category_id == category.id)
+    db.session.execute(delete(MatchRelation).where(or_(
+        MatchRelation.source_match_id.in_(match_ids), MatchRelation.target_match_id.in_(match_ids)
+    )))
+    db.session.execute(delete(MatchParticipant).where(MatchParticipant.match_id.in_(match_ids)))
+    db.session.execute(delete(Match).where(Match.category_id == category.id))
+    invalidate_bracket_views(category_ids=[category.id])
     db.session.delete(category)
+    db.session.flush()
+    rebuild_event_standings(event_id)
+    bump_event_version(event_id)
     db.session.commit()
+    invalidate_bracket_graph(category_id)
+    invalidate_compiled_ruleset(category_id)
+    invalidate_match_auth()
 
     return success_response({"message": f"Category {category.name} deleted successfully"})
 
@@ -102,8 +146,10 @@ def add_participant_to_category(event_id, category_id, participant_id, club, eve
         return error_response({"message": "You can only assign participants from your own club"}, 403)
 
     # Add relationship if not already present
-    if participant not in category.participants:
-        category.participants.append(participant)
+    if not participant_in_category(participant.id, category.id):
+        db.session.add(ParticipantCategory(participant_id=participant.id, category_id=category.id))
+        invalidate_bracket_views(category_ids=[category.id])
+        bump_event_version(event_id)
         db.session.commit()
 
     return success_response({
@@ -135,8 +181,11 @@ def remove_participant_from_category(event_id, category_id, participant_id, club
         return error_response({"message": "You can only remove participants from your own club"}, 403)
 
     # Remove relationship if exists
-    if participant in category.participants:
-        category.participants.remove(participant)
+    link = db.session.get(ParticipantCategory, (participant.id, category.id))
+    if link:
+        db.session.delete(link)
+        invalidate_bracket_views(category_ids=[category.id])
+        bump_event_version(event_id)
         db.session.commit()
         return success_response({
             "message": f"Participant {participant.name} removed from category {category.name}",
@@ -6,7 +6,11 @@ from app.models.user_model import Club
 from app.schemas.event_schema import event_schema, join_requests_schema
 from app.utils.response import error_response, success_response
 from app.services.events_service import create_join_link
+from app.utils.pagination import keyset_paginate
 from app.services.roles_service import manager_required, club_owner_required, club_in_event_required, is_owner_required
+from app.services.auth_context import invalidate_event_auth
+from app.services.response_cache import bump_event_version
+from app.services.membership_service import add_club_to_event, clubs_in_event
 from . import event_bp
 import datetime
 from sqlalchemy.orm import joinedload
@@ -35,12 +39,13 @@ def request_join_event(event_id, owned_clubs):
         return error_response({"message": "Event not found"}, 404)
 
     created_requests = []
+    participating = clubs_in_event(event.id, club_ids)
     for club in owned_clubs:
         if club.id not in club_ids:
             continue
 
         # Already participating?
-        if club in event.participating_clubs:
+        if club.id in participating:
             return error_response({"message": f"Already participating"}, 400)
 
         # Already requested?
@@ -57,6 +62,7 @@ def request_join_event(event_id, owned_clubs):
     if not created_requests:
         return error_response({"message": "No valid join requests created"}, 400)
 
+    bump_event_version(event.id)
     db.session.commit()
     return success_response({
         "requests": created_requests
@@ -89,10 +95,11 @@ def approve_join_request(event_id, request_id, action, club):
     join_request.status = action
 
     if action == "accepted":
-        if join_request.club not in event.participating_clubs:
-            event.participating_clubs.append(join_request.club)
+        add_club_to_event(event.id, join_request.club_id)
 
+    bump_event_version(event.id)
     db.session.commit()
+    invalidate_event_auth(event.id)
 
     message = "Club approved and added" if action == "accepted" else "Join request rejected"
     return success_response({"message": message}, 200)
@@ -103,27 +110,32 @@ def approve_join_request(event_id, request_id, action, club):
 @club_owner_required(from_event=True)
 def get_event_requests(event_id, club):
     """
-    List all pending join requests for this event.
+    List the join requests for this event, oldest first.
     Only the organizer's club can access.
+    Optional query params: status (default "pending"), cursor, limit
     """
     event = Event.query.get(event_id)
     if not event:
         return error_response({"message": "Event not found"}, 404)
 
-    # Query only pending join requests and eager-load the club
-    pending_requests = (
+    # Query join requests with the given status and eager-load the club
+    query = (
         EventJoinRequest.query
         .options(joinedload(EventJoinRequest.club))
-        .filter_by(event_id=event.id, status="pending")
-        .all()
+        .filter_by(event_id=event.id, status=request.args.get("status", "pending"))
     )
+    try:
+        join_requests, next_cursor = keyset_paginate(query, [EventJoinRequest.created_at, EventJoinRequest.id])
+    except ValueError as e:
+        return error_response({"message": str(e)}, 400)
 
-    requests_data = join_requests_schema.dump(pending_requests)
+    requests_data = join_requests_schema.dump(join_requests)
 
     return success_response({
         "event_id": event.id,
         "event_name": event.name,
-        "join_requests": requests_data
+        "join_requests": requests_data,
+        "next_cursor": next_cursor
     })
 
 # ---- Create join link  ----
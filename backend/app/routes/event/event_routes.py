@@ -2,11 +2,16 @@
 from flask import request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.extensions import db
-from app.models.event_model import Event, EventJoinRequest, EventParticipant
+from app.models.event_model import Event, EventJoinRequest, EventParticipant, event_clubs
 from app.models.user_model import Club
-from app.schemas.event_schema import event_schema, events_schema
-from app.utils.response import error_response, success_response
+from app.schemas.event_schema import event_schema, events_schema, event_schema_for, EVENT_FIELDS, EVENT_INCLUDES
+from app.schemas.loaders import with_loaders, event_loaders
+from app.schemas.compiled import dump
+from app.utils.response import error_response, success_response, paginated_response, streamed_success_response
+from app.utils.pagination import keyset_paginate
+from sqlalchemy import select
 from app.services.roles_service import manager_required, club_owner_required, club_in_event_required
+from app.services.response_cache import cached_event_response
 from . import event_bp
 from flask import make_response
 from flask_cors import cross_origin
@@ -28,50 +33,75 @@ def create_event(club_id, club):
 
     return success_response(event_schema.dump(event), 201)
 
+def _csv_arg(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
 @event_bp.route("/<int:event_id>", methods=["GET"])
+@cached_event_response
 def get_event(event_id):
-    event = Event.query.get(event_id)
+    """
+    Event detail.
+    Optional query params:
+        fields: comma separated event fields (id, name, organizer_id)
+        include: comma separated nested resources (organizer, participating_clubs,
+                 participants, categories, categories.matches, join_links)
+    Without either the whole event tree is returned.
+    """
+    fields = _csv_arg("fields")
+    include = _csv_arg("include")
+
+    unknown = set(fields or ()) - set(EVENT_FIELDS) | set(include or ()) - set(EVENT_INCLUDES)
+    if unknown:
+        return error_response({"message": f"Unknown fields or includes: {', '.join(sorted(unknown))}"}, 400)
+
+    if fields is not None and include is None:
+        include = []
+    schema = event_schema_for(fields, include)
+
+    event = Event.query.options(*event_loaders(include=include)).filter_by(id=event_id).first()
     if not event:
         return error_response({"message": "Event not found"}, 404)
     
-    return success_response(event_schema.dump(event))
+    # The full tree can hold tens of thousands of objects, write it out in chunks
+    return streamed_success_response(dump(schema, event))
+
+def _events_page(query):
+    """Filter by ?name= prefix and return one keyset page of events ordered by id."""
+    name = request.args.get("name")
+    if name:
+        query = query.filter(Event.name.startswith(name, autoescape=True))
+    try:
+        events, next_cursor = keyset_paginate(with_loaders(query, events_schema), [Event.id])
+    except ValueError as e:
+        return error_response({"message": str(e)}, 400)
+    return paginated_response(dump(events_schema, events), next_cursor)
 
 @event_bp.route("/participating", methods=["GET"])
 @jwt_required()
 def get_participating_events():
+    """Events where a club of the user participates. Paginated with ?cursor= and ?limit=, filter ?name= prefix."""
     user_id = int(get_jwt_identity())
 
-    # Get clubs owned by this user
-    clubs = Club.query.filter_by(owner_id=user_id).all()
-    if not clubs:
-        return success_response([], 200)  # no clubs, return empty list
-
-    club_ids = [club.id for club in clubs]
-
-    # Query events where these clubs are participants
-    events = (
-        Event.query.join(Event.participating_clubs)
-        .filter(Club.id.in_(club_ids))
-        .all()
-    )
+    # Clubs owned by this user
+    owned_club_ids = select(Club.id).where(Club.owner_id == user_id)
 
-    return success_response(events_schema.dump(events))
+    # Events where these clubs are participants
+    participating = select(event_clubs.c.event_id).where(event_clubs.c.club_id.in_(owned_club_ids))
+    return _events_page(Event.query.filter(Event.id.in_(participating)))
 
 
 @event_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_club_events():
+    """Events organized by the user's clubs. Paginated with ?cursor= and ?limit=, filter ?name= prefix."""
     user_id = int(get_jwt_identity())
 
-    # Get clubs owned by this user
-    clubs = Club.query.filter_by(owner_id=user_id).all()
-    if not clubs:
-        return success_response([], 200)  # no clubs, return empty list
-
-    club_ids = [club.id for club in clubs]
-
-    # Query all events for those clubs
-    events = Event.query.filter(Event.organizer_id.in_(club_ids)).all()
+    # Clubs owned by this user
+    owned_club_ids = select(Club.id).where(Club.owner_id == user_id)
 
-    return success_response(events_schema.dump(events))
+    # All events organized by those clubs
+    return _events_page(Event.query.filter(Event.organizer_id.in_(owned_club_ids)))
 
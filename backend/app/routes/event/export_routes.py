@@ -0,0 +1,32 @@
+from flask import Response, request, stream_with_context
+from app.services.export_service import EXPORT_FORMATS, EXPORT_TABLES, iter_export
+from app.services.roles_service import club_owner_required
+from app.utils.response import error_response
+from . import event_bp
+
+
+# ---- Export the full results of an event (organizer only) ----
+@event_bp.route("/<int:event_id>/export", methods=["GET"])
+@club_owner_required(from_event=True)
+def export_event(event_id, club):
+    """
+    Stream participants, matches, match participants and standings.
+    Optional query params:
+        format: ndjson (default) or csv
+        tables: comma separated subset of participants, matches, match_participants, standings
+    """
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return error_response({"message": f"format must be one of {', '.join(EXPORT_FORMATS)}"}, 400)
+
+    tables = [t.strip() for t in request.args.get("tables", ",".join(EXPORT_TABLES)).split(",") if t.strip()]
+    unknown = set(tables) - set(EXPORT_TABLES)
+    if unknown or not tables:
+        return error_response({"message": f"tables must be a subset of {', '.join(EXPORT_TABLES)}"}, 400)
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    return Response(
+        stream_with_context(iter_export(event_id, tables, export_format)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="event-{event_id}.{extension}"'}
+    )
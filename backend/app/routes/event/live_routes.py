@@ -0,0 +1,47 @@
+from flask import Response, current_app, request, stream_with_context
+from app.extensions import db
+from app.models.event_model import Event
+from app.services.live_updates import format_sse, get_broker, parse_event_id
+from app.utils.response import error_response
+from . import event_bp
+
+
+def _last_event_id():
+    return parse_event_id(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"))
+
+
+# ---- Live match/bracket deltas of an event (public, Server-Sent Events) ----
+@event_bp.route("/<int:event_id>/stream", methods=["GET"])
+def stream_event(event_id):
+    """
+    Stream match updates of an event as Server-Sent Events.
+    Resumes after Last-Event-ID (header or ?last_event_id=). A "reset" event
+    means updates were missed and the client should refetch the full state.
+    """
+    if not db.session.query(Event.id).filter_by(id=event_id).first():
+        return error_response({"message": "Event not found"}, 404)
+    # The stream can stay open for hours, don't hold a database connection
+    db.session.remove()
+
+    subscription = get_broker().subscribe(event_id, _last_event_id())
+    heartbeat = current_app.config.get("LIVE_HEARTBEAT_SECONDS", 15)
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            if subscription.gap:
+                yield "event: reset\ndata: {}\n\n"
+            for message_id, message in subscription.backlog:
+                yield format_sse(message_id, message["type"], message)
+            while not subscription.overflowed:
+                item = subscription.get(timeout=heartbeat)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield format_sse(item[0], item[1]["type"], item[1])
+            yield "event: reset\ndata: {}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
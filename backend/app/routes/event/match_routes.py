@@ -1,14 +1,25 @@
-from flask import request
+from flask import request, make_response
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.extensions import db
-from app.models.event_model import EventParticipant, Match, Category, MatchParticipant, MatchRelation, Event, ParticipantCategory
-from app.schemas.event_schema import event_schema
+from app.models.event_model import EventParticipant, Match, Category, MatchParticipant, MatchRelation, Event
+from app.schemas.event_schema import event_schema, matches_schema
+from app.schemas.loaders import with_loaders
+from app.utils.pagination import paginate
 from app.utils.response import error_response, success_response
 from app.services.roles_service import manager_required, club_owner_required, club_in_event_required
+from app.services.bracket_service import BRACKET_FORMATS, generate_bracket, load_seeded_entrants, persist_bracket
+from app.services.bracket_graph import AdvancementPlan, current_winner, get_bracket_graph, invalidate_bracket_graph, load_bracket_state
+from app.services.bracket_view_service import get_bracket_etag, get_bracket_body, invalidate_bracket_views, refresh_bracket_matches
+from app.services.auth_context import get_match_event_id, invalidate_match_auth
+from app.services.live_updates import publish_event_update
+from app.services.response_cache import bump_all_event_versions, bump_event_version, cached_event_response
+from app.services.match_service import apply_match_updates, matches_in_event, parse_scores
+from app.services.membership_service import category_has_matches
+from app.services.schedule_service import describe_changes, reschedule_after
 from . import event_bp
-import math, random
+import random
+from datetime import datetime
 from sqlalchemy.orm import joinedload
-from collections import defaultdict
 
 @event_bp.route("/<int:event_id>/categories/<int:category_id>/matches", methods=["POST"])
 @club_owner_required(from_event=True)  # organizer check will be enforced inside
@@ -60,7 +71,10 @@ def create_match(event_id, category_id, club):
         mp = MatchParticipant(match_id=match.id, participant_id=p)
         db.session.add(mp)
     category.is_bracket = False
+    invalidate_bracket_views(category_ids=[category.id])
+    bump_event_version(event_id)
     db.session.commit()
+    invalidate_bracket_graph(category.id)
 
     return success_response({
         "id": match.id,
@@ -71,118 +85,183 @@ def create_match(event_id, category_id, club):
     }, 201)
 
 
-def next_power_of_two(x: int) -> int:
-    return 1 if x == 0 else 2 ** math.ceil(math.log2(x))
-
 @event_bp.route("/<int:event_id>/categories/<int:category_id>/bracket", methods=["POST"])
 @club_owner_required(from_event=True)
 def create_bracket(event_id, category_id, club):
+    """
+    Create the bracket of a category.
+    Either send the built bracket { "matches": [...], "relations": [...] }
+    or let the server generate it from the category seeds with
+    { "format": "single_elimination" | "double_elimination" | "round_robin" }.
+    """
     # ✅ Only the organizer club can create matches
     event = Event.query.get(event_id)
     if event.organizer_id != club.id:
         return error_response({"message": "Only the organizer can create matches"}, 403)
 
-    category = Category.query.get(category_id)
+    category = Category.query.filter_by(id=category_id, event_id=event_id).first()
+    if not category:
+        return error_response({"message": "Category not found in this event"}, 404)
+
     if not category.is_bracket:
         return error_response({"message": "This category is not for a bracket"}, 400)
     
-    if category.matches and len(category.matches) > 0:
+    if category_has_matches(category.id):
         return error_response({"message": "Bracket already created"}, 400)
 
-    data = request.get_json()
-    matches_data = data["matches"]
-    relations_data = data.get("relations", [])
-    match_number_to_id = {}
+    data = request.get_json() or {}
 
-    # Step 1: Create matches
-    for m in matches_data:
-        match = Match(category_id=category_id, round=m["round"], match_number=m["match_number"])
-        db.session.add(match)
-        db.session.flush()  # assigns ID
-        match_number_to_id[m["match_number"]] = match.id
-
-        # Add participants
-        for p in m["participants"]:
-            # Find the association row
-            pc = ParticipantCategory.query.filter_by(
-                participant_id=p["participant_id"],
-                category_id=category_id
-            ).first()
-            if not pc:
-                # if it doesn't exist, create it
-                pc = ParticipantCategory(
-                    participant_id=p["participant_id"],
-                    category_id=category_id,
-                    seed=p["seed"]
-                )
-                db.session.add(pc)
-            else:
-                pc.seed = p["seed"]
-            mp = MatchParticipant(
-                match_id=match.id,
-                participant_id=p["participant_id"],
-                position=p.get("position"),
-                role=p.get("role", "competitor")
-            )
-            db.session.add(mp)
-
-    # Step 2: Create relations
-    for r in relations_data:
-        source_id = match_number_to_id[r["source_match_number"]]
-        target_id = match_number_to_id[r["target_match_number"]]
-        rel = MatchRelation(source_match_id=source_id, target_match_id=target_id, qualifier_rank=r.get("qualifier_rank", 1))
-        db.session.add(rel)
+    if "matches" in data:
+        matches_data = data["matches"]
+        relations_data = data.get("relations", [])
+    else:
+        bracket_format = data.get("format", "single_elimination")
+        if bracket_format not in BRACKET_FORMATS:
+            return error_response({"message": f"format must be one of {', '.join(BRACKET_FORMATS)}"}, 400)
+
+        entrants = load_seeded_entrants(category.id)
+        if len(entrants) < 2:
+            return error_response({"message": "At least two participants are required"}, 400)
+        matches_data, relations_data = generate_bracket(entrants, bracket_format)
+
+    persist_bracket(category.id, matches_data, relations_data)
     category.can_sign_up = False
+    invalidate_bracket_views(category_ids=[category.id])
+    bump_event_version(event_id)
     db.session.commit()
-    return success_response({"message": "Bracket created"})
+    invalidate_bracket_graph(category.id)
+    return success_response({
+        "message": "Bracket created",
+        "total_matches": len(matches_data)
+    })
 
 @event_bp.route("/matches/<int:match_id>", methods=["PATCH"])
-@club_owner_required(from_event=True)
-def update_match(match_id):
+@club_owner_required(from_match=True)
+def update_match(match_id, club):
     """
-    Update a match's participants' scores and status.
-    Expects JSON: { "scores": {match_participant_id: score, ...}, "status": "string" }
+    Update a match's participants' scores, results and status.
+    Scores are read by the category's scoring rule when its ruleset has one,
+    which then derives ranks and results ("outcome") once the match is decided.
+    Expects JSON: { "scores": {match_participant_id: score, ...}, "results": {match_participant_id: "win" | "loss" | "draw", ...}, "status": "string",
+                    "delay_minutes": number }
+    On a scheduled event, later matches move when the match runs late: it
+    starts now ("ongoing"), finishes now ("completed") or reports a delay.
     """
     data = request.get_json() or {}
     scores = data.get("scores", {})
+    results = data.get("results", {})
     status = data.get("status", None)
+    delay = data.get("delay_minutes")
+    if delay is not None and (isinstance(delay, bool) or not isinstance(delay, (int, float)) or delay < 0):
+        return error_response({"error": "delay_minutes must be a positive number"}, 400)
 
     match = Match.query.get(match_id)
     if not match:
         return error_response({"error": "Match not found"}, 404)
 
-    # Update scores for each MatchParticipant
-    for mp_id_str, score in scores.items():
-        try:
-            mp_id = int(mp_id_str)
-        except ValueError:
-            continue  # skip invalid keys
-
-        mp = MatchParticipant.query.filter_by(id=mp_id, match_id=match_id).first()
-        if mp:
-            mp.score = score
-
-    # Update match status if provided
-    if status:
-        match.status = status
+    # Update all scores with one UPDATE statement
+    results = parse_scores(results)
+    try:
+        applied, derived = apply_match_updates({match.id: {"scores": parse_scores(scores), "results": results, "status": status}})
+    except ValueError as e:
+        return error_response({"error": str(e)}, 400)
+    if status == "completed" and match.status != "completed":
+        rescheduled = reschedule_after(match.id, ended_at=datetime.utcnow())
+    elif delay is not None:
+        rescheduled = reschedule_after(match.id, delay=delay)
+    elif status == "ongoing" and match.status == "scheduled":
+        rescheduled = reschedule_after(match.id, started_at=datetime.utcnow())
+    else:
+        rescheduled = []
+    rescheduled = describe_changes(rescheduled)
+    bump_event_version(get_match_event_id(match.id))
 
     try:
         db.session.commit()
+        publish_event_update(get_match_event_id(match.id), "match_updated", {
+            "match_id": match.id,
+            "status": status or match.status,
+            "scores": applied[match.id],
+            "results": results,
+            "outcome": derived.get(match.id),
+            "rescheduled": rescheduled
+        })
         return success_response({
             "message": "Match updated",
             "match_id": match.id,
-            "status": match.status,
-            "scores": scores
+            "status": status or match.status,
+            "scores": scores,
+            "outcome": derived.get(match.id),
+            "rescheduled": rescheduled
         }, 200)
     except Exception as e:
         db.session.rollback()
         return error_response({"error": f"Failed to update match: {str(e)}"}, 500)
 
-@event_bp.route("/matches/<int:match_id>/winner", methods=["PATCH"])
+@event_bp.route("/<int:event_id>/matches/scores", methods=["PATCH"])
 @club_owner_required(from_event=True)
-def set_winner(match_id):
+def update_matches(event_id, club):
+    """
+    Update scores and status of many matches in one transaction.
+    Expects JSON: { "matches": [{ "match_id": int, "scores": {match_participant_id: score}, "results": {match_participant_id: result_type}, "status": "string" }, ...] }
+    """
+    data = request.get_json() or {}
+    matches_data = data.get("matches")
+    if not isinstance(matches_data, list) or not matches_data:
+        return error_response({"error": "matches list is required"}, 400)
+
+    updates = {}
+    for m in matches_data:
+        if not isinstance(m, dict) or not isinstance(m.get("match_id"), int):
+            return error_response({"error": "Each entry needs an integer match_id"}, 400)
+        if m["match_id"] in updates:
+            return error_response({"error": f"match_id {m['match_id']} appears more than once"}, 400)
+        updates[m["match_id"]] = {
+            "scores": parse_scores(m.get("scores")),
+            "results": parse_scores(m.get("results")),
+            "status": m.get("status")
+        }
+
+    missing = set(updates) - matches_in_event(event_id, updates.keys())
+    if missing:
+        return error_response({"error": f"Matches not found in this event: {sorted(missing)}"}, 404)
+
+    try:
+        applied, derived = apply_match_updates(updates)
+    except ValueError as e:
+        return error_response({"error": str(e)}, 400)
+    bump_event_version(event_id)
+
+    try:
+        db.session.commit()
+        for match_id, scores in applied.items():
+            publish_event_update(event_id, "match_updated", {
+                "match_id": match_id,
+                "status": updates[match_id]["status"],
+                "scores": scores,
+                "results": updates[match_id]["results"],
+                "outcome": derived.get(match_id)
+            })
+        return success_response({
+            "message": "Matches updated",
+            "matches": [
+                {"match_id": match_id, "status": updates[match_id]["status"], "scores": scores,
+                 "outcome": derived.get(match_id)}
+                for match_id, scores in applied.items()
+            ]
+        }, 200)
+    except Exception as e:
+        db.session.rollback()
+        return error_response({"error": f"Failed to update matches: {str(e)}"}, 500)
+
+@event_bp.route("/matches/<int:match_id>/winner", methods=["PATCH"])
+@club_owner_required(from_match=True)
+def set_winner(match_id, club):
     """
     Set the winner of a match and advance them through the bracket.
+    Setting a different winner on a completed match corrects the result:
+    participants advanced from the old result are replaced and any later
+    result they took part in is reset.
     Only managers and club owners can set match winners.
     """
     data = request.get_json() or {}
@@ -190,6 +269,10 @@ def set_winner(match_id):
 
     if not winner_id:
         return error_response({"error": "winner_id is required"}, 400)
+    if isinstance(winner_id, str) and winner_id.strip().isdigit():
+        winner_id = int(winner_id)
+    if isinstance(winner_id, bool) or not isinstance(winner_id, int):
+        return error_response({"error": "winner_id must be an integer"}, 400)
 
     # Get match with category information
     match = Match.query.options(
@@ -203,150 +286,139 @@ def set_winner(match_id):
     if not match.category.is_bracket:
         return error_response({"error": "Winner can only be set for bracket matches"}, 400)
 
-    # Check if match is already completed
-    if match.status == "completed":
-        return error_response({"error": "Match is already completed"}, 400)
-
-    winner = EventParticipant.query.get(winner_id)
-    if not winner:
-        return error_response({"error": "Winner participant not found"}, 404)
+    graph = get_bracket_graph(match.category_id, match.id)
+    state = load_bracket_state(graph.downstream(match.id))
+    match_state = state[match.id]
 
     # Ensure the winner is actually in this match
-    winner_mp = MatchParticipant.query.filter_by(match_id=match.id, participant_id=winner.id).first()
-    if not winner_mp:
+    if winner_id not in match_state["participants"]:
         return error_response({"error": "This participant is not in the given match"}, 400)
 
-    # Mark this match as completed and set winner
-    match.status = "completed"
-    winner_mp.rank = 1
-    winner_mp.result_type = "win"
+    # Check if match is already completed with this result
+    if match_state["status"] == "completed" and current_winner(match_state) == winner_id:
+        return error_response({"error": "Match is already completed"}, 400)
 
-    # Set all other participants as losers
-    other_participants = MatchParticipant.query.filter(
-        MatchParticipant.match_id == match.id,
-        MatchParticipant.participant_id != winner.id
-    ).all()
-    
-    for i, other_mp in enumerate(other_participants, start=2):
-        other_mp.rank = i
-        other_mp.result_type = "loss"
-
-    # Advance participants to next round(s) based on qualifier_rank
-    advanced_matches = []
-    for rel in match.next_match_links:  # relations where this match is a source
-        target_match = rel.target_match
-        
-        # Find the participant who should advance based on qualifier_rank
-        advancing_participant = None
-        if rel.qualifier_rank == 1:  # Winner advances
-            advancing_participant = winner
-        else:  # Runner-up or other rank advances
-            advancing_mp = MatchParticipant.query.filter_by(
-                match_id=match.id, 
-                rank=rel.qualifier_rank
-            ).first()
-            if advancing_mp:
-                advancing_participant = advancing_mp.participant
-        
-        if advancing_participant:
-            # Check if participant is already in the target match
-            existing_mp = MatchParticipant.query.filter_by(
-                match_id=target_match.id,
-                participant_id=advancing_participant.id
-            ).first()
-            
-            if not existing_mp:
-                # Add participant to target match
-                new_mp = MatchParticipant(
-                    match_id=target_match.id,
-                    participant_id=advancing_participant.id,
-                    role="competitor"
-                )
-                db.session.add(new_mp)
-                advanced_matches.append({
-                    "match_id": target_match.id,
-                    "participant_id": advancing_participant.id,
-                    "qualifier_rank": rel.qualifier_rank
-                })
+    # A corrected result does not move the timetable again
+    first_result = match_state["status"] != "completed"
+    plan = AdvancementPlan(graph, state)
+    plan.set_result(match.id, winner_id)
 
     try:
+        plan.apply()
+        refresh_bracket_matches(match.category_id, plan.touched_matches())
+        rescheduled = describe_changes(reschedule_after(match.id, ended_at=datetime.utcnow()) if first_result else [])
+        bump_event_version(get_match_event_id(match.id))
         db.session.commit()
+        publish_event_update(get_match_event_id(match.id), "winner_set", {
+            "match_id": match.id,
+            "category_id": match.category_id,
+            "winner_id": winner_id,
+            "statuses": plan.statuses,
+            "advanced": plan.advanced,
+            "removed": plan.removed,
+            "reset_matches": plan.reset_matches,
+            "rescheduled": rescheduled
+        })
         
         return success_response({
             "message": "Winner set and participants advanced",
             "match_id": match.id,
-            "winner_id": winner.id,
-            "match_status": match.status,
-            "advanced_to_matches": advanced_matches,
-            "total_advanced": len(advanced_matches)
+            "winner_id": winner_id,
+            "match_status": "completed",
+            "advanced_to_matches": plan.advanced,
+            "total_advanced": len(plan.advanced),
+            "removed_from_matches": plan.removed,
+            "reset_matches": plan.reset_matches,
+            "rescheduled": rescheduled
         }, 200)
         
     except Exception as e:
         db.session.rollback()
         return error_response({"error": f"Failed to update match: {str(e)}"}, 500)
 
-@event_bp.route("/categories/<int:category_id>/bracket", methods=["GET"])
-def get_category_bracket(category_id: int):
-    # Load category with matches, participants, and match participants
-    category = Category.query.options(
-        joinedload(Category.matches)
-            .joinedload(Match.participants)
-            .joinedload(MatchParticipant.participant),
-        joinedload(Category.participant_categories)
-            .joinedload(ParticipantCategory.participant)
-    ).filter_by(id=category_id).first_or_404()
-
-
-    matches = category.matches
-    match_ids = [m.id for m in matches]
-
-    # Build source map for relations
-    source_map: dict[int, list[int]] = defaultdict(list)
-    for r in MatchRelation.query.filter(MatchRelation.target_match_id.in_(match_ids)).all():
-        source_map[r.target_match_id].append(r.source_match_id)
-
-    # Map participant ID to seed for this category
-    participant_seed_map = {
-        pc.participant_id: pc.seed
-        for pc in category.participant_categories
-    }
-
-    # Group matches by round
-    rounds_dict: dict[int, list[dict]] = defaultdict(list)
-    for m in matches:
-        match_data = {
-            "id": m.id,
-            "round": m.round,
-            "match_number": m.match_number,
-            "hidden": False,  # adjust if needed
-            "sourceIds": source_map.get(m.id, []),
-            "slots": [
-                {
-                    "id": mp.participant.id,
-                    "name": mp.participant.name,
-                    "score": mp.score,
-                    "seed": participant_seed_map.get(mp.participant.id)
-                } for mp in m.participants
-            ]
-        }
-        rounds_dict[m.round].append(match_data)
+@event_bp.route("/matches/<int:match_id>/winner", methods=["DELETE"])
+@club_owner_required(from_match=True)
+def undo_winner(match_id, club):
+    """
+    Undo the result of a bracket match.
+    Participants it advanced are removed from later matches, and results
+    of later matches they played in are reset as well.
+    """
+    match = Match.query.get(match_id)
+    if not match:
+        return error_response({"error": "Match not found"}, 404)
 
-    sorted_rounds = [rounds_dict[r] for r in sorted(rounds_dict)]
+    graph = get_bracket_graph(match.category_id, match.id)
+    state = load_bracket_state(graph.downstream(match.id))
+    if state[match.id]["status"] != "completed":
+        return error_response({"error": "Match is not completed"}, 400)
 
-    # List of participants in the category with seeds
-    participants_with_seeds = [
-        {
-            "id": p.id,
-            "name": p.name,
-            "seed": getattr(p, 'seed', None)
-        }
-        for p in category.participants
-    ]
+    plan = AdvancementPlan(graph, state)
+    plan.reset(match.id)
 
-    return success_response({
-        "matches": sorted_rounds,
-        "participants": participants_with_seeds
-    })
+    try:
+        plan.apply()
+        refresh_bracket_matches(match.category_id, plan.touched_matches())
+        bump_event_version(get_match_event_id(match.id))
+        db.session.commit()
+        publish_event_update(get_match_event_id(match.id), "winner_undone", {
+            "match_id": match.id,
+            "category_id": match.category_id,
+            "statuses": plan.statuses,
+            "removed": plan.removed,
+            "reset_matches": plan.reset_matches
+        })
+        return success_response({
+            "message": "Result undone",
+            "match_id": match.id,
+            "removed_from_matches": plan.removed,
+            "reset_matches": plan.reset_matches
+        }, 200)
+    except Exception as e:
+        db.session.rollback()
+        return error_response({"error": f"Failed to update match: {str(e)}"}, 500)
+
+@event_bp.route("/<int:event_id>/matches", methods=["GET"])
+@cached_event_response
+def list_event_matches(event_id):
+    """
+    Paginated matches of an event.
+    Optional query params: category_id, status, page, per_page
+    """
+    query = (
+        with_loaders(Match.query, matches_schema)
+        .join(Category, Match.category_id == Category.id)
+        .filter(Category.event_id == event_id)
+    )
+    category_id = request.args.get("category_id", type=int)
+    if category_id is not None:
+        query = query.filter(Match.category_id == category_id)
+    status = request.args.get("status")
+    if status:
+        query = query.filter(Match.status == status)
+
+    query = query.order_by(Match.category_id, Match.round, Match.match_number, Match.id)
+    return success_response(paginate(query, matches_schema))
+
+@event_bp.route("/categories/<int:category_id>/bracket", methods=["GET"])
+def get_category_bracket(category_id: int):
+    """
+    Bracket of a category grouped by round, served from the stored bracket view.
+    Supports If-None-Match: an unchanged bracket answers 304 without a body.
+    """
+    etag = get_bracket_etag(category_id)
+    if etag is None:
+        return error_response({"message": "Category not found"}, 404)
+
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        body = get_bracket_body(category_id)
+        response = make_response('{"data":' + body + ',"success":true}', 200)
+        response.mimetype = "application/json"
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @event_bp.route("/matches/clear_matches", methods=["DELETE"])
@@ -357,7 +429,11 @@ def clear_matches():
         db.session.query(MatchRelation).delete()
         # db.session.query(ParticipantCategory).delete()
         # db.session.query(EventParticipant).delete()
+        invalidate_bracket_views()
+        bump_all_event_versions()
         db.session.commit()
+        invalidate_bracket_graph()
+        invalidate_match_auth()
         return success_response({"message": f"Deleted {num_deleted} matches"}, 200)
     except Exception as e:
         db.session.rollback()
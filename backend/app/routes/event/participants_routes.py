@@ -1,11 +1,39 @@
-from flask import request
+from flask import current_app, request
+from sqlalchemy import delete
 from app.extensions import db
-from app.models.event_model import EventParticipant, Category, ParticipantCategory
+from app.models.event_model import EventParticipant, MatchParticipant, ParticipantCategory
+from app.schemas.event_schema import event_participants_schema
+from app.schemas.loaders import with_loaders
+from app.utils.pagination import paginate
+from app.services.bracket_view_service import invalidate_bracket_views
+from app.services.response_cache import bump_all_event_versions, bump_event_version, cached_event_response
+from app.services.participant_import_service import csv_rows, event_category_ids, import_participants, json_rows
 from app.utils.response import error_response, success_response
 from app.services.roles_service import manager_required, club_owner_required, club_in_event_required
+from app.services.standings_service import rebuild_event_standings
 from . import event_bp
 
 
+@event_bp.route("/<int:event_id>/participants", methods=["GET"])
+@cached_event_response
+def list_event_participants(event_id):
+    """
+    Paginated participants of an event.
+    Optional query params: club_id, category_id, page, per_page
+    """
+    query = with_loaders(EventParticipant.query, event_participants_schema).filter(EventParticipant.event_id == event_id)
+    club_id = request.args.get("club_id", type=int)
+    if club_id is not None:
+        query = query.filter(EventParticipant.club_id == club_id)
+    category_id = request.args.get("category_id", type=int)
+    if category_id is not None:
+        query = query.join(ParticipantCategory, ParticipantCategory.participant_id == EventParticipant.id) \
+            .filter(ParticipantCategory.category_id == category_id)
+
+    query = query.order_by(EventParticipant.id)
+    return success_response(paginate(query, event_participants_schema))
+
+
 @event_bp.route("/<int:event_id>/participants/<int:club_id>/add", methods=["POST"])
 @club_in_event_required
 def add_event_participant(event_id, club_id, club, event):
@@ -25,19 +53,16 @@ def add_event_participant(event_id, club_id, club, event):
     db.session.add(participant)
     db.session.flush()  # ensures participant.id is available
 
-    # handle categories if provided (list of IDs)
+    # handle categories if provided (list of IDs), checked with one query
     if "category_ids" in data and isinstance(data["category_ids"], list):
-        for cat_id in data["category_ids"]:
-            category = Category.query.filter_by(id=cat_id, event_id=event_id).first()
-            if not category:
-                continue  # skip missing or mismatched categories
-
-            pc = ParticipantCategory(
-                participant_id=participant.id,
-                category_id=category.id
-            )
-            db.session.add(pc)
+        requested = {c for c in data["category_ids"] if isinstance(c, int)}
+        category_ids = sorted(event_category_ids(event.id, requested)) if requested else []
+        for category_id in category_ids:  # missing or mismatched categories are skipped
+            db.session.add(ParticipantCategory(participant_id=participant.id, category_id=category_id))
+        if category_ids:
+            invalidate_bracket_views(category_ids=category_ids)
 
+    bump_event_version(event.id)
     db.session.commit()
 
     return success_response({
@@ -55,6 +80,39 @@ def add_event_participant(event_id, club_id, club, event):
     }, 201)
 
 
+@event_bp.route("/<int:event_id>/participants/<int:club_id>/bulk", methods=["POST"])
+@club_in_event_required
+def bulk_add_event_participants(event_id, club_id, club, event):
+    """
+    Register many participants of a club at once.
+    Body: JSON { "participants": [{ "name": str, "category_ids": [int] }, ...] }
+    or CSV (Content-Type: text/csv) with a header row: name,category_ids
+    where category_ids are separated by ";".
+    Names the club already has in the event are not duplicated, only their
+    missing categories are added. Invalid rows are skipped and reported.
+    """
+    max_rows = current_app.config.get("BULK_IMPORT_MAX_ROWS", 10000)
+    try:
+        if request.mimetype == "text/csv":
+            rows = csv_rows(request.stream)
+        else:
+            data = request.get_json(silent=True)
+            if data is None:
+                return error_response({"message": "Send JSON or text/csv"}, 400)
+            rows = json_rows(data)
+        summary, category_ids = import_participants(event.id, club.id, rows, max_rows)
+    except ValueError as e:
+        db.session.rollback()
+        return error_response({"message": str(e)}, 400)
+
+    if category_ids:
+        invalidate_bracket_views(category_ids=category_ids)
+    bump_event_version(event.id)
+    db.session.commit()
+
+    return success_response(summary, 201)
+
+
 @event_bp.route("/<int:event_id>/participants/<int:club_id>/remove/<int:participant_id>", methods=["DELETE"])
 @club_in_event_required
 def delete_event_participant(event_id, club_id, participant_id, club, event):
@@ -70,8 +128,15 @@ def delete_event_participant(event_id, club_id, participant_id, club, event):
     if participant.event_id != event.id or participant.club_id != club.id:
         return error_response({"message": "Participant does not belong to this club in this event"}, 403)
 
+    # Foreign key cascades do not fire on SQLite, so the results go explicitly
+    # and the standings are recomputed without them
+    db.session.execute(delete(MatchParticipant).where(MatchParticipant.participant_id == participant.id))
     participant.categories.clear()
     db.session.delete(participant)
+    db.session.flush()
+    rebuild_event_standings(event.id)
+    invalidate_bracket_views(event_id=event.id)
+    bump_event_version(event.id)
     db.session.commit()
 
     return success_response({"message": f"Participant {participant.name} deleted successfully"})
@@ -84,5 +149,6 @@ def clear_participant_categories():
     """
     from sqlalchemy import text
     db.session.execute(text("DELETE FROM participant_categories"))
+    bump_all_event_versions()
     db.session.commit()
     return success_response({"message": "All participant-category relationships cleared"})
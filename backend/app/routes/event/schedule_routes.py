@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from flask import current_app, request
+from app.extensions import db
+from app.services.live_updates import publish_event_update
+from app.services.response_cache import bump_event_version
+from app.services.roles_service import club_owner_required
+from app.services.schedule_service import schedule_event
+from app.utils.response import error_response, success_response
+from . import event_bp
+
+
+def _parse_start(value):
+    """Naive UTC datetime from an ISO 8601 string, like the other DateTime columns."""
+    if not isinstance(value, str):
+        raise ValueError
+    start = datetime.fromisoformat(value)
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    return start
+
+
+# ---- Timetable of an event (organizer only) ----
+@event_bp.route("/<int:event_id>/schedule", methods=["POST"])
+@club_owner_required(from_event=True)
+def create_schedule(event_id, club):
+    """
+    Assign start times and courts to every match of the event still scheduled.
+    Expects JSON: { "start": ISO datetime, "courts": int,
+                    "match_duration_minutes": number, "rest_minutes": number }
+    The durations apply to categories whose ruleset does not set its own.
+    Running it again recomputes the timetable of the matches not yet played.
+    """
+    data = request.get_json() or {}
+    try:
+        start = _parse_start(data.get("start"))
+    except ValueError:
+        return error_response({"message": "start must be an ISO 8601 datetime"}, 400)
+
+    courts = data.get("courts")
+    max_courts = current_app.config["SCHEDULE_MAX_COURTS"]
+    if not isinstance(courts, int) or isinstance(courts, bool) or not 1 <= courts <= max_courts:
+        return error_response({"message": f"courts must be an integer between 1 and {max_courts}"}, 400)
+
+    try:
+        schedule = schedule_event(
+            event_id, start, courts,
+            duration=data.get("match_duration_minutes"), rest=data.get("rest_minutes")
+        )
+    except ValueError as e:
+        return error_response({"message": str(e)}, 400)
+
+    bump_event_version(event_id)
+    db.session.commit()
+    publish_event_update(event_id, "schedule_updated", {"total_matches": len(schedule)})
+
+    timetable = sorted(schedule.items(), key=lambda item: (item[1], item[0]))
+    return success_response({
+        "message": "Schedule created",
+        "total_matches": len(schedule),
+        "matches": [
+            {"match_id": match_id, "start_time": start_time.isoformat(), "court": court}
+            for match_id, (start_time, court) in timetable
+        ]
+    })
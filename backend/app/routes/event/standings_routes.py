@@ -0,0 +1,33 @@
+from flask import request
+from app.extensions import db
+from app.models.event_model import Event
+from app.utils.response import error_response, success_response
+from app.services.roles_service import club_owner_required
+from app.services.standings_service import get_event_standings, rebuild_event_standings
+from app.services.response_cache import bump_event_version, cached_event_response
+from . import event_bp
+
+# ---- Event standings (public) ----
+@event_bp.route("/<int:event_id>/standings", methods=["GET"])
+@cached_event_response
+def get_standings(event_id):
+    """
+    Club, participant and per-category standings.
+    Served from the standings tables that are updated as results are recorded.
+    Optional query params: category_id, limit
+    """
+    if not db.session.query(Event.id).filter_by(id=event_id).first():
+        return error_response({"message": "Event not found"}, 404)
+
+    category_id = request.args.get("category_id", type=int)
+    limit = request.args.get("limit", type=int)
+    return success_response(get_event_standings(event_id, category_id=category_id, limit=limit))
+
+# ---- Rebuild standings from match results (organizer only) ----
+@event_bp.route("/<int:event_id>/standings/rebuild", methods=["POST"])
+@club_owner_required(from_event=True)
+def rebuild_standings(event_id, club):
+    rebuild_event_standings(event_id)
+    bump_event_version(event_id)
+    db.session.commit()
+    return success_response(get_event_standings(event_id))
@@ -0,0 +1,14 @@
+from flask import Blueprint
+from app.extensions import db
+from app.services.roles_service import manager_required
+from app.utils.engine import pool_status
+from app.utils.response import success_response
+
+metrics_bp = Blueprint("metrics", __name__, url_prefix="/api/metrics")
+
+# ---- Database connection pool (managers only) ----
+@metrics_bp.route("/db", methods=["GET"])
+@manager_required
+def db_metrics():
+    """Pool size and connections checked in/out for this worker."""
+    return success_response(pool_status(db.engine))
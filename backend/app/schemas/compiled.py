@@ -0,0 +1,91 @@
+from flask import current_app, has_request_context, request
+from marshmallow import fields
+
+# Marshmallow walks every field of every object through its generic
+# serialization machinery, which dominates the dump of large events.
+# compile_schema() turns a schema (including `only` restrictions and nested
+# schemas) into a generated plain function that builds the same dicts
+# directly, and caches it per schema shape.
+
+_compiled: dict = {}
+
+# Expression producing the serialized value of `v` for each scalar field type,
+# matching what marshmallow's field would output
+_SCALARS = {
+    fields.Integer: "int(v)",
+    fields.Float: "float(v)",
+    fields.String: "str(v)",
+    fields.Boolean: "bool(v)",
+    fields.DateTime: "v.isoformat()",
+    fields.Raw: "v",
+}
+
+
+def _scalar_expr(field):
+    for field_type in type(field).__mro__:
+        if field_type in _SCALARS:
+            return _SCALARS[field_type]
+    return None
+
+
+def _cache_key(schema):
+    return (type(schema), frozenset(schema.dump_fields), tuple(
+        _cache_key(f.schema) if isinstance(f, fields.Nested) else None
+        for f in schema.dump_fields.values()
+    ))
+
+
+def _compile_one(schema):
+    """Generate `dump(obj) -> dict` for a single object of the schema."""
+    env = {}
+    items = []
+    for i, (key, field) in enumerate(schema.dump_fields.items()):
+        attr = field.attribute or key
+        if isinstance(field, fields.Nested):
+            env[f"nested_{i}"] = _compile_one_cached(field.schema)
+            if field.many:
+                expr = f"[nested_{i}(x) for x in obj.{attr}]"
+            else:
+                expr = f"(None if (v := obj.{attr}) is None else nested_{i}(v))"
+        elif isinstance(field, fields.Method):
+            env[f"method_{i}"] = getattr(schema, field.serialize_method_name)
+            expr = f"method_{i}(obj)"
+        else:
+            scalar = _scalar_expr(field)
+            if scalar is None:
+                env[f"field_{i}"] = field
+                expr = f"field_{i}.serialize({attr!r}, obj)"
+            elif scalar == "v":
+                expr = f"obj.{attr}"
+            else:
+                expr = f"(None if (v := obj.{attr}) is None else {scalar})"
+        items.append(f"        {key!r}: {expr},")
+
+    source = "def dump(obj):\n    return {\n" + "\n".join(items) + "\n    }\n"
+    exec(compile(source, f"<compiled {type(schema).__name__}>", "exec"), env)
+    return env["dump"]
+
+
+def _compile_one_cached(schema):
+    key = _cache_key(schema)
+    if key not in _compiled:
+        _compiled[key] = _compile_one(schema)
+    return _compiled[key]
+
+
+def compile_schema(schema):
+    """Return a cached function producing the same output as schema.dump()."""
+    dump_one = _compile_one_cached(schema)
+    if schema.many:
+        return lambda objs: [dump_one(obj) for obj in objs]
+    return dump_one
+
+
+def dump(schema, obj):
+    """
+    Dump with the compiled serializer when the current endpoint is listed in
+    COMPILED_SERIALIZER_ENDPOINTS, otherwise with marshmallow.
+    """
+    if has_request_context() and request.endpoint in current_app.config.get("COMPILED_SERIALIZER_ENDPOINTS", ()):
+        return compile_schema(schema)(obj)
+    return schema.dump(obj)
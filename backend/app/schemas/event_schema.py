@@ -60,12 +60,14 @@ class CategorySchemaFull(ma.SQLAlchemyAutoSchema):
         model = Category
         include_fk = True
         load_instance = True
+        exclude = ("ruleset_version",)
 
 class CategorySchemaSimple(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Category
         include_fk = True
         load_instance = True
+        exclude = ("ruleset_version",)
 
 class EventJoinLinkSchema(ma.SQLAlchemyAutoSchema):
     class Meta: 
@@ -83,6 +85,7 @@ class EventSchema(ma.SQLAlchemyAutoSchema):
         model = Event
         include_fk = True
         load_instance = True
+        exclude = ("version",)
 
 class EventJoinRequestSchema(ma.SQLAlchemyAutoSchema):
     club = ma.Nested(ClubSchema)
@@ -96,4 +99,30 @@ class EventJoinRequestSchema(ma.SQLAlchemyAutoSchema):
 
 event_schema = EventSchema()
 events_schema = EventSchema(many=True)
-join_requests_schema = EventJoinRequestSchema(many=True)
\ No newline at end of file
+join_requests_schema = EventJoinRequestSchema(many=True)
+event_participants_schema = EventParticipantSchema(many=True)
+matches_schema = MatchSchema(many=True)
+
+# ---- Sparse event payloads ----
+EVENT_FIELDS = ("id", "name", "organizer_id")
+EVENT_INCLUDES = ("organizer", "participating_clubs", "participants", "categories", "categories.matches", "join_links")
+
+
+def event_schema_for(fields=None, include=None):
+    """
+    EventSchema limited to the requested scalar fields and nested resources.
+    "categories" alone dumps the categories without their matches.
+    Returns the full schema when neither is given.
+    """
+    if fields is None and include is None:
+        return event_schema
+
+    only = set(fields or EVENT_FIELDS)
+    for name in include or ():
+        if name == "categories":
+            only.update(f"categories.{f}" for f in CategorySchemaFull().fields if f != "matches")
+        else:
+            only.add(name)
+    if "categories.matches" in only:
+        only = {f for f in only if not f.startswith("categories.")} | {"categories"}
+    return EventSchema(only=tuple(only))
\ No newline at end of file
@@ -0,0 +1,81 @@
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.event_model import Event, EventParticipant, Category, Match, MatchParticipant, ParticipantCategory, EventJoinRequest
+from app.models.user_model import User
+from app.schemas import event_schema as es
+from app.schemas import user_schema as us
+from app.schemas.event_schema import EVENT_INCLUDES
+
+# Loader options for every nested field a schema dumps, so serializing a
+# result never falls back to lazy loading. Each function takes the loader
+# path it is reached through (None at the root) and extends it.
+# Collections use selectinload (one extra query per level), many-to-one
+# relationships use joinedload.
+
+
+def _load(parent, strategy, attr):
+    """Start a loader path at attr, or continue the parent path."""
+    return strategy(attr) if parent is None else getattr(parent, strategy.__name__)(attr)
+
+
+def event_participant_loaders(parent=None):
+    return [
+        _load(parent, joinedload, EventParticipant.club),
+        _load(_load(parent, selectinload, EventParticipant.participant_categories),
+              joinedload, ParticipantCategory.category),
+    ]
+
+
+def match_participant_loaders(parent=None):
+    return [_load(parent, joinedload, MatchParticipant.participant)]
+
+
+def match_loaders(parent=None):
+    return match_participant_loaders(_load(parent, selectinload, Match.participants))
+
+
+def category_full_loaders(parent=None):
+    return match_loaders(_load(parent, selectinload, Category.matches))
+
+
+def event_loaders(parent=None, include=None):
+    """Loaders for the whole event tree, or only for the nested resources in include."""
+    include = set(EVENT_INCLUDES if include is None else include)
+    loaders = []
+    if "organizer" in include:
+        loaders.append(_load(parent, joinedload, Event.organizer))
+    if "participating_clubs" in include:
+        loaders.append(_load(parent, selectinload, Event.participating_clubs))
+    if "join_links" in include:
+        loaders.append(_load(parent, selectinload, Event.join_links))
+    if "participants" in include:
+        loaders.extend(event_participant_loaders(_load(parent, selectinload, Event.participants)))
+    if "categories.matches" in include:
+        loaders.extend(category_full_loaders(_load(parent, selectinload, Event.categories)))
+    elif "categories" in include:
+        loaders.append(_load(parent, selectinload, Event.categories))
+    return loaders
+
+
+def join_request_loaders(parent=None):
+    return [_load(parent, joinedload, EventJoinRequest.club)]
+
+
+def user_loaders(parent=None):
+    return [_load(parent, selectinload, User.clubs)]
+
+
+SCHEMA_LOADERS = {
+    es.EventSchema: event_loaders,
+    es.EventParticipantSchema: event_participant_loaders,
+    es.CategorySchemaFull: category_full_loaders,
+    es.MatchSchema: match_loaders,
+    es.MatchParticipantSchema: match_participant_loaders,
+    es.EventJoinRequestSchema: join_request_loaders,
+    us.UserSchema: user_loaders,
+}
+
+
+def with_loaders(query, schema):
+    """Apply the loader options a schema needs to a query that selects its model."""
+    loaders = SCHEMA_LOADERS.get(type(schema))
+    return query.options(*loaders()) if loaders else query
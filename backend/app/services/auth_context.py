@@ -0,0 +1,158 @@
+import time
+from flask import current_app, g, has_app_context, has_request_context
+from flask_jwt_extended import get_jwt
+from sqlalchemy import update
+from app.extensions import db
+from app.models.user_model import User, Club
+from app.models.event_model import Event, Category, Match, event_clubs
+
+# Authorization facts (a user's role and owned clubs, an event's organizer and
+# participating clubs) are resolved once per request into flask.g and kept in a
+# process cache for AUTH_CACHE_TTL seconds, so permission checks are set lookups.
+# Writes that change them call the invalidate_* helpers; other workers pick the
+# change up when their entry expires.
+# With JWT_TRUST_CLAIMS the user facts come from the access token instead, as
+# long as its "ver" claim still matches the user's token_version.
+
+
+def _process_cache():
+    """(kind, id) -> (expires_at, value), one dict per app."""
+    return current_app.extensions.setdefault("auth_context", {})
+
+
+def _resolve(kind, key, loader):
+    per_request = g.setdefault("_auth_context", {})
+    if (kind, key) in per_request:
+        return per_request[(kind, key)]
+
+    cache = _process_cache()
+    now = time.monotonic()
+    hit = cache.get((kind, key))
+    if hit and hit[0] > now:
+        value = hit[1]
+    else:
+        value = loader(key)
+        ttl = current_app.config.get("AUTH_CACHE_TTL", 0)
+        # Misses are not cached so a freshly created row is visible right away
+        if value is not None and ttl:
+            cache[(kind, key)] = (now + ttl, value)
+        else:
+            cache.pop((kind, key), None)
+    per_request[(kind, key)] = value
+    return value
+
+
+def _invalidate(kind, key=None):
+    if not has_app_context():
+        return
+    for cache in (_process_cache(), g.get("_auth_context", {})):
+        for cache_key in [k for k in list(cache) if k[0] == kind and (key is None or k[1] == key)]:
+            cache.pop(cache_key, None)
+
+
+# ---- loaders ----
+
+def _load_user(user_id):
+    rows = (
+        db.session.query(User.role, Club.id)
+        .outerjoin(Club, Club.owner_id == User.id)
+        .filter(User.id == user_id)
+        .all()
+    )
+    if not rows:
+        return None
+    return {
+        "id": user_id,
+        "role": rows[0][0],
+        "club_ids": frozenset(club_id for _, club_id in rows if club_id is not None)
+    }
+
+
+def _load_token_version(user_id):
+    return db.session.query(User.token_version).filter(User.id == user_id).scalar()
+
+
+def _load_event(event_id):
+    row = db.session.query(Event.organizer_id).filter(Event.id == event_id).first()
+    if row is None:
+        return None
+    club_ids = db.session.query(event_clubs.c.club_id).filter(event_clubs.c.event_id == event_id)
+    return {
+        "id": event_id,
+        "organizer_id": row.organizer_id,
+        "club_ids": frozenset(r.club_id for r in club_ids)
+    }
+
+
+def _load_club(club_id):
+    owner_id = db.session.query(Club.owner_id).filter(Club.id == club_id).scalar()
+    if owner_id is None:
+        return None
+    return {"id": club_id, "owner_id": owner_id}
+
+
+def _load_match_event(match_id):
+    return (
+        db.session.query(Category.event_id)
+        .join(Match, Match.category_id == Category.id)
+        .filter(Match.id == match_id)
+        .scalar()
+    )
+
+
+# ---- public API ----
+
+def _claims_auth(user_id):
+    """User facts from the current access token, or None when they cannot be trusted."""
+    if not (current_app.config.get("JWT_TRUST_CLAIMS") and has_request_context()):
+        return None
+    claims = get_jwt()
+    if "ver" not in claims or str(claims.get("sub")) != str(user_id):
+        return None
+    if claims["ver"] != _resolve("version", user_id, _load_token_version):
+        return None  # role or clubs changed since the token was issued
+    return {"id": user_id, "role": claims["role"], "club_ids": frozenset(claims["clubs"])}
+
+
+def get_user_auth(user_id):
+    """{"id", "role", "club_ids"} of a user, or None if the user does not exist."""
+    user_id = int(user_id)
+    return _claims_auth(user_id) or _resolve("user", user_id, _load_user)
+
+
+def get_event_auth(event_id):
+    """{"id", "organizer_id", "club_ids"} of an event, or None if the event does not exist."""
+    return _resolve("event", int(event_id), _load_event)
+
+
+def get_club_auth(club_id):
+    """{"id", "owner_id"} of a club, or None if the club does not exist."""
+    return _resolve("club", int(club_id), _load_club)
+
+
+def get_match_event_id(match_id):
+    """Id of the event a match belongs to, or None if the match does not exist."""
+    return _resolve("match", int(match_id), _load_match_event)
+
+
+def bump_token_version(user_id):
+    """Mark the claims of every token issued to the user as stale. Call invalidate_user_auth after commit."""
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def invalidate_user_auth(user_id=None):
+    _invalidate("user", user_id)
+    _invalidate("version", user_id)
+
+
+def invalidate_event_auth(event_id=None):
+    _invalidate("event", event_id)
+
+
+def invalidate_match_auth(match_id=None):
+    _invalidate("match", match_id)
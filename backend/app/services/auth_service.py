@@ -4,6 +4,15 @@ from app.extensions import db
 from flask_jwt_extended import create_access_token, create_refresh_token
 from werkzeug.security import generate_password_hash, check_password_hash
 from app.schemas.user_schema import users_schema
+from app.schemas.loaders import with_loaders
+
+def token_claims(user):
+    """Authorization claims embedded in access tokens: role, owned club ids and token version."""
+    return {
+        "role": user.role,
+        "clubs": sorted(club.id for club in user.clubs),
+        "ver": user.token_version or 0
+    }
 
 def register_user(email: str, password: str, role: str = "user"):
     # Check if email or username exists
@@ -15,7 +24,7 @@ def register_user(email: str, password: str, role: str = "user"):
     user = User(email=email, password_hash=hashed_password, role=role)
     db.session.add(user)
     db.session.commit()
-    access_token = create_access_token(identity=str(user.id))
+    access_token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
     return {"access_token": access_token, "user": user}, 201
 
 def login_user(email: str, password: str):
@@ -23,10 +32,15 @@ def login_user(email: str, password: str):
     if not user or not check_password_hash(user.password_hash, password):
         return {"message": "Invalid email or password"}, 401
 
-    access_token = create_access_token(identity=str(user.id))
+    access_token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
     refresh_token = create_refresh_token(identity=str(user.id))
     return {"access_token": access_token, "user": user, "refresh_token": refresh_token}, 200
 
-def get_all_users_by_manager():
-    users = User.query.all()
-    return users
\ No newline at end of file
+def get_all_users_by_manager(role=None, email_prefix=None):
+    """Query of all users with their clubs, optionally filtered by role and email prefix."""
+    query = with_loaders(User.query, users_schema)
+    if role:
+        query = query.filter(User.role == role)
+    if email_prefix:
+        query = query.filter(User.email.startswith(email_prefix, autoescape=True))
+    return query
\ No newline at end of file
@@ -0,0 +1,236 @@
+from collections import defaultdict, deque
+from sqlalchemy import case, delete, insert, update
+from app.extensions import db
+from app.models.event_model import Match, MatchParticipant, MatchRelation
+from app.services.standings_service import apply_result_changes
+
+# Bracket structure only changes when a bracket is created or cleared, so the
+# adjacency index is kept per process and dropped explicitly on those writes.
+_graph_cache: dict[int, "BracketGraph"] = {}
+
+
+class BracketGraph:
+    """Adjacency index over the MatchRelation rows of one category."""
+
+    def __init__(self, category_id, match_ids, relations):
+        self.category_id = category_id
+        self.match_ids = set(match_ids)
+        self.outgoing = defaultdict(list)  # source_match_id -> [(target_match_id, qualifier_rank)]
+        self.incoming = defaultdict(list)  # target_match_id -> [(source_match_id, qualifier_rank)]
+        for source_id, target_id, qualifier_rank in relations:
+            self.outgoing[source_id].append((target_id, qualifier_rank or 1))
+            self.incoming[target_id].append((source_id, qualifier_rank or 1))
+
+    @classmethod
+    def load(cls, category_id):
+        match_ids = [
+            r.id for r in db.session.query(Match.id).filter(Match.category_id == category_id)
+        ]
+        relations = (
+            db.session.query(MatchRelation.source_match_id, MatchRelation.target_match_id, MatchRelation.qualifier_rank)
+            .join(Match, MatchRelation.source_match_id == Match.id)
+            .filter(Match.category_id == category_id)
+            .all()
+        )
+        return cls(category_id, match_ids, relations)
+
+    def downstream(self, match_id):
+        """The match plus every match its result can flow into."""
+        seen = {match_id}
+        queue = deque([match_id])
+        while queue:
+            for target_id, _ in self.outgoing.get(queue.popleft(), []):
+                if target_id not in seen:
+                    seen.add(target_id)
+                    queue.append(target_id)
+        return seen
+
+
+def get_bracket_graph(category_id, match_id=None):
+    """
+    Return the cached graph of a category, loading it on first use.
+    Passing match_id reloads a graph that does not know the match yet
+    (e.g. a bracket recreated by another worker).
+    """
+    graph = _graph_cache.get(category_id)
+    if graph is None or (match_id is not None and match_id not in graph.match_ids):
+        graph = BracketGraph.load(category_id)
+        _graph_cache[category_id] = graph
+    return graph
+
+
+def invalidate_bracket_graph(category_id=None):
+    """Drop the cached graph of a category, or every graph when no id is given."""
+    if category_id is None:
+        _graph_cache.clear()
+    else:
+        _graph_cache.pop(category_id, None)
+
+
+def load_bracket_state(match_ids):
+    """
+    Load status and participants of the given matches in two queries.
+    Returns {match_id: {"status": str, "participants": {participant_id: {"id", "rank", "result_type"}}}}
+    """
+    match_ids = list(match_ids)
+    state = {
+        r.id: {"status": r.status, "participants": {}}
+        for r in db.session.query(Match.id, Match.status).filter(Match.id.in_(match_ids))
+    }
+    rows = (
+        db.session.query(MatchParticipant.id, MatchParticipant.match_id, MatchParticipant.participant_id,
+                         MatchParticipant.rank, MatchParticipant.result_type)
+        .filter(MatchParticipant.match_id.in_(match_ids))
+        .order_by(MatchParticipant.id)
+    )
+    for r in rows:
+        state[r.match_id]["participants"][r.participant_id] = {
+            "id": r.id, "rank": r.rank, "result_type": r.result_type
+        }
+    return state
+
+
+def current_winner(match_state):
+    for participant_id, mp in match_state["participants"].items():
+        if mp["rank"] == 1:
+            return participant_id
+    return None
+
+
+class AdvancementPlan:
+    """
+    Changes computed in memory against a loaded bracket state.
+    Nothing touches the database until apply() writes them in bulk.
+    """
+
+    def __init__(self, graph, state):
+        self.graph = graph
+        self.state = state
+        self.mp_updates = {}   # match_participant_id -> {"rank", "result_type"}
+        self.mp_deletes = set()
+        self.mp_inserts = []   # {"match_id", "participant_id", "role"}
+        self.statuses = {}     # match_id -> status
+        self.result_changes = []  # (participant_id, old_result_type, new_result_type)
+        self.advanced = []
+        self.removed = []
+        self.reset_matches = []
+
+    # ---- in-memory operations ----
+
+    def _set_mp(self, participant_id, mp, rank, result_type):
+        if mp["rank"] == rank and mp["result_type"] == result_type:
+            return
+        if mp["result_type"] != result_type:
+            self.result_changes.append((participant_id, mp["result_type"], result_type))
+        mp["rank"], mp["result_type"] = rank, result_type
+        if mp["id"] is not None:
+            self.mp_updates[mp["id"]] = {"rank": rank, "result_type": result_type}
+
+    def _advancing(self, match_id):
+        """{qualifier_rank: participant_id} for a completed match."""
+        match_state = self.state[match_id]
+        if match_state["status"] != "completed":
+            return {}
+        return {mp["rank"]: pid for pid, mp in match_state["participants"].items() if mp["rank"]}
+
+    def _add_participant(self, match_id, participant_id, qualifier_rank):
+        participants = self.state[match_id]["participants"]
+        if participant_id in participants:
+            return
+        participants[participant_id] = {"id": None, "rank": None, "result_type": None}
+        self.mp_inserts.append({"match_id": match_id, "participant_id": participant_id, "role": "competitor"})
+        self.advanced.append({
+            "match_id": match_id,
+            "participant_id": participant_id,
+            "qualifier_rank": qualifier_rank
+        })
+
+    def _remove_participant(self, match_id, participant_id):
+        # A result that involved the removed participant is no longer valid
+        if self.state[match_id]["status"] == "completed":
+            self.reset(match_id)
+        mp = self.state[match_id]["participants"].pop(participant_id, None)
+        if mp is None:
+            return
+        if mp["id"] is None:
+            self.mp_inserts = [
+                row for row in self.mp_inserts
+                if (row["match_id"], row["participant_id"]) != (match_id, participant_id)
+            ]
+        else:
+            self.mp_deletes.add(mp["id"])
+            self.mp_updates.pop(mp["id"], None)
+        self.removed.append({"match_id": match_id, "participant_id": participant_id})
+
+    def reset(self, match_id):
+        """Undo the result of a match and everything that was advanced from it."""
+        advancing = self._advancing(match_id)
+        for (target_id, qualifier_rank) in self.graph.outgoing.get(match_id, []):
+            participant_id = advancing.get(qualifier_rank)
+            if participant_id is not None:
+                self._remove_participant(target_id, participant_id)
+
+        match_state = self.state[match_id]
+        for pid, mp in match_state["participants"].items():
+            self._set_mp(pid, mp, None, None)
+        if match_state["status"] == "completed":
+            match_state["status"] = self.statuses[match_id] = "scheduled"
+            self.reset_matches.append(match_id)
+
+    def set_result(self, match_id, winner_id):
+        """
+        Record the winner of a match and advance participants by qualifier_rank.
+        On an already completed match only the edges whose advancing participant
+        changed are rewritten, cascading down the tree where needed.
+        """
+        match_state = self.state[match_id]
+        previous = self._advancing(match_id)
+
+        others = [pid for pid in match_state["participants"] if pid != winner_id]
+        ranking = {winner_id: 1, **{pid: i for i, pid in enumerate(others, start=2)}}
+
+        for (target_id, qualifier_rank) in self.graph.outgoing.get(match_id, []):
+            old = previous.get(qualifier_rank)
+            new = next((pid for pid, rank in ranking.items() if rank == qualifier_rank), None)
+            if old == new:
+                continue
+            if old is not None:
+                self._remove_participant(target_id, old)
+            if new is not None:
+                self._add_participant(target_id, new, qualifier_rank)
+
+        for pid, mp in match_state["participants"].items():
+            rank = ranking[pid]
+            self._set_mp(pid, mp, rank, "win" if rank == 1 else "loss")
+        if match_state["status"] != "completed":
+            match_state["status"] = self.statuses[match_id] = "completed"
+
+    def touched_matches(self):
+        """Matches whose participants changed."""
+        return {m["match_id"] for m in self.advanced + self.removed}
+
+    # ---- persistence ----
+
+    def apply(self):
+        """Write the plan with one statement per kind of change and update the standings."""
+        if self.mp_deletes:
+            db.session.execute(
+                delete(MatchParticipant)
+                .where(MatchParticipant.id.in_(list(self.mp_deletes)))
+                .execution_options(synchronize_session=False)
+            )
+        if self.mp_updates:
+            db.session.execute(
+                update(MatchParticipant),
+                [{"id": mp_id, **values} for mp_id, values in self.mp_updates.items()]
+            )
+        if self.mp_inserts:
+            db.session.execute(insert(MatchParticipant).values(self.mp_inserts))
+        if self.statuses:
+            db.session.execute(
+                update(Match)
+                .where(Match.id.in_(list(self.statuses)))
+                .values(status=case(self.statuses, value=Match.id))
+                .execution_options(synchronize_session=False)
+            )
+        apply_result_changes(self.graph.category_id, self.result_changes)
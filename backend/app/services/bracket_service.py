@@ -0,0 +1,333 @@
+import math
+from sqlalchemy import insert, update
+from app.extensions import db
+from app.models.event_model import Match, MatchParticipant, MatchRelation, ParticipantCategory
+
+BRACKET_FORMATS = ("single_elimination", "double_elimination", "round_robin")
+
+# Rows per multi-row INSERT, keeps every statement well under the
+# bound-parameter limits of SQLite and MySQL
+BULK_CHUNK_SIZE = 500
+
+
+def next_power_of_two(x: int) -> int:
+    return 1 if x == 0 else 2 ** math.ceil(math.log2(x))
+
+
+def seeded_order(n: int) -> list[int]:
+    """
+    Standard bracket placement for a bracket of size n (power of two).
+    e.g. 8 -> [1, 8, 4, 5, 2, 7, 3, 6], so seeds 1 and 2 can only meet in the final.
+    """
+    if n == 1:
+        return [1]
+    prev = seeded_order(n // 2)
+    out = []
+    for s in prev:
+        out.extend((s, n + 1 - s))
+    return out
+
+
+def load_seeded_entrants(category_id: int) -> list[tuple[int, int]]:
+    """
+    Return [(participant_id, seed), ...] for a category ordered by seed.
+    Unseeded participants go last (by id) and get the next free seed numbers.
+    """
+    rows = (
+        db.session.query(ParticipantCategory.participant_id, ParticipantCategory.seed)
+        .filter(ParticipantCategory.category_id == category_id)
+        .all()
+    )
+    rows.sort(key=lambda r: (r.seed is None, r.seed or 0, r.participant_id))
+    return [(r.participant_id, i) for i, r in enumerate(rows, start=1)]
+
+
+# ---- Bracket graph helpers ----
+# A node is one potential match. Each slot is either:
+#   ("entrant", (participant_id, seed))   a participant placed directly in the match
+#   ("source", node, qualifier_rank)      the winner (1) / loser (2) of another node
+#   None                                  an empty slot (bye)
+# Nodes left with fewer than two live slots are byes: they are not created and
+# whatever they hold is forwarded to the next match, like the hidden bye
+# matches of the frontend BracketBuilder.
+
+def _node(round_no):
+    return {"round": round_no, "slots": [], "kept": False, "forward": None}
+
+
+def _resolve_slot(slot):
+    if slot is None or slot[0] == "entrant":
+        return slot
+    _, src, rank = slot
+    if src["kept"]:
+        return slot
+    # A bye has no loser, only its single live slot moves on
+    return src["forward"] if rank == 1 else None
+
+
+def _collapse(nodes):
+    """Resolve byes in dependency order and return the nodes that become real matches."""
+    kept = []
+    for node in nodes:
+        node["slots"] = [_resolve_slot(s) for s in node["slots"]]
+        live = [s for s in node["slots"] if s]
+        if len(live) >= 2:
+            node["kept"] = True
+            kept.append(node)
+        else:
+            node["forward"] = live[0] if live else None
+    return kept
+
+
+def _to_payload(kept):
+    """Turn kept nodes into the same matches/relations payload the frontend sends."""
+    matches, relations = [], []
+    for number, node in enumerate(kept, start=1):
+        node["match_number"] = number
+
+    for node in kept:
+        participants = []
+        for idx, slot in enumerate(node["slots"]):
+            if not slot:
+                continue
+            if slot[0] == "entrant":
+                participant_id, seed = slot[1]
+                participants.append({
+                    "participant_id": participant_id,
+                    "seed": seed,
+                    "position": f"slot-{idx + 1}",
+                    "role": "competitor"
+                })
+            else:
+                relations.append({
+                    "source_match_number": slot[1]["match_number"],
+                    "target_match_number": node["match_number"],
+                    "qualifier_rank": slot[2]
+                })
+        matches.append({
+            "round": node["round"],
+            "match_number": node["match_number"],
+            "participants": participants
+        })
+    return matches, relations
+
+
+def _winners_bracket(entrants):
+    """Build the winners bracket nodes, returned as a list of rounds."""
+    size = next_power_of_two(len(entrants))
+    by_seed = {seed: (pid, seed) for pid, seed in entrants}
+    slots = [("entrant", by_seed[s]) if s in by_seed else None for s in seeded_order(size)]
+
+    rounds = []
+    first = []
+    for i in range(0, size, 2):
+        node = _node(1)
+        node["slots"] = [slots[i], slots[i + 1]]
+        first.append(node)
+    rounds.append(first)
+
+    while len(rounds[-1]) > 1:
+        prev = rounds[-1]
+        current = []
+        for i in range(0, len(prev), 2):
+            node = _node(len(rounds) + 1)
+            node["slots"] = [("source", prev[i], 1), ("source", prev[i + 1], 1)]
+            current.append(node)
+        rounds.append(current)
+    return rounds
+
+
+def generate_single_elimination(entrants):
+    rounds = _winners_bracket(entrants)
+    nodes = [n for r in rounds for n in r]
+    return _to_payload(_collapse(nodes))
+
+
+def generate_double_elimination(entrants):
+    """
+    Winners bracket uses positive rounds, the losers bracket negative rounds
+    (-1, -2, ...) and the grand final is the round after the winners final.
+    """
+    if len(entrants) < 4:
+        return generate_single_elimination(entrants)
+
+    wb = _winners_bracket(entrants)
+    k = len(wb)
+
+    lb = []
+    # LB round 1: losers of WB round 1 play each other
+    wb_first = wb[0]
+    lb.append([])
+    for i in range(0, len(wb_first), 2):
+        node = _node(-1)
+        node["slots"] = [("source", wb_first[i], 2), ("source", wb_first[i + 1], 2)]
+        lb[-1].append(node)
+
+    for j in range(1, k):
+        # Even LB round: LB survivors meet the losers dropping from WB round j + 1.
+        # Drop-ins are crossed over on alternate rounds to avoid early rematches.
+        survivors = lb[-1]
+        dropping = wb[j] if j % 2 == 0 else list(reversed(wb[j]))
+        lb.append([])
+        for i, prev in enumerate(survivors):
+            node = _node(-len(lb))
+            node["slots"] = [("source", prev, 1), ("source", dropping[i], 2)]
+            lb[-1].append(node)
+
+        # Odd LB round: survivors play each other
+        if j < k - 1:
+            survivors = lb[-1]
+            lb.append([])
+            for i in range(0, len(survivors), 2):
+                node = _node(-len(lb))
+                node["slots"] = [("source", survivors[i], 1), ("source", survivors[i + 1], 1)]
+                lb[-1].append(node)
+
+    grand_final = _node(k + 1)
+    grand_final["slots"] = [("source", wb[-1][0], 1), ("source", lb[-1][0], 1)]
+
+    nodes = [n for r in wb for n in r] + [n for r in lb for n in r] + [grand_final]
+    return _to_payload(_collapse(nodes))
+
+
+def generate_round_robin(entrants):
+    """Circle method: every entrant meets every other one once, one round per rotation."""
+    players = list(entrants)
+    if len(players) % 2:
+        players.append(None)
+    n = len(players)
+
+    matches = []
+    match_number = 1
+    for round_no in range(1, n):
+        for i in range(n // 2):
+            a, b = players[i], players[n - 1 - i]
+            if a is None or b is None:
+                continue  # bye this round
+            matches.append({
+                "round": round_no,
+                "match_number": match_number,
+                "participants": [
+                    {"participant_id": p[0], "seed": p[1], "position": f"slot-{idx + 1}", "role": "competitor"}
+                    for idx, p in enumerate((a, b))
+                ]
+            })
+            match_number += 1
+        # Keep the first player fixed and rotate the rest
+        players = [players[0], players[-1]] + players[1:-1]
+    return matches, []
+
+
+GENERATORS = {
+    "single_elimination": generate_single_elimination,
+    "double_elimination": generate_double_elimination,
+    "round_robin": generate_round_robin,
+}
+
+
+def generate_bracket(entrants, bracket_format="single_elimination"):
+    """
+    Build a bracket from seeded entrants [(participant_id, seed), ...].
+    Returns (matches, relations) in the same shape as the create_bracket payload.
+    """
+    if bracket_format not in GENERATORS:
+        raise ValueError(f"Unknown bracket format '{bracket_format}'")
+    return GENERATORS[bracket_format](entrants)
+
+
+def _chunks(rows, size=BULK_CHUNK_SIZE):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _insert_matches(category_id, matches_data):
+    """
+    Insert all matches and return their ids in payload order.
+    Uses one INSERT ... RETURNING where the dialect supports it, otherwise
+    falls back to a single ORM flush.
+    """
+    rows = [
+        {"category_id": category_id, "round": m["round"], "match_number": m["match_number"], "status": "scheduled"}
+        for m in matches_data
+    ]
+    if not rows:
+        return []
+
+    if db.session.get_bind().dialect.insert_executemany_returning:
+        result = db.session.execute(
+            insert(Match).returning(Match.id, sort_by_parameter_order=True),
+            rows
+        )
+        return list(result.scalars())
+
+    matches = [Match(**row) for row in rows]
+    db.session.add_all(matches)
+    db.session.flush()
+    return [m.id for m in matches]
+
+
+def persist_bracket(category_id, matches_data, relations_data):
+    """
+    Save a bracket payload with set-based statements:
+    one query for the category seeds, one batch for the match ids and
+    multi-row INSERTs for participants and relations.
+    Returns {match_number: match_id}.
+    """
+    existing = {
+        participant_id: seed
+        for participant_id, seed in db.session.query(
+            ParticipantCategory.participant_id, ParticipantCategory.seed
+        ).filter(ParticipantCategory.category_id == category_id)
+    }
+
+    match_ids = _insert_matches(category_id, matches_data)
+    match_number_to_id = {m["match_number"]: mid for m, mid in zip(matches_data, match_ids)}
+
+    participant_rows, seed_updates, new_links = [], {}, {}
+    for m, match_id in zip(matches_data, match_ids):
+        for p in m["participants"]:
+            participant_id = p["participant_id"]
+            seed = p.get("seed")
+            if participant_id in existing:
+                if existing[participant_id] != seed:
+                    seed_updates[participant_id] = seed
+            else:
+                new_links[participant_id] = seed
+            participant_rows.append({
+                "match_id": match_id,
+                "participant_id": participant_id,
+                "position": p.get("position"),
+                "role": p.get("role", "competitor")
+            })
+
+    if seed_updates:
+        db.session.execute(
+            update(ParticipantCategory),
+            [
+                {"participant_id": pid, "category_id": category_id, "seed": seed}
+                for pid, seed in seed_updates.items()
+            ]
+        )
+
+    link_rows = [
+        {"participant_id": pid, "category_id": category_id, "seed": seed}
+        for pid, seed in new_links.items()
+    ]
+    for chunk in _chunks(link_rows):
+        db.session.execute(insert(ParticipantCategory).values(chunk))
+
+    for chunk in _chunks(participant_rows):
+        db.session.execute(insert(MatchParticipant).values(chunk))
+
+    relation_rows = [
+        {
+            "source_match_id": match_number_to_id[r["source_match_number"]],
+            "target_match_id": match_number_to_id[r["target_match_number"]],
+            "qualifier_rank": r.get("qualifier_rank", 1)
+        }
+        for r in relations_data
+    ]
+    for chunk in _chunks(relation_rows):
+        db.session.execute(insert(MatchRelation).values(chunk))
+
+    return match_number_to_id
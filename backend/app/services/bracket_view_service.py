@@ -0,0 +1,144 @@
+import hashlib
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import and_, delete, select
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.utils.db_routing import use_primary
+from app.models.event_model import BracketView, Category, EventParticipant, Match, MatchParticipant, MatchRelation, ParticipantCategory
+
+# The bracket payload of a category is stored serialized in bracket_views.
+# Writes that touch a bracket patch only the matches they changed; writes that
+# change its shape drop the row and the next read rebuilds it.
+
+
+def _match_data(category_id, match_ids=None):
+    """
+    Build {match_id: match dict} for a category (or only match_ids) with one
+    query for the slots and one for the relations.
+    """
+    query = (
+        db.session.query(Match.id, Match.round, Match.match_number,
+                         EventParticipant.id, EventParticipant.name, MatchParticipant.score, ParticipantCategory.seed)
+        .outerjoin(MatchParticipant, MatchParticipant.match_id == Match.id)
+        .outerjoin(EventParticipant, EventParticipant.id == MatchParticipant.participant_id)
+        .outerjoin(ParticipantCategory, and_(
+            ParticipantCategory.participant_id == MatchParticipant.participant_id,
+            ParticipantCategory.category_id == Match.category_id
+        ))
+        .filter(Match.category_id == category_id)
+        .order_by(Match.round, Match.match_number, Match.id, MatchParticipant.id)
+    )
+    if match_ids is not None:
+        query = query.filter(Match.id.in_(list(match_ids)))
+
+    matches = {}
+    for match_id, round_no, match_number, participant_id, name, score, seed in query:
+        if match_id not in matches:
+            matches[match_id] = {
+                "id": match_id,
+                "round": round_no,
+                "match_number": match_number,
+                "hidden": False,
+                "sourceIds": [],
+                "slots": []
+            }
+        if participant_id is not None:
+            matches[match_id]["slots"].append({"id": participant_id, "name": name, "score": score, "seed": seed})
+
+    relations = (
+        db.session.query(MatchRelation.target_match_id, MatchRelation.source_match_id)
+        .filter(MatchRelation.target_match_id.in_(list(matches)))
+        .order_by(MatchRelation.id)
+    ) if matches else []
+    for target_id, source_id in relations:
+        matches[target_id]["sourceIds"].append(source_id)
+    return matches
+
+
+def build_bracket_data(category_id):
+    """The GET /categories/<id>/bracket payload, built from the database."""
+    rounds = defaultdict(list)
+    for m in _match_data(category_id).values():
+        rounds[m["round"]].append(m)
+
+    participants = (
+        db.session.query(EventParticipant.id, EventParticipant.name, ParticipantCategory.seed)
+        .join(ParticipantCategory, ParticipantCategory.participant_id == EventParticipant.id)
+        .filter(ParticipantCategory.category_id == category_id)
+        .order_by(EventParticipant.id)
+    )
+    return {
+        "matches": [rounds[r] for r in sorted(rounds, key=lambda r: (r is None, r or 0))],
+        "participants": [{"id": pid, "name": name, "seed": seed} for pid, name, seed in participants]
+    }
+
+
+def _store(category_id, data, view=None):
+    body = current_app.json.dumps(data, separators=(",", ":"), sort_keys=True)
+    etag = hashlib.sha1(body.encode()).hexdigest()
+    if view is None:
+        view = BracketView(category_id=category_id, etag=etag, body=body)
+        db.session.add(view)
+    else:
+        view.etag, view.body = etag, body
+    return view
+
+
+def get_bracket_etag(category_id):
+    """ETag of the stored view, building the view first if it does not exist. None if the category does not exist."""
+    etag = db.session.query(BracketView.etag).filter(BracketView.category_id == category_id).scalar()
+    if etag is not None:
+        return etag
+    # The view is written to the primary, so build it from the primary too
+    use_primary()
+    if not db.session.query(Category.id).filter(Category.id == category_id).first():
+        return None
+
+    view = _store(category_id, build_bracket_data(category_id))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Built concurrently by another request, use theirs
+        db.session.rollback()
+        return db.session.query(BracketView.etag).filter(BracketView.category_id == category_id).scalar()
+    return view.etag
+
+
+def get_bracket_body(category_id):
+    return db.session.query(BracketView.body).filter(BracketView.category_id == category_id).scalar()
+
+
+def refresh_bracket_matches(category_id, match_ids):
+    """
+    Patch the stored view of a category with the current state of match_ids.
+    Falls back to dropping the view when it does not know one of the matches.
+    Call before commit so the view changes with the data.
+    """
+    view = BracketView.query.get(category_id)
+    if view is None:
+        return
+
+    data = current_app.json.loads(view.body)
+    index = {m["id"]: (r, i) for r, matches in enumerate(data["matches"]) for i, m in enumerate(matches)}
+    fresh = _match_data(category_id, match_ids)
+    if any(match_id not in index for match_id in fresh):
+        invalidate_bracket_views(category_ids=[category_id])
+        return
+
+    for match_id, m in fresh.items():
+        r, i = index[match_id]
+        data["matches"][r][i] = m
+    _store(category_id, data, view)
+
+
+def invalidate_bracket_views(category_ids=None, event_id=None):
+    """Drop stored views so they are rebuilt on the next read. No arguments drops all of them."""
+    stmt = delete(BracketView)
+    if category_ids is not None:
+        stmt = stmt.where(BracketView.category_id.in_(list(category_ids)))
+    elif event_id is not None:
+        stmt = stmt.where(BracketView.category_id.in_(
+            select(Category.id).where(Category.event_id == event_id)
+        ))
+    db.session.execute(stmt.execution_options(synchronize_session=False))
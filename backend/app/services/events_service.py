@@ -1,6 +1,7 @@
 import secrets
 from app.models.event_model import EventJoinLink
 from app.extensions import db
+from app.services.response_cache import bump_event_version
 
 # Create a new join link for event
 def create_join_link(event_id, expires_in_hours=24):
@@ -8,5 +9,6 @@ def create_join_link(event_id, expires_in_hours=24):
     # expires_at = datetime.utcnow() + timedelta(hours=expires_in_hours)
     link = EventJoinLink(event_id=event_id, token=token)
     db.session.add(link)
+    bump_event_version(event_id)  # join links are part of the event detail
     db.session.commit()
     return link
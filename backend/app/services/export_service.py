@@ -0,0 +1,165 @@
+import csv
+import io
+from datetime import date
+from flask import current_app
+from sqlalchemy import literal, null, select
+from app.extensions import db
+from app.models.event_model import Category, CategoryStanding, ClubStanding, EventParticipant, Match, MatchParticipant
+from app.models.user_model import Club
+
+# Full results of an event as flat rows, for reporting. Every table is read
+# with yield_per (a server-side cursor where the driver has one) and written
+# out batch by batch as plain tuples, so memory stays flat whatever the event
+# size: nothing is loaded into the ORM identity map.
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+def _participants(event_id):
+    return (
+        select(
+            EventParticipant.id.label("participant_id"), EventParticipant.name,
+            EventParticipant.club_id, Club.name.label("club_name"), EventParticipant.points
+        )
+        .join(Club, Club.id == EventParticipant.club_id)
+        .where(EventParticipant.event_id == event_id)
+        .order_by(EventParticipant.id)
+    )
+
+
+def _matches(event_id):
+    return (
+        select(
+            Match.id.label("match_id"), Match.category_id, Category.name.label("category_name"),
+            Match.round, Match.match_number, Match.status, Match.start_time, Match.court
+        )
+        .join(Category, Category.id == Match.category_id)
+        .where(Category.event_id == event_id)
+        .order_by(Match.id)
+    )
+
+
+def _match_participants(event_id):
+    return (
+        select(
+            MatchParticipant.id.label("match_participant_id"), MatchParticipant.match_id,
+            MatchParticipant.participant_id, MatchParticipant.role, MatchParticipant.position,
+            MatchParticipant.score, MatchParticipant.rank, MatchParticipant.result_type
+        )
+        .join(Match, Match.id == MatchParticipant.match_id)
+        .join(Category, Category.id == Match.category_id)
+        .where(Category.event_id == event_id)
+        .order_by(MatchParticipant.id)
+    )
+
+
+def _standings(event_id):
+    counters = ("points", "played", "wins", "draws", "losses")
+    clubs = (
+        select(literal("club").label("scope"), null().label("category_id"), ClubStanding.club_id,
+               null().label("participant_id"), *(getattr(ClubStanding, c) for c in counters))
+        .where(ClubStanding.event_id == event_id)
+        .order_by(ClubStanding.club_id)
+    )
+    categories = (
+        select(literal("category").label("scope"), CategoryStanding.category_id, EventParticipant.club_id,
+               CategoryStanding.participant_id, *(getattr(CategoryStanding, c) for c in counters))
+        .join(EventParticipant, EventParticipant.id == CategoryStanding.participant_id)
+        .where(CategoryStanding.event_id == event_id)
+        .order_by(CategoryStanding.category_id, CategoryStanding.participant_id)
+    )
+    return [clubs, categories]
+
+
+# ?tables= name -> (record type written on each row, statement builder)
+EXPORT_TABLES = {
+    "participants": ("participant", _participants),
+    "matches": ("match", _matches),
+    "match_participants": ("match_participant", _match_participants),
+    "standings": ("standing", _standings),
+}
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+# Leading characters a spreadsheet reads as a formula; names are user input
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    """A CSV cell, with text a spreadsheet would run as a formula quoted with a leading '."""
+    if value is None:
+        return ""
+    value = _value(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _batches(statements, batch_size):
+    """(column names, list of rows) per batch of each statement."""
+    for stmt in statements if isinstance(statements, list) else [statements]:
+        result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+        columns = list(result.keys())
+        for rows in result.partitions():
+            yield columns, rows
+
+
+def _iter_tables(event_id, tables):
+    batch_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+    for table in tables:
+        record, builder = EXPORT_TABLES[table]
+        for columns, rows in _batches(builder(event_id), batch_size):
+            yield record, columns, rows
+
+
+def export_columns(tables):
+    """CSV header: the record type, then every column of the tables in order of first appearance."""
+    header = ["record"]
+    for table in tables:
+        statements = EXPORT_TABLES[table][1](0)
+        for stmt in statements if isinstance(statements, list) else [statements]:
+            header += [c.name for c in stmt.selected_columns if c.name not in header]
+    return header
+
+
+def iter_ndjson(event_id, tables):
+    """One JSON object per line: {"record": ..., <columns>}."""
+    dumps = current_app.json.dumps
+    for record, columns, rows in _iter_tables(event_id, tables):
+        yield "".join(
+            dumps({"record": record, **{c: _value(v) for c, v in zip(columns, row)}}, separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+
+def iter_csv(event_id, tables):
+    """One rectangular CSV: a record column and the union of the tables' columns, blank where n/a."""
+    header = export_columns(tables)
+    position = {name: i for i, name in enumerate(header)}
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(header)
+    for record, columns, rows in _iter_tables(event_id, tables):
+        indexes = [position[c] for c in columns]
+        for row in rows:
+            line = [record] + [""] * (len(header) - 1)
+            for i, value in zip(indexes, row):
+                line[i] = _csv_cell(value)
+            writer.writerow(line)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_export(event_id, tables, export_format):
+    if export_format == "csv":
+        return iter_csv(event_id, tables)
+    return iter_ndjson(event_id, tables)
@@ -0,0 +1,124 @@
+import json
+import queue
+import threading
+import uuid
+from collections import defaultdict, deque
+from flask import current_app
+
+# Small deltas published after a match write commits, fanned out per event to
+# the GET /<event_id>/stream subscribers. Every event channel numbers its
+# messages and keeps the last LIVE_HISTORY of them so a reconnecting client
+# can resume from Last-Event-ID. Message ids are "<broker token>:<seq>", the
+# token being new for every broker instance, so an id from another worker or
+# from before a restart is recognized as such. The broker is chosen with
+# LIVE_BROKER; the in-process one only reaches clients connected to the same
+# worker.
+
+
+class Subscription:
+    """One stream connection: the missed messages to replay, then new ones as they are published."""
+
+    def __init__(self, broker, channel, backlog, gap, max_queue):
+        self.broker = broker
+        self.channel = channel
+        self.backlog = backlog   # [(id, message)] published after Last-Event-ID
+        self.gap = gap           # True when Last-Event-ID is older than the kept history or not ours
+        self.overflowed = False
+        self.on_push = None      # called after every push, e.g. to wake an async consumer
+        self._queue = queue.Queue(maxsize=max_queue)
+
+    def _push(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Too slow to keep up; the stream tells the client to refetch
+            self.overflowed = True
+        if self.on_push:
+            self.on_push()
+
+    def get(self, timeout=None):
+        """Next (id, message), or None when nothing arrived within timeout (0 does not wait)."""
+        try:
+            return self._queue.get(block=timeout != 0, timeout=timeout or None)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    def __init__(self, history=256, max_queue=1000):
+        self.history = history
+        self.max_queue = max_queue
+        self.token = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        # history holds (seq, (id, message))
+        self._channels = defaultdict(lambda: {"seq": 0, "history": deque(maxlen=self.history), "subscribers": set()})
+
+    def publish(self, channel, message):
+        with self._lock:
+            ch = self._channels[channel]
+            ch["seq"] += 1
+            item = (f"{self.token}:{ch['seq']}", message)
+            ch["history"].append((ch["seq"], item))
+            subscribers = list(ch["subscribers"])
+        for subscription in subscribers:
+            subscription._push(item)
+        return item[0]
+
+    def subscribe(self, channel, last_id=None):
+        """last_id is the parsed Last-Event-ID, see parse_event_id."""
+        with self._lock:
+            ch = self._channels[channel]
+            backlog, gap = [], False
+            if last_id is not None and (last_id[0] != self.token or last_id[1] > ch["seq"]):
+                gap = True  # another worker's or a previous broker's numbering
+            elif last_id is not None and last_id[1] < ch["seq"]:
+                missed = [(seq, item) for seq, item in ch["history"] if seq > last_id[1]]
+                gap = not missed or missed[0][0] != last_id[1] + 1
+                backlog = [item for _, item in missed]
+            subscription = Subscription(self, channel, backlog, gap, self.max_queue)
+            ch["subscribers"].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._channels[subscription.channel]["subscribers"].discard(subscription)
+
+
+BROKERS = {
+    "memory": InProcessBroker,
+}
+
+
+def get_broker():
+    broker = current_app.extensions.get("live_broker")
+    if broker is None:
+        broker_class = BROKERS[current_app.config.get("LIVE_BROKER", "memory")]
+        broker = current_app.extensions.setdefault(
+            "live_broker", broker_class(history=current_app.config.get("LIVE_HISTORY", 256))
+        )
+    return broker
+
+
+def publish_event_update(event_id, kind, data):
+    """Publish a delta to the subscribers of an event. Call after the write is committed."""
+    return get_broker().publish(event_id, {"type": kind, **data})
+
+
+def parse_event_id(value):
+    """
+    (broker token, seq) of a Last-Event-ID value, or None when there is none.
+    A malformed value gives a token no broker has, so the client is reset.
+    """
+    if not value:
+        return None
+    token, _, seq = value.strip().rpartition(":")
+    if not token or not seq.isdigit():
+        return (None, 0)
+    return (token, int(seq))
+
+
+def format_sse(message_id, kind, data):
+    return f"id: {message_id}\nevent: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
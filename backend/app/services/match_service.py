@@ -0,0 +1,154 @@
+from collections import defaultdict
+from sqlalchemy import case, update
+from app.extensions import db
+from app.models.event_model import Match, MatchParticipant, Category
+from app.services.standings_service import apply_result_changes
+from app.services.bracket_view_service import refresh_bracket_matches
+from app.services.scoring_service import compiled_rulesets
+
+RESULT_TYPES = ("win", "draw", "loss")
+
+
+def parse_scores(scores):
+    """Convert a {match_participant_id: score} payload into {int id: score}, skipping invalid keys."""
+    parsed = {}
+    for mp_id_str, score in (scores or {}).items():
+        try:
+            parsed[int(mp_id_str)] = score
+        except (TypeError, ValueError):
+            continue  # skip invalid keys
+    return parsed
+
+
+def apply_match_updates(updates):
+    """
+    Apply score and status updates to many matches at once.
+
+    Args:
+        updates (dict): {match_id: {"scores": {match_participant_id: score},
+                                    "results": {match_participant_id: result_type},
+                                    "status": str | None}}
+
+    Loads every affected MatchParticipant in one query, then writes scores,
+    ranks and result types with one batched UPDATE by primary key and all
+    statuses with an UPDATE ... CASE. Changed results are passed on to the
+    standings.
+    Scores for participants that are not in the given match are ignored.
+
+    In categories whose ruleset has a scoring rule, raw scores go through the
+    compiled rule (e.g. judge marks are reduced to one score) and every match
+    that got scores or was completed is evaluated: once decided, its ranks
+    and result types are derived from the scores. Results sent explicitly
+    take precedence over derived ones.
+    Raises ValueError, before writing anything, on a score the rule rejects,
+    a score that is not a number where there is no rule, or a result type
+    other than RESULT_TYPES (None clears a result).
+
+    Returns ({match_id: {match_participant_id: score}} with the scores actually
+    applied, {match_id: {match_participant_id: {"rank", "result_type"}}} for
+    the matches evaluated and decided).
+    """
+    match_ids = list(updates)
+    rows = (
+        db.session.query(MatchParticipant.id, MatchParticipant.match_id, MatchParticipant.participant_id,
+                         MatchParticipant.score, MatchParticipant.rank, MatchParticipant.result_type,
+                         Match.category_id, Match.status, Category.ruleset_version)
+        .join(Match, MatchParticipant.match_id == Match.id)
+        .join(Category, Match.category_id == Category.id)
+        .filter(MatchParticipant.match_id.in_(match_ids))
+        .all()
+    ) if match_ids else []
+    current = {(r.id, r.match_id): r for r in rows}
+    by_match = defaultdict(list)
+    for row in rows:
+        by_match[row.match_id].append(row)
+    rulesets = compiled_rulesets({r.category_id: r.ruleset_version for r in rows})
+    rules = {r.match_id: rulesets[r.category_id].rule for r in rows}
+
+    applied = {match_id: {} for match_id in match_ids}
+    score_by_mp = {}
+    wanted_results = {}  # (match_participant_id, match_id) -> result_type
+    for match_id, u in updates.items():
+        rule = rules.get(match_id)
+        for mp_id, score in u.get("scores", {}).items():
+            if (mp_id, match_id) in current:
+                if rule is not None:
+                    score = rule.score(score)
+                elif score is not None and (isinstance(score, bool) or not isinstance(score, (int, float))):
+                    raise ValueError("score must be a number")
+                score_by_mp[mp_id] = score
+                applied[match_id][mp_id] = score
+        for mp_id, result_type in u.get("results", {}).items():
+            if result_type is not None and result_type not in RESULT_TYPES:
+                raise ValueError(f"result must be one of {', '.join(RESULT_TYPES)}")
+            wanted_results[(mp_id, match_id)] = result_type
+
+    derived = {}
+    rank_by_mp = {}
+    for match_id, u in updates.items():
+        rule = rules.get(match_id)
+        if rule is None or not (applied[match_id] or u.get("status") == "completed"):
+            continue
+        match_rows = by_match[match_id]
+        completed = (u.get("status") or match_rows[0].status) == "completed"
+        outcome = rule.evaluate({r.id: score_by_mp.get(r.id, r.score) for r in match_rows}, completed)
+        if outcome is None:
+            continue
+        derived[match_id] = {}
+        for row in match_rows:
+            rank, result_type = outcome[row.id]
+            result_type = wanted_results.setdefault((row.id, match_id), result_type)
+            derived[match_id][row.id] = {"rank": rank, "result_type": result_type}
+            if row.rank != rank:
+                rank_by_mp[row.id] = rank
+
+    result_by_mp = {}
+    result_changes = defaultdict(list)
+    for key, result_type in wanted_results.items():
+        row = current.get(key)
+        if row and row.result_type != result_type:
+            result_by_mp[row.id] = result_type
+            result_changes[row.category_id].append((row.participant_id, row.result_type, result_type))
+
+    # Scores, ranks and result types go out as one executemany by primary
+    # key: a CASE over thousands of ids costs more to compile than to run
+    mp_rows = defaultdict(dict)
+    for column, values in (("score", score_by_mp), ("rank", rank_by_mp), ("result_type", result_by_mp)):
+        for mp_id, value in values.items():
+            mp_rows[mp_id][column] = value
+    if mp_rows:
+        db.session.execute(update(MatchParticipant), [{"id": mp_id, **values} for mp_id, values in mp_rows.items()])
+
+    if score_by_mp:
+        scored = defaultdict(set)
+        for row in rows:
+            if row.id in score_by_mp:
+                scored[row.category_id].add(row.match_id)
+        for category_id, scored_match_ids in scored.items():
+            refresh_bracket_matches(category_id, scored_match_ids)
+    for category_id, changes in result_changes.items():
+        apply_result_changes(category_id, changes)
+
+    status_by_match = {match_id: u["status"] for match_id, u in updates.items() if u.get("status")}
+    if status_by_match:
+        db.session.execute(
+            update(Match)
+            .where(Match.id.in_(list(status_by_match)))
+            .values(status=case(status_by_match, value=Match.id))
+            .execution_options(synchronize_session=False)
+        )
+
+    return applied, derived
+
+
+def matches_in_event(event_id, match_ids):
+    """Return the subset of match_ids that belong to the event, in one query."""
+    if not match_ids:
+        return set()
+    rows = (
+        db.session.query(Match.id)
+        .join(Category, Match.category_id == Category.id)
+        .filter(Category.event_id == event_id, Match.id.in_(list(match_ids)))
+        .all()
+    )
+    return {r.id for r in rows}
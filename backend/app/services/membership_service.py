@@ -0,0 +1,40 @@
+from sqlalchemy import exists, insert, select
+from app.extensions import db
+from app.models.event_model import Match, ParticipantCategory, event_clubs
+
+# Membership tests on rosters that can hold thousands of rows. Each is one
+# EXISTS or primary-key lookup instead of loading the collection to test `in`.
+
+
+def _exists(query):
+    return db.session.scalar(select(exists(query)))
+
+
+def participant_in_category(participant_id, category_id):
+    return _exists(select(ParticipantCategory.participant_id).where(
+        ParticipantCategory.participant_id == participant_id,
+        ParticipantCategory.category_id == category_id
+    ))
+
+
+def clubs_in_event(event_id, club_ids):
+    """The subset of club_ids that participate in the event."""
+    return set(db.session.scalars(
+        select(event_clubs.c.club_id).where(event_clubs.c.event_id == event_id, event_clubs.c.club_id.in_(list(club_ids)))
+    ))
+
+
+def club_in_event(event_id, club_id):
+    return _exists(select(event_clubs.c.club_id).where(
+        event_clubs.c.event_id == event_id, event_clubs.c.club_id == club_id
+    ))
+
+
+def add_club_to_event(event_id, club_id):
+    """Add the club to the event's participating clubs unless it is already there."""
+    if not club_in_event(event_id, club_id):
+        db.session.execute(insert(event_clubs).values(event_id=event_id, club_id=club_id))
+
+
+def category_has_matches(category_id):
+    return _exists(select(Match.id).where(Match.category_id == category_id))
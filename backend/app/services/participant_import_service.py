@@ -0,0 +1,166 @@
+import csv
+import io
+from sqlalchemy import insert, select
+from app.extensions import db
+from app.models.event_model import Category, EventParticipant, ParticipantCategory
+from app.services.bracket_service import BULK_CHUNK_SIZE
+
+# Registering a club's whole roster in one request: rows come as JSON or as a
+# streamed CSV, are checked against the event's categories loaded once, deduped
+# by name (within the file and against the club's existing participants) and
+# written with multi-row INSERTs.
+
+NAME_MAX_LENGTH = EventParticipant.__table__.c.name.type.length
+
+
+def event_category_ids(event_id, category_ids=None):
+    """Ids of the event's categories, limited to category_ids when given."""
+    query = select(Category.id).where(Category.event_id == event_id)
+    if category_ids is not None:
+        query = query.where(Category.id.in_(list(category_ids)))
+    return set(db.session.scalars(query))
+
+
+# ---- parsing ----
+
+def _parse_category_ids(value):
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        value = value.replace(",", ";").split(";")
+    if not isinstance(value, list):
+        raise ValueError("category_ids must be a list")
+    try:
+        return [int(v) for v in value if str(v).strip()]
+    except (TypeError, ValueError):
+        raise ValueError("category_ids must be integers")
+
+
+# Parsers yield (line, name, category_ids) per row, or (line, None, error) for a
+# row that cannot be used. A payload that cannot be read at all raises ValueError.
+
+def json_rows(data):
+    """Rows of {"participants": [{"name", "category_ids"}, ...]} or of a bare list."""
+    rows = data.get("participants") if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        raise ValueError("Expected a list of participants")
+    for line, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            yield line, None, ValueError("Each participant must be an object")
+            continue
+        yield from _row(line, row.get("name"), row.get("category_ids"))
+
+
+def csv_rows(stream):
+    """
+    Rows of a CSV body, read line by line: a header row with "name" and
+    optionally "category_ids" (ids separated by ";").
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    try:
+        if not reader.fieldnames or "name" not in reader.fieldnames:
+            raise ValueError("CSV needs a header row with a name column")
+        for row in reader:
+            yield from _row(reader.line_num, row.get("name"), row.get("category_ids"))
+    except csv.Error as e:
+        raise ValueError(f"Invalid CSV at line {reader.line_num}: {e}")
+
+
+def _row(line, name, category_ids):
+    name = name.strip() if isinstance(name, str) else None
+    if not name:
+        yield line, None, ValueError("name is required")
+    elif len(name) > NAME_MAX_LENGTH:
+        yield line, None, ValueError(f"name is longer than {NAME_MAX_LENGTH} characters")
+    else:
+        try:
+            yield line, name, _parse_category_ids(category_ids)
+        except ValueError as e:
+            yield line, None, e
+
+
+# ---- import ----
+
+def _insert_participants(rows):
+    """
+    Insert participants (names unique among rows) and return {name: id}.
+    Uses one batched INSERT ... RETURNING where the dialect supports it; the
+    ids are matched back by name, so the rows need not come back in order.
+    """
+    if db.session.get_bind().dialect.insert_executemany_returning:
+        result = db.session.execute(insert(EventParticipant).returning(EventParticipant.name, EventParticipant.id), rows)
+        return {name: participant_id for name, participant_id in result}
+
+    participants = [EventParticipant(**row) for row in rows]
+    db.session.add_all(participants)
+    db.session.flush()
+    return {p.name: p.id for p in participants}
+
+
+def import_participants(event_id, club_id, rows, max_rows):
+    """
+    Create the club's participants and their category links from parsed rows.
+    Rows with errors are skipped and reported; a name the club already has in
+    the event reuses that participant and only adds the missing categories.
+    Returns the summary sent back to the client and the touched category ids.
+    Does not commit.
+    """
+    valid_categories = event_category_ids(event_id)
+    existing = {
+        name.casefold(): participant_id
+        for participant_id, name in db.session.execute(
+            select(EventParticipant.id, EventParticipant.name)
+            .where(EventParticipant.event_id == event_id, EventParticipant.club_id == club_id)
+        )
+    }
+
+    errors, order = [], []          # order: name keys in first-seen order
+    names, categories = {}, {}      # name key -> display name / set of category ids
+    for count, (line, name, category_ids) in enumerate(rows, start=1):
+        if count > max_rows:
+            raise ValueError(f"At most {max_rows} participants per import")
+        if name is None:
+            errors.append({"line": line, "message": str(category_ids)})
+            continue
+        unknown = set(category_ids) - valid_categories
+        if unknown:
+            errors.append({"line": line, "message": f"Unknown categories for this event: {sorted(unknown)}"})
+            continue
+        key = name.casefold()
+        if key not in names:
+            names[key] = name
+            categories[key] = set()
+            order.append(key)
+        categories[key].update(category_ids)
+
+    new_keys = [key for key in order if key not in existing]
+    ids = dict(existing)
+    for i in range(0, len(new_keys), BULK_CHUNK_SIZE):
+        chunk = new_keys[i:i + BULK_CHUNK_SIZE]
+        inserted = _insert_participants([{"event_id": event_id, "club_id": club_id, "name": names[k]} for k in chunk])
+        ids.update((k, inserted[names[k]]) for k in chunk)
+
+    linked = set()
+    reused = [ids[key] for key in order if key in existing]
+    if reused:
+        linked = set(db.session.execute(
+            select(ParticipantCategory.participant_id, ParticipantCategory.category_id)
+            .where(ParticipantCategory.participant_id.in_(reused))
+        ).tuples())
+    link_rows = [
+        {"participant_id": ids[key], "category_id": category_id}
+        for key in order
+        for category_id in sorted(categories[key])
+        if (ids[key], category_id) not in linked
+    ]
+    for i in range(0, len(link_rows), BULK_CHUNK_SIZE):
+        db.session.execute(insert(ParticipantCategory).values(link_rows[i:i + BULK_CHUNK_SIZE]))
+
+    summary = {
+        "created": len(new_keys),
+        "existing": len(order) - len(new_keys),
+        "category_links": len(link_rows),
+        "participants": [{"id": ids[key], "name": names[key], "category_ids": sorted(categories[key])} for key in order],
+        "errors": errors,
+    }
+    return summary, {row["category_id"] for row in link_rows}
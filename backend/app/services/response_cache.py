@@ -0,0 +1,138 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, make_response, request
+from sqlalchemy import update
+from app.extensions import db
+from app.models.event_model import Event
+
+# Public event GETs are cached serialized, keyed by endpoint, arguments and the
+# event's version. Every write that changes what those GETs return bumps
+# events.version in its own transaction, so an entry of an older version is
+# never looked up again and simply ages out of the LRU. The version also gives
+# each response a strong ETag: a repeat read costs one version lookup.
+
+
+class LRUCache:
+    def __init__(self, maxsize=2048):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class RedisCache:
+    """Shared by all workers on the host. Needs the redis package (or a compatible server client)."""
+
+    def __init__(self, url, ttl=3600):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.client.get("response:" + key)
+
+    def set(self, key, body):
+        self.client.set("response:" + key, body, ex=self.ttl)
+
+
+def _create_cache(config):
+    backend = config.get("RESPONSE_CACHE", "memory")
+    if backend == "memory":
+        return LRUCache(config.get("RESPONSE_CACHE_SIZE", 2048))
+    if backend == "redis":
+        return RedisCache(config["RESPONSE_CACHE_REDIS_URL"], config.get("RESPONSE_CACHE_TTL", 3600))
+    return None
+
+
+def get_response_cache(app=None):
+    app = app or current_app
+    if "response_cache" not in app.extensions:
+        app.extensions["response_cache"] = _create_cache(app.config)
+    return app.extensions["response_cache"]
+
+
+# ---- versions ----
+
+def bump_event_version(event_id):
+    """Mark every cached GET of an event stale. Call before the write commits."""
+    stmt = update(Event).values(version=Event.version + 1)
+    if event_id is not None:
+        stmt = stmt.where(Event.id == event_id)
+    db.session.execute(stmt.execution_options(synchronize_session=False))
+
+
+def bump_all_event_versions():
+    bump_event_version(None)
+
+
+def get_event_version(event_id):
+    return db.session.query(Event.version).filter(Event.id == event_id).scalar()
+
+
+def cache_key(endpoint, event_id, version, args):
+    """(cache key, ETag) of one representation. args are (name, value) pairs."""
+    query = urlencode(sorted(args))
+    digest = hashlib.sha1(f"{endpoint}|{event_id}|{query}".encode()).hexdigest()[:16]
+    return f"{endpoint}:{event_id}:{version}:{digest}", f"{event_id}-{version}-{digest}"
+
+
+# ---- decorator ----
+
+def _store_when_sent(chunks, cache, key):
+    """Pass a streamed body through and cache it once it has been sent completely."""
+    sent = []
+    for chunk in chunks:
+        sent.append(chunk)
+        yield chunk
+    cache.set(key, b"".join(sent))
+
+
+def cached_event_response(view):
+    """
+    Serve a public GET keyed by its event_id from the response cache.
+    Answers 304 to a matching If-None-Match; only 200 responses are stored.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        event_id = kwargs["event_id"]
+        version = get_event_version(event_id)
+        if version is None:
+            return view(*args, **kwargs)  # the view answers the 404
+
+        key, etag = cache_key(request.endpoint, event_id, version, request.args.items(multi=True))
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+        else:
+            cache = get_response_cache()
+            body = cache.get(key) if cache is not None else None
+            if body is not None:
+                response = make_response(body, 200)
+                response.mimetype = "application/json"
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if cache is not None and response.is_streamed:
+                    response.response = _store_when_sent(response.iter_encoded(), cache, key)
+                elif cache is not None:
+                    cache.set(key, response.get_data())
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    return wrapper
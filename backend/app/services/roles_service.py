@@ -1,12 +1,29 @@
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
-from app.models.user_model import User, UserRole, Club
+from app.models.user_model import UserRole, Club
 from app.models.event_model import Event
 # from app.models.event_model import Club
+from app.extensions import db
+from app.services.auth_context import get_user_auth, get_event_auth, get_club_auth, get_match_event_id
 from flask import jsonify, request
 from app.utils.response import * 
 from functools import wraps
 from flask import make_response
 
+
+class _LazyRow:
+    """Injected in place of a model row: .id is known, any other attribute loads the row once."""
+
+    def __init__(self, model, id):
+        self.id = id
+        self._model = model
+        self._row = None
+
+    def __getattr__(self, name):
+        if self._row is None:
+            self._row = db.session.get(self._model, self.id)
+        return getattr(self._row, name)
+
+
 # Role-based decorator
 def manager_required(fn):
     @wraps(fn)
@@ -19,9 +36,8 @@ def manager_required(fn):
             resp.headers['Access-Control-Allow-Credentials'] = 'true'
             resp.headers['Access-Control-Allow-Origin'] = request.headers.get('Origin')
             return resp
-        user_id = get_jwt_identity()
-        user = User.query.get(int(user_id))
-        if not user or user.role != UserRole.MANAGER:
+        user = get_user_auth(get_jwt_identity())
+        if not user or user["role"] != UserRole.MANAGER:
             return error_response({"message": "Manager access required"}, 403)
         return fn(*args, **kwargs)
     return wrapper
@@ -34,10 +50,9 @@ def verify_manager_role(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         # This wrapper will only be reached if a valid JWT is present
-        user_id = get_jwt_identity()
-        user = User.query.get(int(user_id))
+        user = get_user_auth(get_jwt_identity())
         
-        if not user or user.role != UserRole.MANAGER:
+        if not user or user["role"] != UserRole.MANAGER:
             return error_response({"message": "Manager access required"}, 403)
             
         return fn(*args, **kwargs)
@@ -47,52 +62,63 @@ def user_required(fn):
     @wraps(fn)
     @jwt_required()
     def wrapper(*args, **kwargs):
-        user_id = get_jwt_identity()
-        user = User.query.get(int(user_id))
+        user = get_user_auth(get_jwt_identity())
         if not user:
             return error_response({"message": "User access required"}, 403)
         return fn(*args, **kwargs)
     return wrapper
 
-def club_owner_required(param_name="club_id", from_event=False):
+def club_owner_required(param_name="club_id", from_event=False, from_match=False):
     """
     Ensures the current user owns the club.
     
     Args:
         param_name (str): the route parameter name for club_id (default "club_id")
         from_event (bool): if True, resolve the club via event.organizer_id instead
+        from_match (bool): if True, resolve the club via the organizer of the match's event
     """
     def decorator(fn):
         @wraps(fn)
         @jwt_required()
         def wrapper(*args, **kwargs):
-            user_id = int(get_jwt_identity())
+            user = get_user_auth(get_jwt_identity())
+            owned_club_ids = user["club_ids"] if user else frozenset()
 
             # Case 1: Normal club action
-            if not from_event:
+            if not from_event and not from_match:
                 club_id = kwargs.get(param_name)
                 if club_id is None:
                     return error_response({"message": "Club ID required"}, 400)
-                club = Club.query.get(club_id)
-                if not club:
+                if club_id not in owned_club_ids and not get_club_auth(club_id):
                     return error_response({"message": "Club not found"}, 404)
 
-            # Case 2: Organizer-mediated action via event
+            # Case 2: Organizer-mediated action via match
+            elif from_match:
+                match_id = kwargs.get("match_id")
+                if match_id is None:
+                    return error_response({"message": "Match ID required"}, 400)
+                event_id = get_match_event_id(match_id)
+                event = get_event_auth(event_id) if event_id else None
+                if not event:
+                    return error_response({"message": "Match not found"}, 404)
+                club_id = event["organizer_id"]
+
+            # Case 3: Organizer-mediated action via event
             else:
                 event_id = kwargs.get("event_id")
                 if event_id is None:
                     return error_response({"message": "Event ID required"}, 400)
-                event = Event.query.get(event_id)
+                event = get_event_auth(event_id)
                 if not event:
                     return error_response({"message": "Event not found"}, 404)
-                club = event.organizer  # organizer is a Club instance
+                club_id = event["organizer_id"]
 
             # Ownership check
-            if not club or club.owner_id != user_id:
+            if club_id not in owned_club_ids:
                 return error_response({"message": "You do not own this club"}, 403)
 
-            # Inject club into endpoint for convenience
-            kwargs["club"] = club
+            # Inject club into endpoint for convenience, loaded only if more than its id is used
+            kwargs["club"] = _LazyRow(Club, club_id)
             return fn(*args, **kwargs)
         return wrapper
     return decorator
@@ -101,12 +127,12 @@ def is_owner_required(fn):
     @wraps(fn)
     @jwt_required()
     def wrapper(*args, **kwargs):
-        user_id = int(get_jwt_identity())
+        user = get_user_auth(get_jwt_identity())
 
         # Check if the user owns any clubs
-        owned_clubs = Club.query.filter_by(owner_id=user_id).all()
-        if not owned_clubs:
+        if not user or not user["club_ids"]:
             return jsonify({"message": "You do not own any clubs"}), 403
+        owned_clubs = Club.query.filter(Club.id.in_(user["club_ids"])).order_by(Club.id).all()
 
         # Inject the list of owned clubs for convenience
         kwargs["owned_clubs"] = owned_clubs
@@ -120,21 +146,20 @@ def club_in_event_required(fn):
     @wraps(fn)
     @jwt_required()
     def wrapper(event_id, club_id, *args, **kwargs):
-        user_id = int(get_jwt_identity())
-        club = Club.query.get(club_id)
-        if not club or club.owner_id != user_id:
+        user = get_user_auth(get_jwt_identity())
+        if not user or club_id not in user["club_ids"]:
             return error_response({"message": "You do not own this club"}, 403)
 
-        event = Event.query.get(event_id)
+        event = get_event_auth(event_id)
         if not event:
             return error_response({"message": "Event not found"}, 404)
 
         # Only organizer or approved participants can act
-        if event.organizer_id != club.id and club not in event.participating_clubs:
+        if event["organizer_id"] != club_id and club_id not in event["club_ids"]:
             return error_response({"message": "Club is not part of this event"}, 403)
 
-        kwargs["club"] = club
-        kwargs["event"] = event
+        kwargs["club"] = _LazyRow(Club, club_id)
+        kwargs["event"] = _LazyRow(Event, event_id)
         return fn(event_id, club_id, *args, **kwargs)
 
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -0,0 +1,371 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select, update
+from app.extensions import db
+from app.models.event_model import Category, Match, MatchParticipant, MatchRelation
+
+# Timetable of an event: every match still to be played gets a start time and
+# a court (or mat). Matches of all categories share the courts; a match starts
+# once the matches feeding it are over and its participants have rested.
+# Solving works on minute offsets from the start of the day and touches no
+# ORM objects, so a few thousand matches take milliseconds.
+
+# Category.ruleset keys read by the scheduler
+DURATION_KEY = "match_duration_minutes"
+REST_KEY = "rest_minutes"
+
+SCHEDULABLE_STATUS = "scheduled"
+
+
+def _minutes(value, default):
+    """A positive number of minutes from a ruleset or payload value, else default."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        return default
+    return value
+
+
+def category_timing(ruleset, duration, rest):
+    """(match duration, rest) of a category: its ruleset values over the given defaults."""
+    ruleset = ruleset if isinstance(ruleset, dict) else {}
+    return _minutes(ruleset.get(DURATION_KEY), duration) or duration, _minutes(ruleset.get(REST_KEY), rest)
+
+
+# ---- solver ----
+
+def _tail_lengths(matches, outgoing):
+    """
+    Longest chain of duration + rest from each match to the end of its
+    bracket, the match included. Raises ValueError on a dependency cycle.
+    """
+    indegree = defaultdict(int)
+    for targets in outgoing.values():
+        for target_id in targets:
+            indegree[target_id] += 1
+    order = [match_id for match_id in matches if not indegree[match_id]]
+    for match_id in order:
+        for target_id in outgoing.get(match_id, ()):
+            indegree[target_id] -= 1
+            if not indegree[target_id]:
+                order.append(target_id)
+    if len(order) != len(matches):
+        raise ValueError("Match dependencies contain a cycle")
+
+    tail = {}
+    for match_id in reversed(order):
+        duration, rest = matches[match_id][:2]
+        tail[match_id] = duration + max(
+            (rest + tail[t] for t in outgoing.get(match_id, ())), default=0
+        )
+    return tail
+
+
+def solve_schedule(matches, relations, courts):
+    """
+    List scheduling over a priority queue.
+
+    Args:
+        matches (dict): {match_id: (duration, rest, order_key, participant_ids)}
+        relations (iterable): (source_match_id, target_match_id) pairs between those matches
+        courts (int): number of courts played in parallel
+
+    Whenever a court frees up it takes, among the matches that can start by
+    then, the one heading the longest remaining chain (ties broken by
+    order_key). A match can start once its source matches have ended plus
+    their rest, and once its known participants have rested after their
+    previous match.
+    Returns {match_id: (start offset in minutes, court number from 1)}.
+    """
+    outgoing = defaultdict(list)
+    waiting_on = defaultdict(int)
+    for source_id, target_id in relations:
+        outgoing[source_id].append(target_id)
+        waiting_on[target_id] += 1
+    tail = _tail_lengths(matches, outgoing)
+
+    ready_at = defaultdict(float)      # match_id -> end of its sources plus rest
+    free_at = defaultdict(float)       # participant_id -> end of their last match plus rest
+
+    def earliest(match_id):
+        return max([ready_at[match_id]] + [free_at[p] for p in matches[match_id][3]])
+
+    def priority(match_id):
+        return (-tail[match_id], matches[match_id][2], match_id)
+
+    waiting = [(earliest(m), priority(m)) for m in matches if not waiting_on[m]]  # (earliest start, priority)
+    heapq.heapify(waiting)
+    startable = []                     # priorities of matches that can start by the court's time
+    free_courts = [(0.0, court) for court in range(1, courts + 1)]
+
+    schedule = {}
+    while waiting or startable:
+        now, court = heapq.heappop(free_courts)
+        while True:
+            while waiting and waiting[0][0] <= now:
+                heapq.heappush(startable, heapq.heappop(waiting)[1])
+            if not startable:
+                now = waiting[0][0]
+                continue
+            chosen = heapq.heappop(startable)
+            match_id = chosen[2]
+            # Participants may have played since the match was queued
+            start = earliest(match_id)
+            if start <= now:
+                break
+            heapq.heappush(waiting, (start, chosen))
+
+        duration, rest, _, participant_ids = matches[match_id]
+        end = now + duration
+        schedule[match_id] = (now, court)
+        for participant_id in participant_ids:
+            free_at[participant_id] = end + rest
+        for target_id in outgoing.get(match_id, ()):
+            ready_at[target_id] = max(ready_at[target_id], end + rest)
+            waiting_on[target_id] -= 1
+            if not waiting_on[target_id]:
+                heapq.heappush(waiting, (earliest(target_id), priority(target_id)))
+        heapq.heappush(free_courts, (end, court))
+    return schedule
+
+
+# ---- event schedule ----
+
+def _default_timing(duration=None, rest=None):
+    """Match duration and rest for categories without their own: the given values, else the config ones."""
+    config = current_app.config
+    duration = _minutes(duration, config["SCHEDULE_MATCH_MINUTES"]) or config["SCHEDULE_MATCH_MINUTES"]
+    return duration, _minutes(rest, config["SCHEDULE_REST_MINUTES"])
+
+
+def load_schedule_inputs(event_id, duration, rest):
+    """
+    Solver inputs for the event's matches still to be played, in three queries.
+    Relations to matches that are ongoing or completed are dropped: those
+    results are in or about to be, so they do not hold anything back.
+    """
+    matches = {}
+    for match_id, round_, match_number, category_order, category_id, ruleset in db.session.execute(
+        select(Match.id, Match.round, Match.match_number, Category.order, Category.id, Category.ruleset)
+        .join(Category, Category.id == Match.category_id)
+        .where(Category.event_id == event_id, Match.status == SCHEDULABLE_STATUS)
+    ):
+        match_duration, match_rest = category_timing(ruleset, duration, rest)
+        order_key = (category_order, category_id, round_ or 0, match_number or 0)
+        matches[match_id] = (match_duration, match_rest, order_key, [])
+
+    if not matches:
+        return matches, []
+
+    in_event = select(Match.id).join(Category, Category.id == Match.category_id).where(Category.event_id == event_id)
+    for match_id, participant_id in db.session.execute(
+        select(MatchParticipant.match_id, MatchParticipant.participant_id)
+        .where(MatchParticipant.match_id.in_(in_event), MatchParticipant.participant_id.is_not(None))
+    ):
+        if match_id in matches:
+            matches[match_id][3].append(participant_id)
+
+    relations = [
+        (source_id, target_id)
+        for source_id, target_id in db.session.execute(
+            select(MatchRelation.source_match_id, MatchRelation.target_match_id)
+            .where(MatchRelation.source_match_id.in_(in_event))
+        )
+        if source_id in matches and target_id in matches
+    ]
+    return matches, relations
+
+
+def schedule_event(event_id, start, courts, duration=None, rest=None):
+    """
+    Assign start_time and court to every match of the event still scheduled.
+    duration and rest (minutes) apply to categories whose ruleset does not
+    set them; each match keeps the ones it was planned with for later
+    rescheduling. Writes all rows with one batched UPDATE by primary key.
+    Does not commit. Returns {match_id: (start_time, court)}.
+    """
+    duration, rest = _default_timing(duration, rest)
+    matches, relations = load_schedule_inputs(event_id, duration, rest)
+    offsets = solve_schedule(matches, relations, courts)
+    schedule = {
+        match_id: (start + timedelta(minutes=offset), court)
+        for match_id, (offset, court) in offsets.items()
+    }
+    if schedule:
+        db.session.execute(
+            update(Match),
+            [{"id": match_id, "start_time": start_time, "court": court,
+              "duration_minutes": matches[match_id][0], "rest_minutes": matches[match_id][1]}
+             for match_id, (start_time, court) in schedule.items()]
+        )
+    return schedule
+
+
+# ---- incremental rescheduling ----
+
+def _load_timetable(event_id, since):
+    """
+    Timed matches of the event that start from `since`, less the longest
+    match plus rest (anything earlier is over and rested by then), with what
+    the constraints need, in five queries:
+    {match_id: {"start", "court", "status", "duration", "rest", "participants"}}
+    and the (source, target) relations among them.
+    Matches use the duration and rest they were scheduled with; matches
+    timed otherwise fall back to their category's, over the config defaults.
+    """
+    duration, rest = _default_timing()
+    timing = {
+        category_id: category_timing(ruleset, duration, rest)
+        for category_id, ruleset in db.session.execute(
+            select(Category.id, Category.ruleset).where(Category.event_id == event_id)
+        )
+    }
+    in_event = select(Match.id).join(Category, Category.id == Match.category_id).where(Category.event_id == event_id)
+    planned = db.session.execute(
+        select(func.max(Match.duration_minutes + Match.rest_minutes)).where(Match.id.in_(in_event))
+    ).scalar()
+    since -= timedelta(minutes=max([planned or 0] + [d + r for d, r in timing.values()]))
+
+    window = in_event.where(Match.start_time >= since)
+    slots = {}
+    for match_id, start_time, court, status, category_id, planned_duration, planned_rest in db.session.execute(
+        select(Match.id, Match.start_time, Match.court, Match.status, Match.category_id,
+               Match.duration_minutes, Match.rest_minutes).where(Match.id.in_(window))
+    ):
+        match_duration, match_rest = timing[category_id]
+        if planned_duration is not None:
+            match_duration, match_rest = planned_duration, planned_rest or 0
+        slots[match_id] = {
+            "start": start_time, "court": court, "status": status,
+            "duration": timedelta(minutes=match_duration), "rest": timedelta(minutes=match_rest),
+            "participants": [],
+        }
+    for match_id, participant_id in db.session.execute(
+        select(MatchParticipant.match_id, MatchParticipant.participant_id)
+        .where(MatchParticipant.match_id.in_(window), MatchParticipant.participant_id.is_not(None))
+    ):
+        slots[match_id]["participants"].append(participant_id)
+    relations = [
+        (source_id, target_id)
+        for source_id, target_id in db.session.execute(
+            select(MatchRelation.source_match_id, MatchRelation.target_match_id)
+            .where(MatchRelation.source_match_id.in_(window))
+        )
+        if target_id in slots
+    ]
+    return slots, relations
+
+
+def _predecessors(slots, relations):
+    """
+    What each match waits for in the current timetable, as
+    {match_id: [(match_id waited on, rest after it counts)]}, and the reverse.
+    A match waits for the previous match on its court, the previous match of
+    each of its participants and its source matches; the order of the
+    current timetable is kept, only the times move.
+    """
+    before = defaultdict(list)
+    after = defaultdict(list)
+
+    def link(previous_id, match_id, rested):
+        before[match_id].append((previous_id, rested))
+        after[previous_id].append(match_id)
+
+    last_on_court, last_of = {}, {}
+    for match_id in sorted(slots, key=lambda m: (slots[m]["start"], m)):
+        slot = slots[match_id]
+        if slot["court"] is not None:
+            if slot["court"] in last_on_court:
+                link(last_on_court[slot["court"]], match_id, False)
+            last_on_court[slot["court"]] = match_id
+        for participant_id in slot["participants"]:
+            if participant_id in last_of:
+                link(last_of[participant_id], match_id, True)
+            last_of[participant_id] = match_id
+    for source_id, target_id in relations:
+        link(source_id, target_id, True)
+    return before, after
+
+
+def reschedule_after(match_id, started_at=None, ended_at=None, delay=None, now=None):
+    """
+    Move the matches that depend on a match whose end differs from the plan.
+    Give exactly one of:
+        started_at: the match started then (late), it ends a duration later
+        delay: minutes the match is running behind its planned end
+        ended_at: the match is over (early or late)
+    Only matches reachable from it through the timetable move: the next ones
+    on the same court, the next matches of its participants and the matches
+    its result feeds, then theirs, and so on, stopping wherever a start time
+    does not change. A delay only pushes matches back; a match finished on
+    its scheduled day can also pull that day's matches forward, never before
+    `now`, its end or its own planned start. Ongoing and completed matches
+    stay where they are. Writes the changed start times with one batched
+    UPDATE and does not commit.
+    Returns [(match_id, old start_time, new start_time)] in new start order.
+    """
+    row = db.session.execute(
+        select(Match.start_time, Category.event_id)
+        .join(Category, Category.id == Match.category_id)
+        .where(Match.id == match_id)
+    ).first()
+    if row is None or row.start_time is None:
+        return []
+
+    since = min(row.start_time, ended_at) if ended_at is not None else row.start_time
+    slots, relations = _load_timetable(row.event_id, since)
+    slot = slots[match_id]
+    if started_at is not None:
+        end = started_at + slot["duration"]
+    elif delay is not None:
+        end = slot["start"] + slot["duration"] + timedelta(minutes=delay)
+    else:
+        end = ended_at
+    end = end.replace(microsecond=0)
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    # A result recorded ahead of the match's day (or after it) frees nothing on that day
+    day = slot["start"].date()
+    pull_forward = ended_at is not None and end.date() == day
+    earliest_pull = max(now, end, slot["start"])
+
+    before, after = _predecessors(slots, relations)
+    ends = {m: s["start"] + s["duration"] for m, s in slots.items()}
+    ends[match_id] = end
+    starts = {}
+
+    queue = [(slots[m]["start"], m) for m in set(after[match_id])]
+    heapq.heapify(queue)
+    seen = set()
+    while queue:
+        # Timetable order: everything a match waits for is settled before it
+        planned, current_id = heapq.heappop(queue)
+        if current_id in seen or slots[current_id]["status"] != SCHEDULABLE_STATUS:
+            continue
+        seen.add(current_id)
+        bound = max(
+            ends[p] + (slots[p]["rest"] if rested else timedelta(0))
+            for p, rested in before[current_id]
+        )
+        if pull_forward and bound < planned and planned.date() == day:
+            start = min(planned, max(bound, earliest_pull))
+        else:
+            start = max(bound, planned)
+        if start == planned:
+            continue
+        starts[current_id] = start
+        ends[current_id] = start + slots[current_id]["duration"]
+        for next_id in after[current_id]:
+            heapq.heappush(queue, (slots[next_id]["start"], next_id))
+
+    changes = [(m, slots[m]["start"], start) for m, start in starts.items()]
+    if changes:
+        db.session.execute(update(Match), [{"id": m, "start_time": new} for m, _, new in changes])
+    return sorted(changes, key=lambda change: (change[2], change[0]))
+
+
+def describe_changes(changes):
+    """JSON form of the reschedule_after result."""
+    return [
+        {"match_id": match_id, "start_time": new.isoformat(), "previous_start_time": old.isoformat()}
+        for match_id, old, new in changes
+    ]
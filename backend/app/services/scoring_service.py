@@ -0,0 +1,219 @@
+import re
+from sqlalchemy import select
+from app.extensions import db
+from app.models.event_model import Category
+
+# Category.ruleset is compiled once into a CompiledRuleset: the points per
+# result type and, when the ruleset has a "scoring" section, the rule that
+# turns raw scores into a stored score, ranks and result types. Compiled
+# rulesets are kept per process keyed by Category.ruleset_version, which every
+# ruleset change bumps, so score pushes only read that counter and other
+# workers recompile on their next push.
+#
+#     {"scoring": {"type": "points", "higher_wins": true},
+#      "points": {"win": 3, "draw": 1, "loss": 0}}
+#
+# Scoring types:
+#     points   one number per participant, the higher (or lower) one wins
+#     time     a time per participant (seconds or "[h:]mm:ss.ff"), the fastest wins
+#     best_of  sets won per participant; decided once one reaches a majority of "sets"
+#     judges   a list of judge marks per participant, dropping the "drop_high"
+#              highest and "drop_low" lowest, then "sum" or "mean" (default)
+
+DEFAULT_POINTS = {"win": 3, "draw": 1, "loss": 0}
+
+# category_id -> (ruleset_version, CompiledRuleset)
+_compiled_cache: dict[int, tuple] = {}
+
+
+def points_table(ruleset):
+    """Points per result_type, overridable with ruleset["points"]."""
+    points = dict(DEFAULT_POINTS)
+    points.update((ruleset or {}).get("points", {}))
+    return points
+
+
+def _number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number")
+    return value
+
+
+# ---- scoring rules ----
+
+class ScoringRule:
+    """
+    Raw scores in, ranks and result types out. A match is decided once every
+    participant has a score and the match is completed; subclasses may decide
+    earlier.
+    """
+    higher_wins = True
+
+    def score(self, raw):
+        """The value stored in MatchParticipant.score. Raises ValueError on a malformed score."""
+        return float(_number(raw, "score"))
+
+    def decided(self, scores, completed):
+        return completed and all(s is not None for s in scores.values())
+
+    def _order(self, item):
+        score = item[1]
+        if score is None:
+            return (1, 0)
+        return (0, -score if self.higher_wins else score)
+
+    def evaluate(self, scores, completed):
+        """
+        {match_participant_id: (rank, result_type)} for {match_participant_id: score},
+        or None while the match is not decided. Ties share a rank; a tie for
+        first is a draw between those participants.
+        """
+        if not scores or not self.decided(scores, completed):
+            return None
+        ordered = sorted(scores.items(), key=self._order)
+        outcome, rank, previous = {}, 0, object()
+        for position, (mp_id, score) in enumerate(ordered, start=1):
+            if score != previous:
+                rank, previous = position, score
+            outcome[mp_id] = rank
+        winners = [mp_id for mp_id, r in outcome.items() if r == 1]
+        first = "win" if len(winners) == 1 else "draw"
+        return {mp_id: (r, first if r == 1 else "loss") for mp_id, r in outcome.items()}
+
+
+class PointsRule(ScoringRule):
+    def __init__(self, higher_wins=True):
+        if not isinstance(higher_wins, bool):
+            raise ValueError("higher_wins must be true or false")
+        self.higher_wins = higher_wins
+
+
+class TimeRule(ScoringRule):
+    higher_wins = False
+    PATTERN = re.compile(r"^(?:(\d+):)?(\d+):(\d+(?:\.\d+)?)$")
+
+    def score(self, raw):
+        if isinstance(raw, str):
+            match = self.PATTERN.match(raw.strip())
+            if not match:
+                raise ValueError("time must be seconds or [h:]mm:ss.ff")
+            hours, minutes, seconds = match.groups()
+            return int(hours or 0) * 3600 + int(minutes) * 60 + float(seconds)
+        value = _number(raw, "time")
+        if value < 0:
+            raise ValueError("time cannot be negative")
+        return float(value)
+
+
+class BestOfRule(ScoringRule):
+    def __init__(self, sets=3):
+        if isinstance(sets, bool) or not isinstance(sets, int) or sets < 1 or sets % 2 == 0:
+            raise ValueError("sets must be a positive odd integer")
+        self.sets = sets
+        self.to_win = sets // 2 + 1
+
+    def score(self, raw):
+        value = _number(raw, "sets won")
+        if value != int(value) or not 0 <= value <= self.to_win:
+            raise ValueError(f"sets won must be a whole number between 0 and {self.to_win}")
+        return float(value)
+
+    def decided(self, scores, completed):
+        return any(s is not None and s >= self.to_win for s in scores.values()) or super().decided(scores, completed)
+
+
+class JudgesRule(ScoringRule):
+    AGGREGATES = {"mean": lambda marks: sum(marks) / len(marks), "sum": sum}
+
+    def __init__(self, drop_high=1, drop_low=1, aggregate="mean"):
+        for name, value in (("drop_high", drop_high), ("drop_low", drop_low)):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError(f"{name} must be a non-negative integer")
+        if aggregate not in self.AGGREGATES:
+            raise ValueError(f"aggregate must be one of {', '.join(self.AGGREGATES)}")
+        self.drop_high = drop_high
+        self.drop_low = drop_low
+        self.aggregate = self.AGGREGATES[aggregate]
+
+    def score(self, raw):
+        if not isinstance(raw, list):
+            return super().score(raw)  # an already aggregated score
+        marks = sorted(_number(mark, "judge mark") for mark in raw)
+        if len(marks) <= self.drop_high + self.drop_low:
+            raise ValueError(f"at least {self.drop_high + self.drop_low + 1} judge marks are required")
+        return float(self.aggregate(marks[self.drop_low:len(marks) - self.drop_high]))
+
+
+SCORING_RULES = {
+    "points": PointsRule,
+    "time": TimeRule,
+    "best_of": BestOfRule,
+    "judges": JudgesRule,
+}
+
+
+# ---- compiled rulesets ----
+
+class CompiledRuleset:
+    """Points table and scoring rule of one ruleset version."""
+
+    def __init__(self, points, rule=None):
+        self.points = points
+        self.rule = rule
+
+
+def compile_ruleset(ruleset):
+    """Validate a ruleset and compile it. Raises ValueError on an invalid one."""
+    if ruleset is None:
+        ruleset = {}
+    if not isinstance(ruleset, dict):
+        raise ValueError("ruleset must be an object")
+
+    # Standings keep points in Integer columns
+    points = ruleset.get("points", {})
+    if not isinstance(points, dict) or any(isinstance(v, bool) or not isinstance(v, int) for v in points.values()):
+        raise ValueError("ruleset points must map result types to whole numbers")
+
+    scoring = ruleset.get("scoring")
+    if scoring is None:
+        return CompiledRuleset(points_table(ruleset))
+    if not isinstance(scoring, dict) or scoring.get("type") not in SCORING_RULES:
+        raise ValueError(f"ruleset scoring type must be one of {', '.join(SCORING_RULES)}")
+    options = {k: v for k, v in scoring.items() if k != "type"}
+    try:
+        rule = SCORING_RULES[scoring["type"]](**options)
+    except TypeError:
+        raise ValueError(f"unknown options for {scoring['type']} scoring: {', '.join(sorted(options))}")
+    return CompiledRuleset(points_table(ruleset), rule)
+
+
+def compiled_rulesets(versions):
+    """
+    {category_id: CompiledRuleset} for {category_id: ruleset_version}.
+    Categories whose cached entry is missing or older are loaded and compiled
+    in one query. A stored ruleset that no longer compiles falls back to the
+    default points without a scoring rule.
+    """
+    stale = [c for c, version in versions.items() if _compiled_cache.get(c, (None,))[0] != version]
+    if stale:
+        for category_id, version, ruleset in db.session.execute(
+            select(Category.id, Category.ruleset_version, Category.ruleset).where(Category.id.in_(stale))
+        ):
+            try:
+                compiled = compile_ruleset(ruleset)
+            except ValueError:
+                compiled = CompiledRuleset(dict(DEFAULT_POINTS))
+            _compiled_cache[category_id] = (version, compiled)
+    return {c: _compiled_cache[c][1] for c in versions if c in _compiled_cache}
+
+
+def compiled_ruleset(category_id, version):
+    return compiled_rulesets({category_id: version}).get(category_id)
+
+
+def invalidate_compiled_ruleset(category_id=None):
+    """Drop the compiled ruleset of a category, or all of them when no id is given."""
+    if category_id is None:
+        _compiled_cache.clear()
+    else:
+        _compiled_cache.pop(category_id, None)
@@ -0,0 +1,225 @@
+from collections import defaultdict
+from sqlalchemy import bindparam, delete, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.extensions import db
+from app.models.event_model import Category, CategoryStanding, ClubStanding, EventParticipant, Match, MatchParticipant
+from app.models.user_model import Club
+from app.services.scoring_service import compiled_ruleset, compiled_rulesets
+
+COUNTERS = ("points", "played", "wins", "draws", "losses")
+
+
+def _contribution(result_type, points):
+    if not result_type:
+        return (0, 0, 0, 0, 0)
+    return (
+        points.get(result_type, 0),
+        1,
+        int(result_type == "win"),
+        int(result_type == "draw"),
+        int(result_type == "loss"),
+    )
+
+
+def _add(total, values, sign=1):
+    for i, v in enumerate(values):
+        total[i] += sign * v
+
+
+def _increment(table, key_columns, rows):
+    """UPDATE table SET counter = counter + delta for many keys in one executemany."""
+    stmt = update(table)
+    for col in key_columns:
+        stmt = stmt.where(table.c[col] == bindparam(f"k_{col}"))
+    stmt = stmt.values({c: table.c[c] + bindparam(f"d_{c}") for c in COUNTERS})
+    db.session.execute(stmt, [
+        {**{f"k_{col}": key[i] for i, col in enumerate(key_columns)},
+         **{f"d_{c}": delta[j] for j, c in enumerate(COUNTERS)}}
+        for key, delta in rows
+    ])
+
+
+def _insert_ignoring_duplicates(model):
+    """INSERT that skips rows whose key already exists, e.g. inserted by a concurrent result."""
+    dialect = db.engine.dialect.name
+    if dialect == "sqlite":
+        return sqlite_insert(model).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql_insert(model).on_conflict_do_nothing()
+    if dialect == "mysql":
+        return insert(model).prefix_with("IGNORE")
+    return insert(model)
+
+
+def _ensure_rows(model, fixed, key_column, keys):
+    """Insert zeroed standings rows for keys that do not have one yet."""
+    existing = {
+        r[0] for r in db.session.query(getattr(model, key_column))
+        .filter_by(**fixed)
+        .filter(getattr(model, key_column).in_(list(keys)))
+    }
+    missing = [{**fixed, key_column: k} for k in keys if k not in existing]
+    if missing:
+        db.session.execute(_insert_ignoring_duplicates(model).values([
+            {**row, **{c: 0 for c in COUNTERS}} for row in missing
+        ]))
+
+
+def apply_result_changes(category_id, changes):
+    """
+    Incrementally update participant, category and club standings.
+
+    Args:
+        changes: iterable of (participant_id, old_result_type, new_result_type)
+
+    Only the participants in `changes` are touched, so recording a result
+    costs a handful of statements no matter how big the event is.
+    """
+    changes = [c for c in changes if c[1] != c[2]]
+    if not changes:
+        return
+
+    category = db.session.query(Category.event_id, Category.ruleset_version).filter(Category.id == category_id).one()
+    points = compiled_ruleset(category_id, category.ruleset_version).points
+
+    by_participant = defaultdict(lambda: [0] * len(COUNTERS))
+    for participant_id, old, new in changes:
+        _add(by_participant[participant_id], _contribution(old, points), -1)
+        _add(by_participant[participant_id], _contribution(new, points))
+
+    clubs = dict(
+        db.session.query(EventParticipant.id, EventParticipant.club_id)
+        .filter(EventParticipant.id.in_(list(by_participant)))
+    )
+    by_club = defaultdict(lambda: [0] * len(COUNTERS))
+    for participant_id, delta in by_participant.items():
+        _add(by_club[clubs[participant_id]], delta)
+
+    _ensure_rows(CategoryStanding, {"category_id": category_id, "event_id": category.event_id},
+                 "participant_id", by_participant)
+    _increment(CategoryStanding.__table__, ("category_id", "participant_id"),
+               [((category_id, pid), delta) for pid, delta in by_participant.items()])
+
+    _ensure_rows(ClubStanding, {"event_id": category.event_id}, "club_id", by_club)
+    _increment(ClubStanding.__table__, ("event_id", "club_id"),
+               [((category.event_id, club_id), delta) for club_id, delta in by_club.items()])
+
+    point_rows = [{"k_id": pid, "d_points": delta[0]} for pid, delta in by_participant.items() if delta[0]]
+    if point_rows:
+        participants = EventParticipant.__table__
+        db.session.execute(
+            update(participants)
+            .where(participants.c.id == bindparam("k_id"))
+            .values(points=func.coalesce(participants.c.points, 0) + bindparam("d_points")),
+            point_rows
+        )
+
+
+def rebuild_event_standings(event_id):
+    """
+    Recompute every standings table of an event from the match results.
+    Used to backfill data recorded before the tables existed and after
+    deleting categories or participants, whose results cannot be undone
+    incrementally.
+    """
+    versions = dict(db.session.query(Category.id, Category.ruleset_version).filter(Category.event_id == event_id))
+    categories = {c: compiled.points for c, compiled in compiled_rulesets(versions).items()}
+    rows = (
+        db.session.query(Match.category_id, MatchParticipant.participant_id, MatchParticipant.result_type, func.count())
+        .join(Match, MatchParticipant.match_id == Match.id)
+        .filter(Match.category_id.in_(list(categories)), MatchParticipant.result_type.isnot(None))
+        .group_by(Match.category_id, MatchParticipant.participant_id, MatchParticipant.result_type)
+        .all()
+    ) if categories else []
+
+    participants = dict(
+        db.session.query(EventParticipant.id, EventParticipant.club_id).filter(EventParticipant.event_id == event_id)
+    )
+    by_category = defaultdict(lambda: [0] * len(COUNTERS))
+    by_club = defaultdict(lambda: [0] * len(COUNTERS))
+    by_participant = defaultdict(int)
+    for category_id, participant_id, result_type, count in rows:
+        values = [v * count for v in _contribution(result_type, categories[category_id])]
+        _add(by_category[(category_id, participant_id)], values)
+        _add(by_club[participants[participant_id]], values)
+        by_participant[participant_id] += values[0]
+
+    db.session.execute(delete(CategoryStanding).where(CategoryStanding.event_id == event_id))
+    db.session.execute(delete(ClubStanding).where(ClubStanding.event_id == event_id))
+    if by_category:
+        db.session.execute(insert(CategoryStanding).values([
+            {"category_id": c, "participant_id": p, "event_id": event_id, **dict(zip(COUNTERS, values))}
+            for (c, p), values in by_category.items()
+        ]))
+    if by_club:
+        db.session.execute(insert(ClubStanding).values([
+            {"club_id": club_id, "event_id": event_id, **dict(zip(COUNTERS, values))}
+            for club_id, values in by_club.items()
+        ]))
+
+    db.session.execute(
+        update(EventParticipant)
+        .where(EventParticipant.event_id == event_id)
+        .values(points=0)
+        .execution_options(synchronize_session=False)
+    )
+    if by_participant:
+        db.session.execute(
+            update(EventParticipant),
+            [{"id": pid, "points": points} for pid, points in by_participant.items()]
+        )
+
+
+def _standing_dict(row):
+    return {c: getattr(row, c) for c in COUNTERS}
+
+
+def get_event_standings(event_id, category_id=None, limit=None):
+    """Read standings from the materialized tables, ordered by points."""
+    club_query = (
+        db.session.query(ClubStanding, Club.name)
+        .join(Club, ClubStanding.club_id == Club.id)
+        .filter(ClubStanding.event_id == event_id)
+        .order_by(ClubStanding.points.desc(), ClubStanding.wins.desc(), ClubStanding.club_id)
+    )
+    category_query = (
+        db.session.query(CategoryStanding, EventParticipant.name, EventParticipant.club_id)
+        .join(EventParticipant, CategoryStanding.participant_id == EventParticipant.id)
+        .filter(CategoryStanding.event_id == event_id)
+        .order_by(CategoryStanding.category_id, CategoryStanding.points.desc(),
+                  CategoryStanding.wins.desc(), CategoryStanding.participant_id)
+    )
+    if category_id is not None:
+        category_query = category_query.filter(CategoryStanding.category_id == category_id)
+        if limit:
+            category_query = category_query.limit(limit)
+
+    participant_query = (
+        db.session.query(EventParticipant.id, EventParticipant.name, EventParticipant.club_id, EventParticipant.points)
+        .filter(EventParticipant.event_id == event_id, EventParticipant.points > 0)
+        .order_by(EventParticipant.points.desc(), EventParticipant.id)
+    )
+    if limit:
+        club_query = club_query.limit(limit)
+        participant_query = participant_query.limit(limit)
+
+    categories = defaultdict(list)
+    for standing, name, club_id in category_query:
+        categories[standing.category_id].append({"participant_id": standing.participant_id, "name": name, "club_id": club_id,
+                     **_standing_dict(standing)})
+
+    return {
+        "event_id": event_id,
+        "clubs": [
+            {"club_id": standing.club_id, "name": name, **_standing_dict(standing)}
+            for standing, name in club_query
+        ],
+        "participants": [
+            {"participant_id": r.id, "name": r.name, "club_id": r.club_id, "points": r.points}
+            for r in participant_query
+        ],
+        "categories": [
+            {"category_id": cid, "standings": rows} for cid, rows in categories.items()
+        ]
+    }
@@ -0,0 +1,70 @@
+import random
+import time
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# GET/HEAD requests read from a replica bind (replica_0, replica_1, ... built
+# from READ_REPLICA_URIS). Writes, everything after the first write of a
+# request, and reads of a client that wrote within DB_PRIMARY_STICKY_SECONDS
+# go to the primary, so a scorer always reads back what they just wrote.
+READ_METHODS = ("GET", "HEAD")
+STICKY_COOKIE = "db_primary_until"
+
+
+class RoutingSession(Session):
+    """Session that sends the reads of replica-routed requests to the chosen replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context() and g.get("db_replica"):
+            if self._flushing or isinstance(clause, UpdateBase):
+                use_primary()
+            else:
+                return self._db.engines[g.db_replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_primary():
+    """Send the rest of the current request to the primary (e.g. before a read that feeds a write)."""
+    if has_request_context():
+        g.db_replica = None
+
+
+def replica_binds(config):
+    return {f"replica_{i}": uri for i, uri in enumerate(config.get("READ_REPLICA_URIS") or [])}
+
+
+def sticky_to_primary(cookie):
+    """Whether a STICKY_COOKIE value is still in its window. A malformed value is not sticky."""
+    try:
+        return float(cookie or 0) > time.time()
+    except ValueError:
+        return False
+
+
+def _choose_replica():
+    binds = current_app.config.get("_REPLICA_BIND_KEYS")
+    if not binds or request.method not in READ_METHODS:
+        return
+    if sticky_to_primary(request.cookies.get(STICKY_COOKIE)):
+        return
+    g.db_replica = random.choice(binds)
+
+
+def _mark_write(response):
+    if request.method not in READ_METHODS and current_app.config.get("_REPLICA_BIND_KEYS"):
+        window = current_app.config.get("DB_PRIMARY_STICKY_SECONDS", 5)
+        response.set_cookie(STICKY_COOKIE, str(time.time() + window), max_age=window,
+                            httponly=True, secure=True, samesite="None")
+    return response
+
+
+def init_read_replicas(app):
+    """Add the replica binds to SQLALCHEMY_BINDS and install the request hooks. Call before db.init_app."""
+    binds = replica_binds(app.config)
+    if not binds:
+        return
+    app.config["SQLALCHEMY_BINDS"] = {**(app.config.get("SQLALCHEMY_BINDS") or {}), **binds}
+    app.config["_REPLICA_BIND_KEYS"] = list(binds)
+    app.before_request(_choose_replica)
+    app.after_request(_mark_write)
@@ -0,0 +1,59 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Engine profiles, picked from the dialect of SQLALCHEMY_DATABASE_URI
+# (or forced with DB_ENGINE_PROFILE). A profile contributes pool options to
+# SQLALCHEMY_ENGINE_OPTIONS and may install per-connection setup.
+
+
+def _sqlite_options(config):
+    # Long enough for a writer to wait out another worker's scoring burst
+    return {"connect_args": {"timeout": config["SQLITE_PRAGMAS"].get("busy_timeout", 5000) / 1000}}
+
+
+def _mysql_options(config):
+    return dict(config["MYSQL_POOL"])
+
+
+ENGINE_PROFILES = {
+    "sqlite": _sqlite_options,
+    "mysql": _mysql_options,
+}
+
+
+def engine_profile(config):
+    if config.get("DB_ENGINE_PROFILE"):
+        return config["DB_ENGINE_PROFILE"]
+    return make_url(config["SQLALCHEMY_DATABASE_URI"]).get_backend_name()
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured profile. Explicit options in config win."""
+    profile = ENGINE_PROFILES.get(engine_profile(config))
+    options = profile(config) if profile else {}
+    options.update(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    return options
+
+
+def install_engine_hooks(engine, config):
+    """Per-connection setup for the profile. Call before the first connection is made."""
+    if engine_profile(config) != "sqlite":
+        return
+    pragmas = config["SQLITE_PRAGMAS"]
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def pool_status(engine):
+    """Counters of the engine's connection pool, for the metrics endpoint."""
+    pool = engine.pool
+    status = {"engine": engine.url.get_backend_name(), "pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    return status
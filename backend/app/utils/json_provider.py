@@ -0,0 +1,86 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib encoder is used without it
+    orjson = None
+
+# JSON providers for app.json, chosen with JSON_PROVIDER. Both write the same
+# documents as Flask's default one (sorted keys, dates as HTTP dates); orjson
+# leaves non-ASCII text unescaped. iter_dumps encodes a large payload piece by
+# piece for streamed responses.
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    def iter_dumps(self, obj, chunk_size=1000):
+        """
+        Compact JSON of obj as a sequence of strings. Lists longer than
+        chunk_size are written chunk_size items at a time, so no single
+        string holds the whole document.
+        """
+        if isinstance(obj, dict):
+            items = sorted(obj.items(), key=lambda kv: str(kv[0])) if self.sort_keys else obj.items()
+            yield "{"
+            for i, (key, value) in enumerate(items):
+                yield ("," if i else "") + self.dumps(str(key)) + ":"
+                yield from self.iter_dumps(value, chunk_size)
+            yield "}"
+        elif isinstance(obj, (list, tuple)) and len(obj) > chunk_size:
+            yield "["
+            for start in range(0, len(obj), chunk_size):
+                yield ("," if start else "") + self.dumps(obj[start:start + chunk_size], separators=(",", ":"))[1:-1]
+            yield "]"
+        else:
+            yield self.dumps(obj, separators=(",", ":"))
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    # Keyword arguments orjson can honour; anything else goes to the stdlib encoder
+    SUPPORTED = {"sort_keys", "separators", "indent", "default", "ensure_ascii"}
+
+    def _options(self, kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _usable(self, kwargs):
+        return set(kwargs) <= self.SUPPORTED and kwargs.get("indent") in (None, 2)
+
+    def dumps_bytes(self, obj, **kwargs):
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=self._options(kwargs))
+
+    def dumps(self, obj, **kwargs):
+        if not self._usable(kwargs):
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj, **kwargs).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """jsonify() without the str round trip: orjson's bytes go straight into the response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = self.dumps_bytes(obj, indent=2 if pretty else None) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    "stdlib": StdlibJSONProvider,
+    "orjson": OrjsonProvider,
+}
+
+
+def json_provider_class(config):
+    """The configured provider; "auto" picks orjson when it is installed."""
+    name = config.get("JSON_PROVIDER", "auto")
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER is 'orjson' but the orjson package is not installed")
+    return JSON_PROVIDERS[name]
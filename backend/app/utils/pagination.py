@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import datetime
+from flask import request
+from sqlalchemy import DateTime, Integer, String, and_, or_
+from app.schemas.compiled import dump
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+
+def paginate(query, schema):
+    """
+    Page through a query with ?page= and ?per_page= and dump the items with schema.
+    Returns the response data dict.
+    """
+    page = request.args.get("page", 1, type=int)
+    per_page = min(request.args.get("per_page", DEFAULT_PER_PAGE, type=int), MAX_PER_PAGE)
+    result = query.paginate(page=page, per_page=per_page, error_out=False)
+    return {
+        "items": dump(schema, result.items),
+        "page": result.page,
+        "per_page": result.per_page,
+        "total": result.total,
+        "pages": result.pages
+    }
+
+
+# ---- Keyset (cursor) pagination ----
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+def encode_cursor(values):
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _cursor_value(column, value):
+    """A decoded cursor value checked against its column type, or raise ValueError."""
+    if isinstance(column.type, DateTime):
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Integer):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("Invalid cursor")
+    elif isinstance(column.type, String) and not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor into one value per ordering column, or raise ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Invalid cursor")
+        return [_cursor_value(c, v) for c, v in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _after(columns, values):
+    """(c1, c2, ...) > (v1, v2, ...) expanded so every backend can use the index."""
+    column, value = columns[0], values[0]
+    if len(columns) == 1:
+        return column > value
+    return or_(column > value, and_(column == value, _after(columns[1:], values[1:])))
+
+
+def keyset_paginate(query, columns):
+    """
+    Return one page of query ordered by columns (ascending, last one unique),
+    starting after ?cursor= and holding at most ?limit= rows.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for a malformed cursor.
+    """
+    limit = max(1, min(request.args.get("limit", DEFAULT_LIMIT, type=int), MAX_LIMIT))
+    cursor = request.args.get("cursor")
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns)))
+
+    items = query.order_by(*columns).limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor([getattr(last, c.key) for c in columns])
@@ -1,7 +1,20 @@
-from flask import jsonify
+from flask import Response, current_app, jsonify
 
 def success_response(data=None, status_code=200):
     return jsonify({"success": True, "data": data}), status_code
 
+def iter_success_json(data, provider):
+    """The success_response body as a sequence of strings (see StdlibJSONProvider.iter_dumps)."""
+    chunk_size = provider._app.config.get("JSON_STREAM_CHUNK_SIZE", 1000)
+    yield from provider.iter_dumps({"success": True, "data": data}, chunk_size)
+    yield "\n"
+
+def streamed_success_response(data, status_code=200):
+    """success_response for large payloads, encoded and sent to the client piece by piece."""
+    return Response(iter_success_json(data, current_app.json), status_code, mimetype="application/json")
+
+def paginated_response(data, next_cursor=None, status_code=200):
+    return jsonify({"success": True, "data": data, "next_cursor": next_cursor}), status_code
+
 def error_response(message, status_code=400):
-    return jsonify({"success": False, "error": message}), status_code
\ No newline at end of file
+    return jsonify({"success": False, "error": message}), status_code
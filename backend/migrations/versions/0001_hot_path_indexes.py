@@ -0,0 +1,72 @@
+"""Indexes for the hot foreign-key and filter columns, users.token_version
+
+Revision ID: 0001_hot_path_indexes
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+create_app() still runs db.create_all(), which creates new tables together with
+their indexes but never touches existing tables. This revision brings databases
+created before the indexes were declared in the models up to date, skipping
+whatever already exists.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_hot_path_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("events", "ix_events_organizer_id", ["organizer_id"]),
+    ("event_clubs", "ix_event_clubs_club_id", ["club_id"]),
+    ("clubs", "ix_clubs_owner_id", ["owner_id"]),
+    ("participant_categories", "ix_participant_categories_category_id", ["category_id"]),
+    ("event_participants", "ix_event_participants_event_id_club_id", ["event_id", "club_id"]),
+    ("event_participants", "ix_event_participants_club_id", ["club_id"]),
+    ("event_participants", "ix_event_participants_event_id_points", ["event_id", "points"]),
+    ("categories", "ix_categories_event_id", ["event_id"]),
+    ("matches", "ix_matches_category_id_round_match_number", ["category_id", "round", "match_number"]),
+    ("match_participants", "ix_match_participants_match_id", ["match_id"]),
+    ("match_participants", "ix_match_participants_participant_id", ["participant_id"]),
+    ("match_relations", "ix_match_relations_source_match_id", ["source_match_id"]),
+    ("match_relations", "ix_match_relations_target_match_id", ["target_match_id"]),
+    ("event_join_requests", "ix_event_join_requests_event_id_club_id_status", ["event_id", "club_id", "status"]),
+    ("event_join_requests", "ix_event_join_requests_event_id_status_created_at", ["event_id", "status", "created_at", "id"]),
+    ("event_join_links", "ix_event_join_links_event_id", ["event_id"]),
+    ("category_standings", "ix_category_standings_event_id_category_id_points", ["event_id", "category_id", "points"]),
+]
+
+
+def _existing_indexes(inspector, table):
+    if not inspector.has_table(table):
+        return None
+    return {ix["name"] for ix in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "token_version" not in {c["name"] for c in inspector.get_columns("users")}:
+        with op.batch_alter_table("users") as batch_op:
+            batch_op.add_column(sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+
+    for table, name, columns in INDEXES:
+        existing = _existing_indexes(inspector, table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table, name, _ in reversed(INDEXES):
+        existing = _existing_indexes(inspector, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,28 @@
+"""events.version, the counter keying cached event responses
+
+Revision ID: 0002_event_version
+Revises: 0001_hot_path_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_event_version'
+down_revision = '0001_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "version" not in {c["name"] for c in inspector.get_columns("events")}:
+        with op.batch_alter_table("events") as batch_op:
+            batch_op.add_column(sa.Column("version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.drop_column("version")
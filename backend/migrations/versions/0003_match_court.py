@@ -0,0 +1,28 @@
+"""matches.court, the court/mat assigned by the scheduler
+
+Revision ID: 0003_match_court
+Revises: 0002_event_version
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_match_court'
+down_revision = '0002_event_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "court" not in {c["name"] for c in inspector.get_columns("matches")}:
+        with op.batch_alter_table("matches") as batch_op:
+            batch_op.add_column(sa.Column("court", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.drop_column("court")
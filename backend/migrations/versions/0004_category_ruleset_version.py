@@ -0,0 +1,28 @@
+"""categories.ruleset_version, the counter keying compiled rulesets
+
+Revision ID: 0004_category_ruleset_version
+Revises: 0003_match_court
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_category_ruleset_version'
+down_revision = '0003_match_court'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "ruleset_version" not in {c["name"] for c in inspector.get_columns("categories")}:
+        with op.batch_alter_table("categories") as batch_op:
+            batch_op.add_column(sa.Column("ruleset_version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table("categories") as batch_op:
+        batch_op.drop_column("ruleset_version")
@@ -0,0 +1,33 @@
+"""bracket_views.body as LONGTEXT on MySQL, where TEXT stops at 64 KB
+
+Revision ID: 0005_bracket_view_longtext
+Revises: 0004_category_ruleset_version
+Create Date: 2026-10-18 00:00:00.000000
+
+Other backends have no size limit on TEXT and are left as they are.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_bracket_view_longtext'
+down_revision = '0004_category_ruleset_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql" or not sa.inspect(bind).has_table("bracket_views"):
+        return
+    op.alter_column("bracket_views", "body", type_=mysql.LONGTEXT(), existing_type=sa.Text(), existing_nullable=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql" or not sa.inspect(bind).has_table("bracket_views"):
+        return
+    op.alter_column("bracket_views", "body", type_=sa.Text(), existing_type=mysql.LONGTEXT(), existing_nullable=False)
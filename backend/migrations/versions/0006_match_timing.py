@@ -0,0 +1,31 @@
+"""matches.duration_minutes and rest_minutes, the timing a match was scheduled with
+
+Revision ID: 0006_match_timing
+Revises: 0005_bracket_view_longtext
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_match_timing'
+down_revision = '0005_bracket_view_longtext'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing = {c["name"] for c in inspector.get_columns("matches")}
+    with op.batch_alter_table("matches") as batch_op:
+        for name in ("duration_minutes", "rest_minutes"):
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.drop_column("rest_minutes")
+        batch_op.drop_column("duration_minutes")
@@ -0,0 +1,118 @@
+"""
+Sync (gunicorn) vs async (uvicorn + app/asgi.py) throughput on the hot reads.
+
+    python scripts/bench_asgi.py [--clients 1000] [--requests 5000] [--workers 4]
+
+Seeds a SQLite file, starts each server in turn on it with the same number of
+worker processes and hits GET /api/events/categories/<id>/bracket and
+GET /api/events/<id> with --clients concurrent connections.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND)
+
+import httpx
+
+
+def seed(database_url):
+    os.environ["DATABASE_URL"] = database_url
+    from app import create_app
+    from app.extensions import db
+    from seed_data import seed_event
+
+    app = create_app("production")
+    with app.app_context():
+        ids = seed_event(n_participants=256, n_categories=8)
+        db.session.remove()
+    client = app.test_client()
+    client.get(f"/api/events/categories/{ids['category_ids'][0]}/bracket")  # build the stored view
+    return ids
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+async def load(url, clients, total):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    semaphore = asyncio.Semaphore(clients)
+    latencies, errors = [], 0
+
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    errors += response.status_code != 200
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-asgi-"), "bench.db")
+    ids = seed(database_url)
+    env = {**os.environ, "DATABASE_URL": database_url, "APP_CONFIG": "production"}
+    port = 8765
+    servers = {
+        "sync (gunicorn)": ["gunicorn", "-w", str(args.workers), "-b", f"127.0.0.1:{port}",
+                            "--backlog", "4096", "--timeout", "120", "app:create_app('production')"],
+        "async (uvicorn)": ["uvicorn", "asgi:app", "--workers", str(args.workers), "--port", str(port),
+                            "--backlog", "4096", "--log-level", "warning"],
+    }
+    paths = {
+        "bracket": f"/api/events/categories/{ids['category_ids'][0]}/bracket",
+        "event": f"/api/events/{ids['event_id']}",
+    }
+
+    print(f"{args.clients} concurrent clients, {args.requests} requests per endpoint, {args.workers} workers")
+    for name, command in servers.items():
+        server = subprocess.Popen(command, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            for label, path in paths.items():
+                result = asyncio.run(load(f"http://127.0.0.1:{port}{path}", args.clients, args.requests))
+                print(f"{name:<16} {label:<8} {result['rps']:>8.0f} req/s  p50 {result['p50']:>7.0f} ms  "
+                      f"p99 {result['p99']:>7.0f} ms  errors {result['errors']}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark bracket persistence: the old per-match flush / per-slot lookup
+loop versus the bulk path in bracket_service.persist_bracket.
+
+    python scripts/bench_bracket_persistence.py [sizes...]
+
+Runs against a throwaway SQLite file so every statement is a real round trip.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.config import TestingConfig, config_by_name
+from app.extensions import db
+from app.models.user_model import User, Club
+from app.models.event_model import Event, EventParticipant, Category, Match, MatchParticipant, MatchRelation, ParticipantCategory
+from app.services.bracket_service import generate_bracket, persist_bracket
+
+
+def legacy_persist(category_id, matches_data, relations_data):
+    """The create_bracket loop before the bulk path."""
+    match_number_to_id = {}
+    for m in matches_data:
+        match = Match(category_id=category_id, round=m["round"], match_number=m["match_number"])
+        db.session.add(match)
+        db.session.flush()
+        match_number_to_id[m["match_number"]] = match.id
+        for p in m["participants"]:
+            pc = ParticipantCategory.query.filter_by(
+                participant_id=p["participant_id"], category_id=category_id
+            ).first()
+            if not pc:
+                db.session.add(ParticipantCategory(participant_id=p["participant_id"], category_id=category_id, seed=p["seed"]))
+            else:
+                pc.seed = p["seed"]
+            db.session.add(MatchParticipant(
+                match_id=match.id, participant_id=p["participant_id"],
+                position=p.get("position"), role=p.get("role", "competitor")
+            ))
+    for r in relations_data:
+        db.session.add(MatchRelation(
+            source_match_id=match_number_to_id[r["source_match_number"]],
+            target_match_id=match_number_to_id[r["target_match_number"]],
+            qualifier_rank=r.get("qualifier_rank", 1)
+        ))
+
+
+def seed_category(size, label):
+    user = User(email=f"{label}-{size}@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    club = Club(name="Bench", owner_id=user.id)
+    db.session.add(club)
+    db.session.flush()
+    event = Event(name=f"Bench {size}", organizer_id=club.id)
+    db.session.add(event)
+    db.session.flush()
+    category = Category(name=f"Bench {size}", event_id=event.id, order=1)
+    db.session.add(category)
+    db.session.flush()
+
+    participants = [EventParticipant(name=f"Athlete {i}", event_id=event.id, club_id=club.id) for i in range(size)]
+    db.session.add_all(participants)
+    db.session.flush()
+    db.session.add_all([
+        ParticipantCategory(participant_id=p.id, category_id=category.id, seed=i)
+        for i, p in enumerate(participants, start=1)
+    ])
+    db.session.commit()
+    return category.id, [(p.id, i) for i, p in enumerate(participants, start=1)]
+
+
+def run(persist, size):
+    category_id, entrants = seed_category(size, persist.__name__)
+    matches_data, relations_data = generate_bracket(entrants, "double_elimination")
+    start = time.perf_counter()
+    persist(category_id, matches_data, relations_data)
+    db.session.commit()
+    return time.perf_counter() - start, len(matches_data)
+
+
+def main(sizes):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + path
+
+    config_by_name["bench"] = BenchConfig
+    app = create_app("bench")
+    try:
+        with app.app_context():
+            print(f"{'entrants':>8} {'matches':>8} {'legacy (s)':>11} {'bulk (s)':>9} {'speedup':>8}")
+            for size in sizes:
+                legacy, n_matches = run(legacy_persist, size)
+                bulk, _ = run(persist_bracket, size)
+                print(f"{size:>8} {n_matches:>8} {legacy:>11.3f} {bulk:>9.3f} {legacy / bulk:>7.1f}x")
+            db.session.remove()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main([int(s) for s in sys.argv[1:]] or [64, 256, 1024])
@@ -0,0 +1,65 @@
+"""
+Memory of the streamed export against the nested event detail on a
+synthetic event of ~50k result rows (32 categories x 512 entrants).
+
+    python scripts/bench_export.py
+
+Reads each response chunk by chunk, the way a WSGI server sends it, and
+reports the peak Python memory while doing so (tracemalloc) plus the rows
+written. The export should stay at a few MB whatever the event size.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import config, create_app
+from app.extensions import db
+from seed_data import seed_event
+
+
+def consume(client, url, headers):
+    """(peak MB, bytes, lines, seconds) of reading one response."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    size = lines = 0
+    for chunk in response.response:
+        size += len(chunk)
+        lines += chunk.count(b"\n")
+    response.close()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, size, lines, elapsed
+
+
+def main():
+    class BenchConfig(config.TestingConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-export-"), "bench.db")
+        RESPONSE_CACHE = "none"
+
+    config.config_by_name["bench_export"] = BenchConfig
+    app = create_app("bench_export")
+    with app.app_context():
+        ids = seed_event(n_participants=16384, n_categories=32, n_clubs=40)
+        db.session.remove()
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {ids['token']}"}
+    event_id = ids["event_id"]
+    runs = [
+        ("GET event detail", f"/api/events/{event_id}"),
+        ("export ndjson", f"/api/events/{event_id}/export?format=ndjson"),
+        ("export csv", f"/api/events/{event_id}/export?format=csv"),
+    ]
+    for label, url in runs:
+        peak, size, lines, elapsed = consume(client, url, headers)
+        print(f"{label:<18} peak {peak:>7.1f} MB  {size / 2 ** 20:>6.1f} MB sent  {lines:>7} lines  {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
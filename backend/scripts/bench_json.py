@@ -0,0 +1,115 @@
+"""
+JSON encoding benchmark: the stdlib provider against orjson on the event
+detail and bracket endpoints of a synthetic event (20 categories x 512
+entrants, single elimination).
+
+    python scripts/bench_json.py [repeats]
+
+Times the encoding of the full event payload alone, then whole requests
+with the response cache off: GET /api/events/<id> and a cold
+GET /api/events/categories/<id>/bracket (the stored view is dropped first,
+so the build and its encoding are measured). Also reports the peak memory
+of encoding the event at once versus streaming it in chunks, and checks
+that both providers produce the same documents.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import config, create_app
+from app.extensions import db
+from app.models.event_model import Event
+from app.schemas.event_schema import event_schema
+from app.schemas.loaders import with_loaders
+from app.schemas.compiled import dump
+from app.services.bracket_view_service import invalidate_bracket_views
+from app.utils.json_provider import orjson
+from seed_data import seed_event
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def make_app(database_uri, provider):
+    class BenchConfig(config.TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        JSON_PROVIDER = provider
+        RESPONSE_CACHE = "none"
+
+    config.config_by_name[f"bench_json_{provider}"] = BenchConfig
+    return create_app(f"bench_json_{provider}")
+
+
+def bench(app, ids, repeats):
+    client = app.test_client()
+    event_url = f"/api/events/{ids['event_id']}"
+    category_id = ids["category_ids"][0]
+    bracket_url = f"/api/events/categories/{category_id}/bracket"
+
+    with app.app_context():
+        event = with_loaders(Event.query, event_schema).filter_by(id=ids["event_id"]).one()
+        payload = {"success": True, "data": dump(event_schema, event)}
+        results = {
+            "encode": timed(lambda: app.json.dumps(payload), repeats)[0],
+            "peak_whole": peak_memory(lambda: app.json.response(payload)),
+            "peak_streamed": peak_memory(lambda: max(len(chunk) for chunk in app.json.iter_dumps(payload))),
+        }
+
+    def cold_bracket():
+        with app.app_context():
+            invalidate_bracket_views(category_ids=[category_id])
+            db.session.commit()
+        return client.get(bracket_url).get_data()
+
+    results["event"], event_body = timed(lambda: client.get(event_url).get_data(), repeats)
+    results["bracket"], bracket_body = timed(cold_bracket, repeats)
+    return results, json.loads(event_body), json.loads(bracket_body)
+
+
+def main(repeats):
+    database_uri = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-json-"), "bench.db")
+    providers = ["stdlib"] + (["orjson"] if orjson is not None else [])
+
+    seed_app = make_app(database_uri, "stdlib")
+    with seed_app.app_context():
+        ids = seed_event(n_participants=10240, n_categories=20, n_clubs=40)
+        db.session.remove()
+
+    results, documents = {}, []
+    for provider in providers:
+        results[provider], *docs = bench(make_app(database_uri, provider), ids, repeats)
+        documents.append(docs)
+
+    print(f"{'':<8} {'encode':>9} {'GET event':>10} {'GET bracket (cold)':>19} {'peak whole':>11} {'peak streamed':>14}")
+    for provider, r in results.items():
+        print(f"{provider:<8} {r['encode']:>8.3f}s {r['event']:>9.3f}s {r['bracket']:>18.3f}s "
+              f"{r['peak_whole']:>8.1f} MB {r['peak_streamed']:>11.1f} MB")
+    if orjson is None:
+        print("orjson is not installed, only the stdlib provider was measured")
+
+    identical = all(docs == documents[0] for docs in documents)
+    print(f"same documents: {identical}")
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
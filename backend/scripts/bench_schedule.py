@@ -0,0 +1,152 @@
+"""
+Scheduler benchmark on a synthetic event of ~5k matches (20 categories x 256
+entrants, single elimination) played on 16 courts.
+
+    python scripts/bench_schedule.py [repeats]
+
+Times the solver alone on the loaded inputs, then the whole
+POST /api/events/<id>/schedule request (three reads, the solve and the
+batched UPDATE). Then delays a match in the middle of the day by 30 minutes
+and times the incremental reschedule, reporting how many matches moved.
+Records matches as finished early, on their day and days ahead of it, and
+checks nothing is pulled before the finished match's own slot or onto
+another day.
+Checks the stored timetable after both: no court plays two matches at once,
+and a match starts only after its source matches plus rest.
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import select
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import config, create_app
+from app.extensions import db
+from app.models.event_model import Category, Match, MatchRelation
+from app.services.schedule_service import load_schedule_inputs, reschedule_after, solve_schedule
+from seed_data import seed_event
+
+COURTS = 16
+DELAY_MINUTES = 30
+# Sent with the schedule request, off the config defaults so rescheduling has to keep them
+MATCH_MINUTES = 12
+REST_MINUTES = 5
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def check(event_id, duration, rest):
+    """Constraint violations in the stored timetable."""
+    rows = db.session.execute(
+        select(Match.id, Match.start_time, Match.court)
+        .join(Category, Category.id == Match.category_id)
+        .where(Category.event_id == event_id)
+    ).all()
+    slots = {r.id: (r.start_time, r.court) for r in rows}
+    errors = [f"match {r.id} not scheduled" for r in rows if r.start_time is None or r.court is None]
+
+    by_court = defaultdict(list)
+    for match_id, (start_time, court) in slots.items():
+        by_court[court].append(start_time)
+    length = timedelta(minutes=duration)
+    for court, starts in by_court.items():
+        starts.sort()
+        errors += [f"overlap on court {court} at {b}" for a, b in zip(starts, starts[1:]) if b < a + length]
+
+    gap = timedelta(minutes=duration + rest)
+    for source_id, target_id in db.session.execute(
+        select(MatchRelation.source_match_id, MatchRelation.target_match_id)
+        .where(MatchRelation.source_match_id.in_(list(slots)))
+    ):
+        if slots[target_id][0] < slots[source_id][0] + gap:
+            errors.append(f"match {target_id} starts before match {source_id} is over and rested")
+    return len(rows), errors
+
+
+def early_finish_errors(match_id, ended_at):
+    """Violations of an early finish recorded at ended_at (also used as the current time)."""
+    planned = db.session.get(Match, match_id).start_time
+    changes = reschedule_after(match_id, ended_at=ended_at, now=ended_at)
+    db.session.rollback()
+    errors = [
+        f"match {m} pulled from {old} to {new}, before match {match_id} planned at {planned}"
+        for m, old, new in changes if new < max(planned, ended_at) or new.date() != old.date()
+    ]
+    if ended_at.date() != planned.date() and changes:
+        errors.append(f"finishing match {match_id} on {ended_at.date()} moved {len(changes)} matches of {planned.date()}")
+    return errors
+
+
+def main(repeats):
+    class BenchConfig(config.TestingConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-schedule-"), "bench.db")
+        RESPONSE_CACHE = "none"
+
+    config.config_by_name["bench_schedule"] = BenchConfig
+    app = create_app("bench_schedule")
+    with app.app_context():
+        ids = seed_event(n_participants=5120, n_categories=20, n_clubs=40)
+        db.session.remove()
+        duration, rest = MATCH_MINUTES, REST_MINUTES
+
+        load, (matches, relations) = timed(lambda: load_schedule_inputs(ids["event_id"], duration, rest), repeats)
+        solve, offsets = timed(lambda: solve_schedule(matches, relations, COURTS), repeats)
+        db.session.remove()
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {ids['token']}"}
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(hours=1)
+    payload = {"start": start.isoformat(), "courts": COURTS, "match_duration_minutes": duration, "rest_minutes": rest}
+    request, response = timed(
+        lambda: client.post(f"/api/events/{ids['event_id']}/schedule", json=payload, headers=headers), repeats
+    )
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    with app.app_context():
+        total, errors = check(ids["event_id"], duration, rest)
+        middle = sorted(offsets, key=lambda m: offsets[m])[len(offsets) // 2]
+
+        def delayed():
+            changes = reschedule_after(middle, delay=DELAY_MINUTES)
+            db.session.rollback()
+            return changes
+        incremental, changes = timed(delayed, repeats)
+
+        by_start = sorted(offsets, key=lambda m: offsets[m])
+        next_day = next(m for m in by_start if offsets[m][0] >= 24 * 60)
+        for match_id in (middle, next_day):
+            planned = db.session.get(Match, match_id).start_time
+            errors += early_finish_errors(match_id, planned + timedelta(minutes=1))
+            errors += early_finish_errors(match_id, planned - timedelta(days=2))
+        db.session.remove()
+
+    response = client.patch(f"/api/events/matches/{middle}", json={"delay_minutes": DELAY_MINUTES}, headers=headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    with app.app_context():
+        errors += check(ids["event_id"], duration, rest)[1]
+
+    makespan = max(offset for offset, _ in offsets.values()) + duration
+    print(f"{total} matches on {COURTS} courts, last match ends after {makespan / 60:.1f} h")
+    print(f"load inputs   {load:.3f}s")
+    print(f"solve         {solve:.3f}s")
+    print(f"POST schedule {request:.3f}s")
+    print(f"reschedule    {incremental:.3f}s  {DELAY_MINUTES} min delay on match {middle} moved {len(changes)} matches")
+    for error in errors[:10]:
+        print(error)
+    print(f"constraint violations: {len(errors)}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,99 @@
+"""
+Score push benchmark for ruleset-driven scoring on a synthetic event
+(20 categories x 256 entrants, single elimination) whose categories score
+best-of-3 sets.
+
+    python scripts/bench_scoring.py [repeats]
+
+Times getting the evaluator of a category by compiling its stored ruleset
+on every push against the cached compiled ruleset, then one
+PATCH /api/events/<id>/matches/scores deciding every first-round match
+(2-1 in sets), reporting the ranks derived and the resulting standings rows.
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, select, update
+
+from app import config, create_app
+from app.extensions import db
+from app.models.event_model import Category, CategoryStanding, Match, MatchParticipant
+from app.services.scoring_service import compile_ruleset, compiled_rulesets
+from seed_data import seed_event
+
+RULESET = {"scoring": {"type": "best_of", "sets": 3}, "points": {"win": 2, "loss": 0}}
+PUSHES = 10000
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(repeats):
+    class BenchConfig(config.TestingConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-scoring-"), "bench.db")
+        RESPONSE_CACHE = "none"
+
+    config.config_by_name["bench_scoring"] = BenchConfig
+    app = create_app("bench_scoring")
+    with app.app_context():
+        ids = seed_event(n_participants=5120, n_categories=20, n_clubs=40)
+        db.session.execute(
+            update(Category).where(Category.event_id == ids["event_id"])
+            .values(ruleset=RULESET, ruleset_version=Category.ruleset_version + 1)
+        )
+        db.session.commit()
+
+        category_id = ids["category_ids"][0]
+        version, ruleset = db.session.execute(
+            select(Category.ruleset_version, Category.ruleset).where(Category.id == category_id)
+        ).one()
+        compiled_rulesets({category_id: version})
+        compile_each, _ = timed(lambda: [compile_ruleset(ruleset) for _ in range(PUSHES)], repeats)
+        cached, _ = timed(lambda: [compiled_rulesets({category_id: version}) for _ in range(PUSHES)], repeats)
+
+        entrants = defaultdict(list)
+        for match_id, mp_id in db.session.execute(
+            select(MatchParticipant.match_id, MatchParticipant.id)
+            .join(Match, Match.id == MatchParticipant.match_id)
+            .where(Match.category_id.in_(ids["category_ids"]), Match.status == "scheduled",
+                   MatchParticipant.participant_id.is_not(None))
+            .order_by(MatchParticipant.id)
+        ):
+            entrants[match_id].append(mp_id)
+        payload = {"matches": [
+            {"match_id": match_id, "scores": {str(mps[0]): 2, str(mps[1]): 1}}
+            for match_id, mps in entrants.items() if len(mps) == 2
+        ]}
+        db.session.remove()
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {ids['token']}"}
+    start = time.perf_counter()
+    response = client.patch(f"/api/events/{ids['event_id']}/matches/scores", json=payload, headers=headers)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.get_data(as_text=True)
+    decided = sum(1 for m in response.get_json()["data"]["matches"] if m["outcome"])
+
+    with app.app_context():
+        standings = db.session.scalar(
+            select(func.count()).select_from(CategoryStanding).where(CategoryStanding.event_id == ids["event_id"])
+        )
+    print(f"evaluator per push, compiling  {compile_each / PUSHES * 1e6:>7.2f} us")
+    print(f"evaluator per push, cached     {cached / PUSHES * 1e6:>7.2f} us")
+    print(f"PATCH {len(payload['matches'])} matches  {elapsed:.3f}s  {decided} decided, {standings} standings rows")
+    sys.exit(0 if decided == len(payload["matches"]) else 1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,49 @@
+"""
+Benchmark marshmallow dumps against the compiled serializers on a synthetic
+event with ~10k matches (20 categories x 512 entrants, single elimination).
+
+    python scripts/bench_serializers.py [repeats]
+
+Also checks that both produce byte-identical JSON.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.models.event_model import Event, Match
+from app.schemas.event_schema import event_schema
+from app.schemas.loaders import with_loaders
+from app.schemas.compiled import compile_schema
+from seed_data import seed_event
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(repeats):
+    app = create_app("testing")
+    with app.app_context():
+        ids = seed_event(n_participants=10240, n_categories=20, n_clubs=40)
+        event = with_loaders(Event.query, event_schema).filter_by(id=ids["event_id"]).one()
+        print(f"matches: {Match.query.count()}, participants: {len(event.participants)}")
+
+        compiled = compile_schema(event_schema)
+        slow, slow_data = timed(lambda: event_schema.dump(event), repeats)
+        fast, fast_data = timed(lambda: compiled(event), repeats)
+
+        identical = app.json.dumps(slow_data) == app.json.dumps(fast_data)
+        print(f"marshmallow: {slow:.3f}s  compiled: {fast:.3f}s  speedup: {slow / fast:.1f}x  identical JSON: {identical}")
+        sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
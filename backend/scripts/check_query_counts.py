@@ -0,0 +1,68 @@
+"""
+Query-count regression check for the read endpoints.
+
+    python scripts/check_query_counts.py
+
+Seeds a large event in an in-memory database, calls each endpoint once and
+fails if it issues more SQL statements than its budget. selectinload batches
+500 keys per IN query, so nested collections cost one query per 500 rows;
+any N+1 regression costs thousands and trips the budget.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event as sa_event
+from app import create_app
+from app.extensions import db
+from seed_data import seed_event
+
+
+def budgets(ids):
+    event_id = ids["event_id"]
+    category_id = ids["category_ids"][0]
+    return [
+        # (method, url, max statements)
+        # Cached event GETs: the first call builds the body, a repeat is one version lookup
+        ("GET", f"/api/events/{event_id}", 17),
+        ("GET", f"/api/events/{event_id}", 1),
+        ("GET", "/api/events/", 18),
+        ("GET", "/api/events/participating", 18),
+        ("GET", f"/api/events/{event_id}/categories", 3),
+        ("GET", f"/api/events/{event_id}/categories", 1),
+        # First call builds the stored bracket view, the second reads it
+        ("GET", f"/api/events/categories/{category_id}/bracket", 8),
+        ("GET", f"/api/events/categories/{category_id}/bracket", 2),
+        ("GET", f"/api/events/{event_id}/standings", 5),
+        ("GET", f"/api/events/{event_id}/standings", 1),
+        ("GET", "/api/clubs/", 1),
+        ("GET", "/api/auth/", 3),
+    ]
+
+
+def main():
+    app = create_app("testing")
+    with app.app_context():
+        ids = seed_event()
+        statements = []
+        sa_event.listen(db.engine, "before_cursor_execute",
+                        lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {ids['token']}"}
+    failures = 0
+    for method, url, budget in budgets(ids):
+        statements.clear()
+        response = client.open(url, method=method, headers=headers)
+        response.get_data()  # streamed bodies are produced (and cached) as they are read
+        count = len(statements)
+        ok = response.status_code == 200 and count <= budget
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  {method} {url:<45} {count:>4} queries (budget {budget}, HTTP {response.status_code})")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
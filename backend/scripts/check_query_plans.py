@@ -0,0 +1,108 @@
+"""
+Full-scan check for the queries the routes issue.
+
+    python scripts/check_query_plans.py
+
+Seeds a large event (plus a second one, so filters have something to skip)
+in a SQLite database, calls each endpoint, runs EXPLAIN QUERY PLAN on every
+SELECT it issued and fails if a plan scans a whole table instead of searching
+an index. Scans that are the point of the endpoint (e.g. listing every club,
+paginated from the start) are listed in ALLOWED_SCANS.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event as sa_event
+from app import create_app
+from app.extensions import db
+from app.models.event_model import Match, MatchParticipant
+from seed_data import seed_event
+
+# (method, url prefix) -> tables that endpoint may scan
+ALLOWED_SCANS = {
+    ("GET", "/api/clubs/"): {"clubs"},
+    ("GET", "/api/auth/"): {"users"},
+}
+
+
+def requests(ids, match_id, mp_id, winner_id):
+    event_id = ids["event_id"]
+    category_id = ids["category_ids"][0]
+    club_id = ids["club_ids"][1]
+    return [
+        ("GET", f"/api/events/{event_id}", None),
+        ("GET", "/api/events/?name=Synthetic", None),
+        ("GET", "/api/events/participating", None),
+        ("GET", f"/api/events/{event_id}/categories", None),
+        ("GET", f"/api/events/categories/{category_id}/bracket", None),
+        ("GET", f"/api/events/{event_id}/standings?category_id={category_id}", None),
+        ("GET", f"/api/events/{event_id}/matches?category_id={category_id}&status=scheduled", None),
+        ("GET", f"/api/events/{event_id}/participants?club_id={club_id}&category_id={category_id}", None),
+        ("GET", f"/api/events/{event_id}/join-requests", None),
+        ("GET", f"/api/events/{event_id}/export", None),
+        ("GET", f"/api/clubs/?owner_id={ids['user_id']}", None),
+        ("GET", "/api/auth/", None),
+        ("PATCH", f"/api/events/{event_id}/matches/scores", {"matches": [{"match_id": match_id, "scores": {str(mp_id): 3}}]}),
+        ("PATCH", f"/api/events/matches/{match_id}/winner", {"winner_id": winner_id}),
+    ]
+
+
+def full_scans(connection, statement, parameters):
+    """Plan lines of a statement that scan a table without an index."""
+    plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    return [
+        row[3] for row in plan
+        if row[3].startswith("SCAN ") and "INDEX" not in row[3] and not row[3].startswith("SCAN CONSTANT ROW")
+    ]
+
+
+def main():
+    app = create_app("testing")
+    with app.app_context():
+        ids = seed_event()
+        seed_event(seed=2)
+        match = (
+            Match.query.filter(Match.category_id == ids["category_ids"][0], Match.round == 1)
+            .filter(Match.participants.any())
+            .order_by(Match.match_number)
+            .first()
+        )
+        mps = MatchParticipant.query.filter_by(match_id=match.id).order_by(MatchParticipant.id).all()
+        match_id, mp_id, winner_id = match.id, mps[0].id, mps[-1].participant_id
+
+        statements = []
+        sa_event.listen(db.engine, "before_cursor_execute",
+                        lambda conn, cursor, statement, parameters, context, executemany:
+                        statements.append((statement, parameters)) if not executemany else None)
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {ids['token']}"}
+    failures = 0
+    for method, url, body in requests(ids, match_id, mp_id, winner_id):
+        statements.clear()
+        response = client.open(url, method=method, headers=headers, json=body)
+        response.get_data()  # streamed bodies run their queries as they are read
+        captured = [(s, p) for s, p in statements if s.lstrip().upper().startswith("SELECT")]
+
+        allowed = next((tables for (m, prefix), tables in ALLOWED_SCANS.items()
+                        if m == method and url.startswith(prefix)), set())
+        problems = []
+        with app.app_context(), db.engine.connect() as connection:
+            for statement, parameters in captured:
+                for line in full_scans(connection, statement, parameters):
+                    if line.split()[1] not in allowed:
+                        problems.append((line, statement))
+
+        ok = response.status_code < 400 and not problems
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  {method} {url:<75} {len(captured):>3} selects (HTTP {response.status_code})")
+        for line, statement in problems:
+            print(f"        {line}\n          in: {' '.join(statement.split())[:200]}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Read-replica routing check with two SQLite files standing in for primary and replica.
+
+    python scripts/check_replica_routing.py
+
+Seeds the primary, copies it to the replica, then changes the primary behind
+the replica's back. Reads of a fresh client must come from the replica (old
+data) while the client that just wrote must read the primary (new data).
+A tampered sticky cookie is ignored rather than failing the request.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event as sa_event
+from app import config, create_app
+from app.extensions import db
+from app.utils.db_routing import STICKY_COOKIE
+from seed_data import seed_event
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="replica-check-")
+    primary, replica = os.path.join(workdir, "primary.db"), os.path.join(workdir, "replica.db")
+
+    class ReplicaCheckConfig(config.TestingConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + primary
+        READ_REPLICA_URIS = ["sqlite:///" + replica]
+
+    config.config_by_name["replica_check"] = ReplicaCheckConfig
+    app = create_app("replica_check")
+    with app.app_context():
+        ids = seed_event(n_participants=64, n_categories=2)
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+    # "Replicate", then let the primary move ahead
+    with sqlite3.connect(primary) as src, sqlite3.connect(replica) as dst:
+        src.backup(dst)
+
+    used = []
+    with app.app_context():
+        for key, engine in db.engines.items():
+            sa_event.listen(engine, "before_cursor_execute",
+                            lambda *args, key=key: used.append(key or "primary"))
+
+    headers = {"Authorization": f"Bearer {ids['token']}"}
+    scorer = app.test_client()
+    spectator = app.test_client()
+    event_url = f"/api/events/{ids['event_id']}/categories"
+    category_id = ids["category_ids"][0]
+
+    checks = []
+
+    used.clear()
+    response = scorer.put(f"/api/events/{ids['event_id']}/categories/{category_id}",
+                          json={"name": "Renamed"}, headers=headers, base_url="https://localhost")
+    checks.append(("write goes to the primary", response.status_code == 200 and set(used) == {"primary"}))
+
+    used.clear()
+    names = {c["id"]: c["name"] for c in spectator.get(event_url, base_url="https://localhost").get_json()["data"]["categories"]}
+    checks.append(("spectator reads the replica", names[category_id] != "Renamed" and set(used) == {"replica_0"}))
+
+    used.clear()
+    names = {c["id"]: c["name"] for c in scorer.get(event_url, base_url="https://localhost").get_json()["data"]["categories"]}
+    checks.append(("writer reads its own write", names[category_id] == "Renamed" and set(used) == {"primary"}))
+
+    used.clear()
+    tampered = app.test_client()
+    tampered.set_cookie(STICKY_COOKIE, "not-a-number")
+    response = tampered.get(event_url, base_url="https://localhost")
+    checks.append(("malformed sticky cookie reads the replica", response.status_code == 200 and set(used) == {"replica_0"}))
+
+    for name, ok in checks:
+        print(f"{'ok' if ok else 'FAIL':>4}  {name}")
+    sys.exit(0 if all(ok for _, ok in checks) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Synthetic data for the scripts in this folder.
+"""
+import random
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.models.user_model import User, Club
+from app.models.event_model import Event, EventParticipant, Category, ParticipantCategory
+from app.services.bracket_service import generate_bracket, persist_bracket
+
+
+def seed_event(n_participants=2000, n_categories=20, n_clubs=20, bracket_format="single_elimination", seed=1):
+    """
+    Create an event with clubs, participants spread over categories and a
+    generated bracket per category. Returns ids and an organizer token.
+    """
+    rng = random.Random(seed)
+    owner = User(email=f"organizer-{rng.random()}@example.com", password_hash="x", role="manager")
+    db.session.add(owner)
+    db.session.flush()
+
+    clubs = [Club(name=f"Club {i}", owner_id=owner.id) for i in range(n_clubs)]
+    db.session.add_all(clubs)
+    db.session.flush()
+
+    event = Event(name="Synthetic event", organizer_id=clubs[0].id)
+    event.participating_clubs.extend(clubs[1:])
+    db.session.add(event)
+    db.session.flush()
+
+    categories = [Category(name=f"Category {i}", event_id=event.id, order=i) for i in range(n_categories)]
+    db.session.add_all(categories)
+    db.session.flush()
+
+    participants = [
+        EventParticipant(name=f"Athlete {i}", event_id=event.id, club_id=clubs[i % n_clubs].id)
+        for i in range(n_participants)
+    ]
+    db.session.add_all(participants)
+    db.session.flush()
+
+    by_category = {c.id: [] for c in categories}
+    for i, p in enumerate(participants):
+        by_category[categories[i % n_categories].id].append(p.id)
+    db.session.add_all([
+        ParticipantCategory(participant_id=pid, category_id=cid, seed=s)
+        for cid, pids in by_category.items()
+        for s, pid in enumerate(pids, start=1)
+    ])
+    db.session.flush()
+
+    for cid, pids in by_category.items():
+        if len(pids) >= 2:
+            entrants = [(pid, s) for s, pid in enumerate(pids, start=1)]
+            persist_bracket(cid, *generate_bracket(entrants, bracket_format))
+    for c in categories:
+        c.can_sign_up = False
+    db.session.commit()
+
+    return {
+        "event_id": event.id,
+        "category_ids": [c.id for c in categories],
+        "club_ids": [c.id for c in clubs],
+        "user_id": owner.id,
+        "token": create_access_token(identity=str(owner.id)),
+    }